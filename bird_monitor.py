@@ -1,11 +1,74 @@
 import subprocess
 import json
 import logging
+import time
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 from src.content_processor import StantonTimesContentProcessor
 from src.config import ensure_state_file, get_bird_auth_script, get_config_path, load_config
 from src.state.store import save_state
+from src.telemetry.metrics import ERRORS, ITEMS_FETCHED
+from src.telemetry.tracing import new_trace_id, tracer_from_config
+
+
+def extract_tweets(data: Any) -> List[Dict[str, Any]]:
+    """
+    `{id, text, created_at}` of each tweet in a bird JSON response.
+    """
+    if data is None:
+        return []
+
+    # If the API wraps items in a container
+    if isinstance(data, dict):
+        for key in ('tweets', 'data', 'items', 'results'):
+            if key in data and isinstance(data[key], list):
+                data = data[key]
+                break
+
+    if not isinstance(data, list):
+        return []
+
+    tweets = []
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+
+        legacy = item.get('legacy', {}) if isinstance(item.get('legacy'), dict) else {}
+        text = legacy.get('full_text') or legacy.get('text') or item.get('full_text') or item.get('text')
+        if not text:
+            continue
+
+        tweet_id = item.get('id') or item.get('rest_id') or item.get('tweet_id') or legacy.get('id_str')
+        created_at = legacy.get('created_at') or item.get('created_at')
+
+        tweets.append({
+            'id': str(tweet_id) if tweet_id else None,
+            'text': text,
+            'created_at': created_at
+        })
+
+    return tweets
+
+
+def parse_tweets(output: str) -> List[Dict[str, Any]]:
+    """
+    Tweets from `bird --json` output (one JSON document, or line-delimited JSON).
+    """
+    try:
+        return extract_tweets(json.loads(output))
+    except json.JSONDecodeError:
+        # Some outputs may be line-delimited JSON
+        tweets: List[Dict[str, Any]] = []
+        for line in output.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                tweets.extend(extract_tweets(json.loads(line)))
+            except json.JSONDecodeError:
+                continue
+        return tweets
 
 
 class BirdMonitor:
@@ -14,6 +77,7 @@ class BirdMonitor:
         self.config_path = config_path or str(get_config_path())
         state_file_path = state_file_path or str(ensure_state_file())
         self.content_processor = StantonTimesContentProcessor(state_file_path, self.config_path)
+        self.tracer = tracer_from_config("bird_monitor", self.config)
 
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
@@ -45,48 +109,15 @@ class BirdMonitor:
 
             if result.returncode != 0:
                 self.logger.error(f"Bird command failed: {result.stderr.strip()}")
+                ERRORS.inc(system='bird', operation=args[0] if args else '')
                 return None
 
             return result.stdout
         except Exception as e:
             self.logger.error(f"Error running bird command: {e}")
+            ERRORS.inc(system='bird', operation=args[0] if args else '')
             return None
 
-    def _extract_tweets(self, data: Any) -> List[Dict[str, Any]]:
-        if data is None:
-            return []
-
-        # If the API wraps items in a container
-        if isinstance(data, dict):
-            for key in ('tweets', 'data', 'items', 'results'):
-                if key in data and isinstance(data[key], list):
-                    data = data[key]
-                    break
-
-        if not isinstance(data, list):
-            return []
-
-        tweets = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-
-            legacy = item.get('legacy', {}) if isinstance(item.get('legacy'), dict) else {}
-            text = legacy.get('full_text') or legacy.get('text') or item.get('full_text') or item.get('text')
-            if not text:
-                continue
-
-            tweet_id = item.get('id') or item.get('rest_id') or item.get('tweet_id') or legacy.get('id_str')
-            created_at = legacy.get('created_at') or item.get('created_at')
-
-            tweets.append({
-                'id': str(tweet_id) if tweet_id else None,
-                'text': text,
-                'created_at': created_at
-            })
-
-        return tweets
-
     def fetch_recent_tweets(self, account: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Fetch recent tweets using bird CLI
@@ -96,22 +127,7 @@ class BirdMonitor:
         if not output:
             return []
 
-        try:
-            data = json.loads(output)
-            return self._extract_tweets(data)
-        except json.JSONDecodeError:
-            # Some outputs may be line-delimited JSON
-            tweets: List[Dict[str, Any]] = []
-            for line in output.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    tweets.extend(self._extract_tweets(data))
-                except json.JSONDecodeError:
-                    continue
-            return tweets
+        return parse_tweets(output)
 
     def process_tweets(self):
         """
@@ -122,7 +138,10 @@ class BirdMonitor:
             if not handle:
                 continue
 
+            fetch_started = time.time()
             tweets = self.fetch_recent_tweets(handle)
+            fetched_at = time.time()
+            ITEMS_FETCHED.inc(len(tweets), source=handle)
             if not tweets:
                 continue
 
@@ -143,8 +162,11 @@ class BirdMonitor:
                     'link': link,
                     'published_at': tweet.get('created_at'),
                     'priority': account.get('priority'),
-                    'tier': account.get('tier')
+                    'tier': account.get('tier'),
+                    'trace_id': new_trace_id(),
+                    'fetched_at': datetime.utcfromtimestamp(fetched_at).isoformat(),
                 }
+                self.tracer.record('fetch', content['trace_id'], fetch_started, fetched_at, source=handle)
 
                 self.content_processor.process_content(content)
 
@@ -158,6 +180,9 @@ class BirdMonitor:
             # Persist seen IDs + any new pending stories
             self.content_processor.state = save_state(self.content_processor.state_file_path, self.content_processor.state)
 
+        self.content_processor.checkpoint_ml_model()
+        self.content_processor.dump_stage_timings()
+        self.content_processor.flush_metrics("bird_monitor")
         self.logger.info("Bird monitor run complete")
 
 
@@ -3,23 +3,91 @@ import os
 import re
 import hashlib
 import subprocess
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime, timedelta
 
-from src.config import ensure_state_file, get_config_path, get_log_path, load_config
+from src.config import (
+    ensure_state_file,
+    get_config_path,
+    get_log_path,
+    get_metrics_path,
+    get_scoring_socket_path,
+    load_config,
+)
 from src.scoring.relevance import normalize_weights, resolve_draft_threshold, weighted_score
 from src.scoring.approval_tiers import ApprovalTierManager
+from src.notify.publish_trigger import notify_publisher
+from src.scoring.daemon import connect_scorer
+from src.scoring.features import DIGIT_RE, SENTENCE_SPLIT_RE, WHITESPACE_RE, ContentFeatures, FeatureExtractor
 from src.state.store import load_state, update_state
-from ledger import StantonTimesLedger
+from src.telemetry.stages import StageTimer
+from src.telemetry.metrics import (
+    DRAFTS_REJECTED,
+    ITEMS_DRAFTED,
+    ITEMS_INGESTED,
+    queue_depth_collector,
+    store_from_config,
+)
+from src.telemetry.tracing import new_trace_id, tracer_from_config
+from ledger import ScoreKey, StantonTimesLedger
 
 # Import new components
-from ml_scorer import AdvancedContentScorer
+# ml_scorer (sklearn/numpy) is imported on first use; see `ml_scorer` below.
 from error_handler import StantonTimesErrorHandler
 from permission_manager import StantonTimesPermissionManager
 from system_monitor import StantonTimesSystemMonitor
 from tweet_style_guide import TweetStyleGuide
 
+LIVE_SHOW_PREFIX_RE = re.compile(r"^Star Citizen Live\s*\|\s*", re.I)
+INSIDE_SC_PREFIX_RE = re.compile(r"^Inside Star Citizen\s*\|\s*", re.I)
+STAR_CITIZEN_PREFIX_RE = re.compile(r"^Star Citizen\s*\|\s*", re.I)
+
+# Transcript quote cleanup, applied in order by `_clean_quote`.
+FILLER_WORDS_RE = re.compile(r"\b(uh|um|like|you know|sort of|kind of)\b", re.I)
+REPEATED_WORD_RE = re.compile(r"\b(\w+)(\s+\1\b)+", re.I)
+REPEATED_PAIR_RE = re.compile(r"\b(\w+\s+\w+)\s+\1\b", re.I)
+IT_WAS_LIKE_RE = re.compile(r"^It was like\s+", re.I)
+COMMA_SPACING_RE = re.compile(r"\s*,\s*")
+IT_WAS_RE = re.compile(r"^It was\s+", re.I)
+LEADING_CONNECTIVE_RE = re.compile(r"^(and|but|so)\s+(so\s+)?", re.I)
+
+SOURCE_RELIABILITY: Dict[str, float] = {
+    "RSI Comm-Link": 0.95,
+    "RSI Patch Notes": 0.98,
+    "Star Citizen (YouTube)": 0.9,
+    "StarCitizenTools News": 0.7,
+    "Disco Lando (YouTube)": 0.85,
+    "BoredGamer (YouTube)": 0.7,
+    "Morphologis (YouTube)": 0.7,
+    "Olli43 (YouTube)": 0.6,
+    "RobertsSpaceInd": 0.9,
+    "StarCitizen": 0.85,
+    "discolando": 0.8,
+    "BoredGamerUK": 0.7,
+    "Morphologis": 0.7,
+    "Olli43": 0.6,
+    "starcitizenbot": 0.75,
+    "TheRubenSaurus": 0.65
+}
+
+OFFICIAL_SOURCES = frozenset({
+    'RSI Comm-Link',
+    'RSI Patch Notes',
+    'Star Citizen (YouTube)',
+    'RobertsSpaceInd',
+    'StarCitizen',
+    'discolando'
+})
+
+# Draft templates that get a deferred thread draft.
+THREAD_CONTENT_TYPES = ('live_show', 'inside_sc')
+# Stories whose pending thread the background job fills in.
+THREAD_READY_STATUSES = ('approved', 'auto_approved')
+# Cached scores hold only the model-free traditional component: the ML model
+# takes an online step per draft, so its part is always scored live.
+CACHED_MODEL_VERSION = "none"
+
 class StantonTimesContentProcessor:
     def __init__(self, 
                  state_file_path=None, 
@@ -28,14 +96,20 @@ class StantonTimesContentProcessor:
         self.config_path = config_path or str(get_config_path())
         self.config = load_config()
 
-        # Initialize advanced components
-        self.ml_scorer = AdvancedContentScorer()
+        # Initialize advanced components (the ML scorer loads lazily)
+        self._ml_scorer = None
         self.error_handler = StantonTimesErrorHandler(self.config_path, get_log_path('content_processor_errors.log'))
         self.permission_manager = StantonTimesPermissionManager(config_path)
         self.system_monitor = StantonTimesSystemMonitor(config_path)
         self.ledger = StantonTimesLedger()
+        self._score_cache_versions = None
+        self.stage_timer = StageTimer(enabled=bool((self.config.get("telemetry") or {}).get("stage_timing", True)))
+        self.tracer = tracer_from_config("content_processor", self.config)
         self.style_guide = TweetStyleGuide()
-        
+        self.feature_extractor = FeatureExtractor(
+            keyword_dictionaries=(self.config.get("content_intelligence", {}) or {}).get("keyword_dictionaries")
+        )
+
         # Initialize approval tier manager
         auto_approve_config = (self.config.get("content_intelligence", {}) or {}).get("auto_approve", {})
         self.approval_tiers = ApprovalTierManager(auto_approve_config)
@@ -49,76 +123,40 @@ class StantonTimesContentProcessor:
         """
         Assess the credibility of the content source
         """
-        source_reliability = {
-            "RSI Comm-Link": 0.95,
-            "RSI Patch Notes": 0.98,
-            "Star Citizen (YouTube)": 0.9,
-            "StarCitizenTools News": 0.7,
-            "Disco Lando (YouTube)": 0.85,
-            "BoredGamer (YouTube)": 0.7,
-            "Morphologis (YouTube)": 0.7,
-            "Olli43 (YouTube)": 0.6,
-            "RobertsSpaceInd": 0.9,
-            "StarCitizen": 0.85,
-            "discolando": 0.8,
-            "BoredGamerUK": 0.7,
-            "Morphologis": 0.7,
-            "Olli43": 0.6,
-            "starcitizenbot": 0.75,
-            "TheRubenSaurus": 0.65
-        }
-        return source_reliability.get(content.get('source', ''), 0.5)
+        return SOURCE_RELIABILITY.get(content.get('source', ''), 0.5)
+
+    def _features(self, content: Dict[str, Any]) -> ContentFeatures:
+        return self.feature_extractor.extract(content)
+
+    def _is_official(self, content: Dict[str, Any]) -> bool:
+        priority = (content.get('priority') or '').upper()
+        tier = (content.get('tier') or '').lower()
+        return priority == 'P0' or tier == 'official' or content.get('source', '') in OFFICIAL_SOURCES
 
     def _estimate_community_interest(self, content: Dict[str, Any]) -> float:
         """
         Estimate potential community engagement
         """
         # Look for keywords that might indicate high interest
-        high_interest_keywords = [
-            'patch', 'patch notes', 'update', 'ptu', 'hotfix', 'roadmap',
-            'alpha', 'beta', 'release', 'improvement', 'spectrum',
-            'inside star citizen', 'star citizen live', 'behind the ships', 'tech talk',
-            'ship', 'ships', 'vehicle', 'freighter', 'hauler', 'cargo', 'engineering',
-            'server meshing', 'performance', 'optimization', 'invictus', 'citizencon',
-            'iae', 'ship talk', 'introducing', 'new ship', 'squadron 42'
-        ]
-
-        text = " ".join(
-            part for part in [
-                content.get('topic'),
-                content.get('title'),
-                content.get('description')
-            ]
-            if part
-        ).lower()
-        matches = sum(1 for keyword in high_interest_keywords if keyword in text)
+        matches = self._features(content).keyword_score('community_interest')
         score = min(matches * 0.2, 1.0)
 
         # Boost official/P0 sources slightly to avoid under-scoring high-signal updates
-        priority = (content.get('priority') or '').upper()
-        tier = (content.get('tier') or '').lower()
-        source = content.get('source', '')
-        official_sources = {
-            'RSI Comm-Link',
-            'RSI Patch Notes',
-            'Star Citizen (YouTube)',
-            'RobertsSpaceInd',
-            'StarCitizen',
-            'discolando'
-        }
-        if priority == 'P0' or tier == 'official' or source in official_sources:
+        if self._is_official(content):
             score = min(score + 0.2, 1.0)
 
         return score
 
+    def _is_seen(self, content: Dict[str, Any]) -> bool:
+        seen_ids = self.state.get('seen_tweet_ids', {})
+        return content.get('id') in seen_ids.get(content.get('source', ''), [])
+
     def _assess_information_novelty(self, content: Dict[str, Any]) -> float:
         """
         Check if the content offers new information
         """
         # Compare against previously seen content
-        seen_ids = self.state.get('seen_tweet_ids', {})
-        
-        if content.get('id') in seen_ids.get(content.get('source', ''), []):
+        if self._is_seen(content):
             return 0.1  # Low novelty if already seen
         
         return 0.8  # Assume novelty unless proven otherwise
@@ -127,31 +165,70 @@ class StantonTimesContentProcessor:
         """
         Assess the technical complexity of the content
         """
-        technical_keywords = [
-            'performance', 'optimization', 'networking',
-            'server meshing', 'technical', 'implementation',
-            'engineering', 'tech talk', 'latency', 'persistence',
-            'rendering', 'physics', 'netcode'
-        ]
-
-        text = " ".join(
-            part for part in [
-                content.get('topic'),
-                content.get('title'),
-                content.get('description')
-            ]
-            if part
-        ).lower()
-        matches = sum(1 for keyword in technical_keywords if keyword in text)
+        matches = self._features(content).keyword_score('technical_depth')
 
         return min(matches * 0.25, 1.0)
 
     def _draft_mode(self) -> str:
         return (self.config.get("content_intelligence", {}) or {}).get("mode", "hybrid")
 
+    def _ml_enabled(self) -> bool:
+        return self._draft_mode() not in ("local", "logic")
+
+    @property
+    def ml_scorer(self):
+        """
+        The ML scorer, built on first use.
+
+        Importing sklearn and loading the model dominates startup, and local/logic
+        mode (production) never needs it, so every cron command used to pay for
+        it for nothing.
+        """
+        if self._ml_scorer is None:
+            if not self._ml_enabled():
+                raise RuntimeError(f"ML scorer is disabled in '{self._draft_mode()}' mode")
+            # Prefer the shared scoring daemon (`src/app.py serve`) when it is up.
+            self._ml_scorer = connect_scorer(get_scoring_socket_path(), self._local_ml_scorer)
+        return self._ml_scorer
+
+    def _local_ml_scorer(self):
+        from ml_scorer import DEFAULT_CHECKPOINT_EVERY, DEFAULT_CHECKPOINT_SECONDS, AdvancedContentScorer
+
+        settings = self._content_settings()
+        return AdvancedContentScorer(
+            example_store=self.ledger,
+            checkpoint_every=settings.get("ml_checkpoint_every", DEFAULT_CHECKPOINT_EVERY),
+            checkpoint_seconds=settings.get("ml_checkpoint_seconds", DEFAULT_CHECKPOINT_SECONDS),
+        )
+
+    @ml_scorer.setter
+    def ml_scorer(self, scorer) -> None:
+        self._ml_scorer = scorer
+
+    def checkpoint_ml_model(self) -> None:
+        """
+        Flush pending online-learning updates (call at the end of a run).
+        """
+        if self._ml_scorer is None:
+            return
+        try:
+            self._ml_scorer.checkpoint(force=True)
+        except Exception as e:
+            self.error_handler.handle_error('content_scoring', e)
+
     def _content_settings(self) -> Dict[str, Any]:
         return (self.config.get("content_intelligence", {}) or {})
 
+    def _publishing_settings(self) -> Dict[str, Any]:
+        return (self.config.get("publishing", {}) or {})
+
+    def _request_publish(self, story_id: str) -> None:
+        settings = self._publishing_settings()
+        if not settings.get("fast_path", True):
+            return
+        outcome = notify_publisher(story_id, spawn=bool(settings.get("spawn_on_auto_approve", False)))
+        self.logger.info(f"Publish fast path for {story_id}: {outcome}")
+
     def _daily_max_drafts(self) -> int:
         return int(self._content_settings().get("daily_max_drafts", 6))
 
@@ -164,51 +241,150 @@ class StantonTimesContentProcessor:
     def _simhash_threshold(self) -> int:
         return int(self._content_settings().get("simhash_threshold", 8))
 
+    def _scoring_weights(self) -> Dict[str, float]:
+        return normalize_weights((self.state.get("content_intelligence", {}) or {}).get("scoring_weights"))
+
+    def _traditional_score(self, content: Dict[str, Any]) -> float:
+        traditional_scores = {
+            "developer_credibility": self._check_developer_credibility(content),
+            "community_engagement": self._estimate_community_interest(content),
+            "information_novelty": self._assess_information_novelty(content),
+            "technical_depth": self._measure_technical_depth(content)
+        }
+        return weighted_score(traditional_scores, self._scoring_weights())
+
+    def _score_cache_enabled(self) -> bool:
+        return bool(self._content_settings().get("score_cache", True))
+
+    def _scoring_version(self) -> str:
+        """
+        Fingerprint of everything besides the item and the model that a score
+        depends on; see `ScoreKey`.
+        """
+        fingerprint = json.dumps(
+            {
+                "mode": self._draft_mode(),
+                "weights": self._scoring_weights(),
+                "keyword_dictionaries": self._content_settings().get("keyword_dictionaries"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+    def _score_cache_keys(self, contents: List[Dict[str, Any]]) -> List[Optional[ScoreKey]]:
+        if not self._score_cache_enabled():
+            return [None] * len(contents)
+
+        versions = (self._scoring_version(), CACHED_MODEL_VERSION)
+        if versions != self._score_cache_versions:
+            # Weights changed: entries for older versions can never hit again.
+            self.ledger.purge_score_cache(*versions)
+            self._score_cache_versions = versions
+
+        keys = []
+        for content in contents:
+            text = "\x1f".join(content.get(field) or '' for field in ('topic', 'title', 'description'))
+            keys.append(ScoreKey(
+                text_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                source=content.get('source') or '',
+                priority=content.get('priority') or '',
+                tier=content.get('tier') or '',
+                seen=self._is_seen(content),
+                scoring_version=versions[0],
+                model_version=versions[1],
+            ))
+        return keys
+
+    def _with_ml_score(self, traditional_score: float, ml_score: float) -> float:
+        # Weighted combination
+        return (ml_score * 0.6) + (traditional_score * 0.4)
+
     def calculate_content_score(self, content: Dict[str, Any]) -> float:
         """
         Enhanced scoring using machine learning (or local logic if configured)
+
+        The traditional score of an item seen before with the same weights is
+        served from the ledger score cache; the ML component is always scored
+        by the live model.
         """
-        try:
-            # Calculate traditional scoring
-            weights = normalize_weights((self.state.get("content_intelligence", {}) or {}).get("scoring_weights"))
-
-            traditional_scores = {
-                "developer_credibility": self._check_developer_credibility(content),
-                "community_engagement": self._estimate_community_interest(content),
-                "information_novelty": self._assess_information_novelty(content),
-                "technical_depth": self._measure_technical_depth(content)
-            }
+        key = self._score_cache_keys([content])[0]
+        traditional_score = self.ledger.cached_scores([key]).get(key) if key is not None else None
 
-            traditional_score = weighted_score(traditional_scores, weights)
+        try:
+            if traditional_score is None:
+                traditional_score = self._traditional_score(content)
+                if key is not None:
+                    self.ledger.store_scores([(key, traditional_score)])
 
-            mode = self._draft_mode()
-            if mode in ("local", "logic"):
+            if not self._ml_enabled():
                 return traditional_score
 
             # Use ML scorer for primary scoring
             ml_score = self.ml_scorer.score_content(content.get('description', ''))
-
-            # Weighted combination
-            final_score = (ml_score * 0.6) + (traditional_score * 0.4)
-
-            return final_score
+            return self._with_ml_score(traditional_score, ml_score)
         except Exception as e:
             # Error handling with fallback
             error_details = self.error_handler.handle_error('content_scoring', e, content)
 
             if error_details['action'] == 'continue':
                 # Fallback to traditional scoring
-                weights = normalize_weights((self.state.get("content_intelligence", {}) or {}).get("scoring_weights"))
-                traditional_scores = {
-                    "developer_credibility": self._check_developer_credibility(content),
-                    "community_engagement": self._estimate_community_interest(content),
-                    "information_novelty": self._assess_information_novelty(content),
-                    "technical_depth": self._measure_technical_depth(content),
-                }
-                return weighted_score(traditional_scores, weights)
+                return self._traditional_score(content)
 
             raise
 
+    def traditional_scores_batch(self, contents: List[Dict[str, Any]]) -> List[float]:
+        """
+        Traditional scores for many items as one matrix-vector product.
+
+        Equivalent (to float tolerance) to the scalar path in `calculate_content_score`.
+        """
+        from src.scoring.batch import batch_weighted_scores, component_matrix
+
+        features = [self._features(content) for content in contents]
+        matrix = component_matrix(
+            credibility=[self._check_developer_credibility(content) for content in contents],
+            interest_hits=[f.keyword_score('community_interest') for f in features],
+            official=[self._is_official(content) for content in contents],
+            seen=[self._is_seen(content) for content in contents],
+            technical_hits=[f.keyword_score('technical_depth') for f in features],
+        )
+        return [float(score) for score in batch_weighted_scores(matrix, self._scoring_weights())]
+
+    def calculate_content_scores(self, contents: List[Dict[str, Any]]) -> List[float]:
+        """
+        Batch version of `calculate_content_score` for monitor passes and backlog re-scoring.
+
+        Cached traditional scores cost one indexed ledger lookup; only the
+        misses are scored. In ML modes the batch is scored by the live model
+        in one call (texts it already scored come from its memo).
+        """
+        keys = self._score_cache_keys(contents)
+        cached = self.ledger.cached_scores(key for key in keys if key is not None)
+        traditional: List[Optional[float]] = [cached.get(key) if key is not None else None for key in keys]
+        misses = [idx for idx, score in enumerate(traditional) if score is None]
+
+        try:
+            if misses:
+                fresh = []
+                for idx, score in zip(misses, self.traditional_scores_batch([contents[idx] for idx in misses])):
+                    traditional[idx] = score
+                    if keys[idx] is not None:
+                        fresh.append((keys[idx], score))
+                if fresh:
+                    self.ledger.store_scores(fresh)
+
+            if not self._ml_enabled():
+                return traditional
+
+            ml_scores = self.ml_scorer.score_many(content.get('description', '') for content in contents)
+            return [self._with_ml_score(trad, ml) for trad, ml in zip(traditional, ml_scores)]
+        except Exception as e:
+            error_details = self.error_handler.handle_error('content_scoring', e, {'batch_size': len(contents)})
+            if error_details['action'] != 'continue':
+                raise
+            return [self.calculate_content_score(content) for content in contents]
+
     def _draft_threshold_for(self, content: Dict[str, Any]) -> float:
         return resolve_draft_threshold(
             content,
@@ -216,10 +392,39 @@ class StantonTimesContentProcessor:
             (self.state.get("content_intelligence", {}) or {}),
         )
 
-    def process_content(self, content: Dict[str, Any], user_id: str = None) -> Dict[str, Any]:
+    def process_content(
+        self,
+        content: Dict[str, Any],
+        user_id: str = None,
+        score: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """
         Enhanced content processing with permission checks
+
+        `score` may be precomputed by `calculate_content_scores` for batch passes.
+        Each stage is timed by `self.stage_timer` (see `dump_stage_timings`).
+        The item's trace id (assigned here unless the fetcher already set
+        `content['trace_id']`) is stored on the story and in the ledger.
         """
+        story_id = self._make_story_id(content)
+        trace_id = content.setdefault('trace_id', new_trace_id())
+        with self.tracer.span('process_content', trace_id, story_id) as trace_attrs:
+            with self.stage_timer.span('total', story_id):
+                result = self._process_content(content, user_id, score, story_id)
+            trace_attrs['outcome'] = result.get('status')
+            trace_attrs['score'] = None if result.get('score') is None else round(result['score'], 4)
+        self.stage_timer.count(f"status.{result.get('status')}")
+        return result
+
+    def _process_content(
+        self,
+        content: Dict[str, Any],
+        user_id: Optional[str],
+        score: Optional[float],
+        story_id: str,
+    ) -> Dict[str, Any]:
+        span = self.stage_timer.span
+
         # Optional user permission check
         if user_id and not self.permission_manager.check_permission(user_id, 'submit_draft'):
             self.logger.warning(f"Unauthorized draft submission attempt by {user_id}")
@@ -230,10 +435,13 @@ class StantonTimesContentProcessor:
 
         try:
             # Score content
-            score = self.calculate_content_score(content)
+            if score is None:
+                with span('score', story_id):
+                    score = self.calculate_content_score(content)
 
             # Check system health before processing
-            health_report = self.system_monitor.generate_health_report()
+            with span('health_check', story_id):
+                health_report = self.system_monitor.generate_health_report()
 
             # Abort if system resources are critically low
             if health_report['system_resources']['cpu_usage'] > 90:
@@ -243,17 +451,22 @@ class StantonTimesContentProcessor:
                 }
 
             # Ledger ingest + clustering
-            ledger_item = self.ledger.ingest_item(
-                source=content.get('source', 'Unknown'),
-                title=content.get('topic') or content.get('title') or 'Untitled',
-                description=content.get('description', ''),
-                url=content.get('link', ''),
-                published_at=content.get('published_at') or content.get('timestamp'),
-                priority=content.get('priority'),
-                tier=content.get('tier'),
-                cluster_window_days=self._cluster_window_days(),
-                simhash_threshold=self._simhash_threshold(),
-            )
+            with span('ledger_ingest', story_id):
+                ledger_item = self.ledger.ingest_item(
+                    source=content.get('source', 'Unknown'),
+                    title=content.get('topic') or content.get('title') or 'Untitled',
+                    description=content.get('description', ''),
+                    url=content.get('link', ''),
+                    published_at=content.get('published_at') or content.get('timestamp'),
+                    priority=content.get('priority'),
+                    tier=content.get('tier'),
+                    cluster_window_days=self._cluster_window_days(),
+                    simhash_threshold=self._simhash_threshold(),
+                    score=score,
+                    trace_id=content.get('trace_id'),
+                    fetched_at=content.get('fetched_at'),
+                )
+            ITEMS_INGESTED.inc(source=content.get('source', 'Unknown'))
             content['cluster_id'] = ledger_item.cluster_id
             content['ledger_item_id'] = ledger_item.item_id
 
@@ -270,17 +483,23 @@ class StantonTimesContentProcessor:
 
             # Enforce daily budget (P0 bypasses)
             priority = (content.get('priority') or '').upper()
-            if priority != 'P0' and self.ledger.drafts_today() >= self._daily_max_drafts():
-                return {
-                    "status": "daily_quota_reached",
-                    "score": score
-                }
+            if priority != 'P0':
+                with span('quota_check', story_id):
+                    over_quota = self.ledger.drafts_today() >= self._daily_max_drafts()
+                if over_quota:
+                    DRAFTS_REJECTED.inc(reason='quota')
+                    return {
+                        "status": "daily_quota_reached",
+                        "score": score
+                    }
 
             # Cluster cooldown
-            cluster = self.ledger.get_cluster(ledger_item.cluster_id)
+            with span('cluster_cooldown', story_id):
+                cluster = self.ledger.get_cluster(ledger_item.cluster_id)
             if cluster and cluster['last_draft_at']:
                 last_draft = datetime.fromisoformat(cluster['last_draft_at'])
                 if datetime.utcnow() - last_draft < timedelta(hours=self._cluster_cooldown_hours()):
+                    DRAFTS_REJECTED.inc(reason='cooldown')
                     return {
                         "status": "cluster_cooldown",
                         "score": score
@@ -288,47 +507,64 @@ class StantonTimesContentProcessor:
 
             self.logger.info(f"Content draft generated. Score: {score}")
 
-            # Generate tweet draft
-            tweet_draft = self._generate_tweet_draft(content)
-            thread_draft = self._generate_thread_draft(content)
-
-            if thread_draft:
-                first_tweet = thread_draft.split("\n\n---\n\n", 1)[0]
-                if first_tweet:
-                    tweet_draft = first_tweet
+            # Generate tweet draft. Thread drafts (transcript fetch + quote
+            # selection) are deferred until approval; see `generate_thread_for_story`.
+            with span('render_tweet', story_id):
+                tweet_draft = self._generate_tweet_draft(content)
+                thread_status = "pending" if self._wants_thread(content) else ""
 
             # Avoid near-duplicate drafts
-            if self.ledger.recent_draft_similar(tweet_draft):
+            with span('recent_draft_similar', story_id):
+                similar = self.ledger.recent_draft_similar(tweet_draft)
+            if similar:
                 tweet_draft = f"{tweet_draft} (more soon)"
 
             # Check approval tier BEFORE posting for review
-            approval_tier, tier_reason = self.approval_tiers.determine_tier(content, score)
+            with span('approval_tier', story_id):
+                approval_tier, tier_reason = self.approval_tiers.determine_tier(content, score)
             
             # Set draft status based on tier
             if approval_tier == "auto_approve":
                 draft_status = "auto_approved"
                 self.logger.info(f"Auto-approved: {tier_reason}")
             else:
-                # Tier 2 (batch_digest) still goes to posted_for_review for now
-                # The digest logic will be a separate enhancement
-                draft_status = "posted_for_review"
+                # Posted by the notify step; batch_digest stories are packed
+                # into digest messages there (see post_stories_for_review).
+                draft_status = "needs_review"
                 self.logger.info(f"Pending review: {tier_reason}")
 
             # Update state
-            self._update_state(content, score, tweet_draft, thread_draft, draft_status, tier_reason)
+            with span('state_write', story_id):
+                self._update_state(
+                    content, score, tweet_draft,
+                    draft_status=draft_status, tier_reason=tier_reason, thread_status=thread_status,
+                    approval_tier=approval_tier,
+                )
 
             # Mark ledger
-            self.ledger.mark_draft(ledger_item.item_id, ledger_item.cluster_id, tweet_draft)
+            with span('ledger_mark_draft', story_id):
+                self.ledger.mark_draft(
+                    ledger_item.item_id, ledger_item.cluster_id, tweet_draft,
+                    auto_approved=draft_status == "auto_approved",
+                )
+
+            # Auto-approved drafts skip review: wake the publisher now instead
+            # of waiting for the next scheduled publish run.
+            if draft_status == "auto_approved":
+                with span('publish_trigger', story_id):
+                    self._request_publish(story_id)
 
             # Optional: Update ML model with successful draft
-            if self._draft_mode() not in ("local", "logic"):
-                self.ml_scorer.update_model([content.get('description', '')], [score])
+            if self._ml_enabled():
+                with span('ml_update', story_id):
+                    self.ml_scorer.update_model([content.get('description', '')], [score])
 
+            ITEMS_DRAFTED.inc(source=content.get('source', 'Unknown'), draft_status=draft_status)
             return {
                 "status": "draft_ready",
                 "score": score,
                 "tweet_draft": tweet_draft,
-                "thread_draft": thread_draft
+                "thread_status": thread_status
             }
 
         except Exception as e:
@@ -344,103 +580,26 @@ class StantonTimesContentProcessor:
                 "error_details": error_details
             }
 
-    def _primary_description(self, description: str) -> str:
-        if not description:
-            return ""
-        primary = description.split('------------------------------------------')[0]
-        primary = re.sub(r"\s+", " ", primary).strip()
-        return primary
-
-    def _first_sentence(self, text: str) -> str:
-        if not text:
-            return ""
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
-        if not sentences:
-            return text.strip()
-
-        keyword_pattern = re.compile(r"(patch|alpha|ship|cargo|freighter|hauler|engineering|server|live|inside|update|event|performance)", re.I)
-        keyword_hits = [s for s in sentences if keyword_pattern.search(s)]
-        if keyword_hits:
-            return keyword_hits[0]
-
-        for sentence in sentences:
-            if len(sentence) >= 40:
-                return sentence
-
-        return sentences[0]
-
-    def _extract_ship_name(self, topic: str, description: str) -> str:
-        for pattern in [r"Behind the Ships:\s*(.+)$", r"Introducing (?:the )?(.*)$"]:
-            match = re.search(pattern, topic or "", re.I)
-            if match:
-                return match.group(1).strip()
-        match = re.search(r"(RSI|Drake|Aegis|Anvil|Origin|Crusader|MISC|Argo|Kruger)\s+([A-Za-z0-9\- ]+)", topic or "")
-        if match:
-            name = f"{match.group(1)} {match.group(2)}".strip()
-            stop_words = {"vehicle", "highlights", "preview", "overview", "trailer", "feature", "update"}
-            words = []
-            for word in name.split():
-                if word.lower() in stop_words:
-                    break
-                words.append(word)
-            return " ".join(words) if words else name
-        return (topic or "").strip()
+    def dump_stage_timings(self) -> None:
+        """
+        Append this run's per-stage timings to metrics/stage_timings.jsonl
+        (call at the end of a run; see `src/app.py timings`).
+        """
+        try:
+            self.stage_timer.dump(get_metrics_path('stage_timings.jsonl'))
+        except Exception as e:
+            self.logger.warning(f"Failed to write stage timings: {e}")
 
-    def _extract_factoids(self, text: str, limit: int = 3) -> List[str]:
-        if not text:
-            return []
-        snippet = text[:300]
-        parts = re.split(r"[;\n•]", snippet)
-        if len(parts) == 1:
-            parts = re.split(r",", snippet)
-        factoids = []
-        for part in parts:
-            if re.search(r"\b\d", part) or re.search(r"\bS\d\b", part) or 'scu' in part.lower():
-                cleaned = re.sub(r"^\s*(and|plus|with)\s+", "", part, flags=re.I).strip()
-                cleaned = re.sub(r"\s+", " ", cleaned).strip(" -–•")
-                if ':' in cleaned:
-                    prefix, suffix = cleaned.split(':', 1)
-                    if re.search(r"\b\d", suffix) or 'scu' in suffix.lower():
-                        cleaned = suffix.strip()
-                if cleaned and cleaned not in factoids:
-                    if len(cleaned) > 80:
-                        cleaned = cleaned[:77].rsplit(" ", 1)[0] + "..."
-                    factoids.append(cleaned)
-            if len(factoids) >= limit:
-                break
-        return factoids
-
-    def _infer_content_type(self, title: str, description: str) -> str:
-        text = f"{title} {description}".lower()
-        if any(k in text for k in ['patch notes', 'patch report', 'hotfix']):
-            return 'patch'
-        if 'inside star citizen' in text:
-            return 'inside_sc'
-        if 'star citizen live' in text or 'scl' in text or 'tech talk' in text:
-            return 'live_show'
-        if 'behind the ships' in text:
-            return 'ship_feature'
-        if 'introducing' in text or 'new ship' in text:
-            return 'ship_reveal'
-        if any(k in text for k in ['ship', 'ships', 'vehicle']) and any(
-            maker in text for maker in ['rsi', 'drake', 'aegis', 'anvil', 'origin', 'crusader', 'misc', 'argo', 'kruger']
-        ):
-            return 'ship_reveal'
-        if any(k in text for k in ['citizencon', 'invictus', 'iae', 'event']):
-            return 'event'
-        return 'general'
-
-    def _build_hashtags(self, title: str, description: str) -> str:
-        tags = self.style_guide.suggest_hashtags(f"{title} {description}")
-        if '#StarCitizen' not in tags:
-            tags = ['#StarCitizen'] + tags
-        seen = set()
-        deduped = []
-        for tag in tags:
-            if tag not in seen:
-                deduped.append(tag)
-                seen.add(tag)
-        return ' '.join(deduped)
+    def flush_metrics(self, component: str) -> None:
+        """
+        Fold this run's pipeline counters into the metrics store and refresh
+        the OpenMetrics textfile (call at the end of a run).
+        """
+        try:
+            stories = load_state(self.state_file_path).get('pending_stories', [])
+            store_from_config(self.config).flush(component, extra=queue_depth_collector(stories))
+        except Exception as e:
+            self.logger.warning(f"Failed to write metrics: {e}")
 
     def _thread_max_tweets(self) -> int:
         cfg = self._content_settings()
@@ -457,10 +616,10 @@ class StantonTimesContentProcessor:
 
     def _headline_for_thread(self, title: str, content_type: str) -> str:
         if content_type == 'live_show':
-            show_title = re.sub(r"^Star Citizen Live\s*\|\s*", "", title, flags=re.I).strip()
+            show_title = LIVE_SHOW_PREFIX_RE.sub("", title).strip()
             return f"Star Citizen Live: {show_title}"
         if content_type == 'inside_sc':
-            show_title = re.sub(r"^Inside Star Citizen\s*\|\s*", "", title, flags=re.I).strip()
+            show_title = INSIDE_SC_PREFIX_RE.sub("", title).strip()
             return f"Inside Star Citizen: {show_title}"
         return title
 
@@ -496,26 +655,26 @@ class StantonTimesContentProcessor:
         if not text:
             return ""
         cleaned = text.replace("Transcript:", " ").replace(">>", " ")
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = WHITESPACE_RE.sub(" ", cleaned).strip()
         return cleaned
 
     def _clean_quote(self, text: str) -> str:
         if not text:
             return ""
-        cleaned = re.sub(r"\b(uh|um|like|you know|sort of|kind of)\b", "", text, flags=re.I)
-        cleaned = re.sub(r"\b(\w+)(\s+\1\b)+", r"\1", cleaned, flags=re.I)
-        cleaned = re.sub(r"\b(\w+\s+\w+)\s+\1\b", r"\1", cleaned, flags=re.I)
-        cleaned = re.sub(r"^It was like\s+", "", cleaned, flags=re.I)
+        cleaned = FILLER_WORDS_RE.sub("", text)
+        cleaned = REPEATED_WORD_RE.sub(r"\1", cleaned)
+        cleaned = REPEATED_PAIR_RE.sub(r"\1", cleaned)
+        cleaned = IT_WAS_LIKE_RE.sub("", cleaned)
         cleaned = cleaned.replace("New Babage", "New Babbage")
-        cleaned = re.sub(r"\s*,\s*", ", ", cleaned)
+        cleaned = COMMA_SPACING_RE.sub(", ", cleaned)
         cleaned = cleaned.replace(", ,", ",")
-        cleaned = re.sub(r"\s+", " ", cleaned).strip(" ,.-")
-        cleaned = re.sub(r"^It was\s+", "", cleaned, flags=re.I)
-        cleaned = re.sub(r"^(and|but|so)\s+(so\s+)?", "", cleaned, flags=re.I)
+        cleaned = WHITESPACE_RE.sub(" ", cleaned).strip(" ,.-")
+        cleaned = IT_WAS_RE.sub("", cleaned)
+        cleaned = LEADING_CONNECTIVE_RE.sub("", cleaned)
 
         if " but " in cleaned:
             before, after = cleaned.split(" but ", 1)
-            if re.search(r"\b\d", after):
+            if DIGIT_RE.search(after):
                 cleaned = after.strip()
 
         if len(cleaned) > 120 and " and so " in cleaned:
@@ -539,7 +698,7 @@ class StantonTimesContentProcessor:
         if not transcript:
             return []
         text = self._clean_transcript_text(transcript)
-        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+        sentences = [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
         if not sentences:
             return []
 
@@ -591,7 +750,7 @@ class StantonTimesContentProcessor:
                 if not any(k in lower for k in keywords):
                     continue
                 cleaned = self._clean_quote(sentence)
-                min_len = 30 if re.search(r"\b\d", cleaned) else 50
+                min_len = 30 if DIGIT_RE.search(cleaned) else 50
                 if len(cleaned) < min_len:
                     continue
                 if cleaned in used:
@@ -600,7 +759,7 @@ class StantonTimesContentProcessor:
                 for keyword, weight in keyword_weights.items():
                     if keyword in lower:
                         score += weight
-                if re.search(r"\b\d", lower):
+                if DIGIT_RE.search(lower):
                     score += 1
                 if score > best_score:
                     best_score = score
@@ -623,7 +782,7 @@ class StantonTimesContentProcessor:
             if score < 2:
                 continue
             cleaned = self._clean_quote(sentence)
-            min_len = 30 if re.search(r"\b\d", cleaned) else 50
+            min_len = 30 if DIGIT_RE.search(cleaned) else 50
             if len(cleaned) < min_len:
                 continue
             if cleaned in used:
@@ -644,22 +803,25 @@ class StantonTimesContentProcessor:
         return picks[:max_quotes]
 
     def _generate_thread_draft(self, content: Dict[str, Any]) -> str:
-        title = content.get('topic') or content.get('title') or 'Star Citizen Update'
-        description = self._primary_description(content.get('description', ''))
+        features = self._features(content)
+        title = features.title
+        content_type = features.content_type
         link = content.get('link', '')
 
-        content_type = self._infer_content_type(title, description)
         if content_type not in ('live_show', 'inside_sc'):
             return ""
 
-        transcript = self._fetch_transcript_content(link)
+        story_id = content.get('story_id') or self._make_story_id(content)
+        with self.stage_timer.span('transcript_fetch', story_id):
+            transcript = self._fetch_transcript_content(link)
         max_quotes = max(self._thread_max_tweets() - 2, 1)
-        quotes = self._select_thread_quotes(transcript, max_quotes=max_quotes)
+        with self.stage_timer.span('quote_selection', story_id):
+            quotes = self._select_thread_quotes(transcript, max_quotes=max_quotes)
         if not quotes:
             return ""
 
         headline = self._headline_for_thread(title, content_type)
-        hashtags = self._build_hashtags(title, description)
+        hashtags = ' '.join(features.hashtags)
 
         intro = f"🧵 {headline}\n\nKey takeaways + quotes. Thread ⬇️"
         tweets = [intro]
@@ -680,21 +842,79 @@ class StantonTimesContentProcessor:
 
         return "\n\n---\n\n".join(numbered)
 
+    def _wants_thread(self, content: Dict[str, Any]) -> bool:
+        # Only these templates produce threads, and only from a transcript link.
+        return self._features(content).content_type in THREAD_CONTENT_TYPES and bool(content.get('link'))
+
+    def generate_thread_for_story(self, story: Dict[str, Any]) -> str:
+        """
+        Build the deferred thread draft for a pending story (mutates `story`).
+
+        Sets `thread_status` to `ready`, `unavailable` (no usable quotes) or
+        `failed`; the caller persists the story.
+        """
+        content = {key: story.get(key) for key in ('story_id', 'source', 'topic', 'title', 'description', 'link')}
+        with self.tracer.span('thread_draft', story.get('trace_id'), story.get('story_id')) as trace_attrs:
+            try:
+                with self.stage_timer.span('thread_draft', story.get('story_id')):
+                    thread_draft = self._generate_thread_draft(content)
+            except Exception as e:
+                self.error_handler.handle_error('content_processing', e, content)
+                thread_draft = ""
+                story['thread_status'] = 'failed'
+            else:
+                story['thread_status'] = 'ready' if thread_draft else 'unavailable'
+                if thread_draft:
+                    story['thread_draft'] = thread_draft
+            trace_attrs['thread_status'] = story['thread_status']
+        return thread_draft
+
+    def generate_pending_threads(self, statuses=THREAD_READY_STATUSES) -> int:
+        """
+        Background job: build thread drafts for approved/auto-approved stories.
+
+        Transcripts are fetched outside the state update so concurrent writers
+        are only locked out for the final merge. Returns the number of stories
+        whose thread status changed.
+        """
+        pending = [
+            dict(story) for story in load_state(self.state_file_path).get('pending_stories', [])
+            if story.get('thread_status') == 'pending' and story.get('draft_status') in statuses
+        ]
+        for story in pending:
+            self.generate_thread_for_story(story)
+        if not pending:
+            return 0
+
+        results = {story.get('story_id'): story for story in pending}
+
+        def _apply(state: Dict[str, Any]) -> Dict[str, Any]:
+            for story in state.get('pending_stories', []):
+                result = results.get(story.get('story_id'))
+                if result and story.get('thread_status') == 'pending':
+                    story['thread_status'] = result['thread_status']
+                    if result.get('thread_draft'):
+                        story['thread_draft'] = result['thread_draft']
+            return state
+
+        self.state = update_state(self.state_file_path, _apply)
+        return len(pending)
+
     def _generate_tweet_draft(self, content: Dict[str, Any]) -> str:
         """
         Generate a draft tweet based on content
         """
-        title = content.get('topic') or content.get('title') or 'Star Citizen Update'
-        description = self._primary_description(content.get('description', ''))
+        features = self._features(content)
+        title = features.title
         link = content.get('link', '')
 
-        content_type = self._infer_content_type(title, description)
-        summary = self._first_sentence(description)
-        hashtags = self._build_hashtags(title, description)
+        content_type = features.content_type
+        summary = features.summary
+        hashtags = ' '.join(features.hashtags)
 
         if content_type in ('ship_feature', 'ship_reveal'):
-            ship = self._extract_ship_name(title, description) or title
-            facts = self._extract_factoids(description)
+            ship = features.ship_name or title
+            facts = features.factoids
             if facts:
                 bullet_lines = "\n".join(f"• {fact}" for fact in facts)
                 body = f"🚀 {ship}: first look\n\n{bullet_lines}"
@@ -703,22 +923,22 @@ class StantonTimesContentProcessor:
                 if summary:
                     body = f"{body}\n\n{summary}"
         elif content_type == 'live_show':
-            show_title = re.sub(r"^Star Citizen Live\s*\|\s*", "", title, flags=re.I).strip()
+            show_title = LIVE_SHOW_PREFIX_RE.sub("", title).strip()
             body = f"🛰️ Star Citizen Live: {show_title}"
             if summary:
                 body = f"{body}\n\n{summary}"
         elif content_type == 'inside_sc':
-            show_title = re.sub(r"^Inside Star Citizen\s*\|\s*", "", title, flags=re.I).strip()
+            show_title = INSIDE_SC_PREFIX_RE.sub("", title).strip()
             body = f"🛰️ Inside Star Citizen: {show_title}"
             if summary:
                 body = f"{body}\n\n{summary}"
         elif content_type == 'patch':
-            headline = re.sub(r"^Star Citizen\s*\|\s*", "", title, flags=re.I).strip()
+            headline = STAR_CITIZEN_PREFIX_RE.sub("", title).strip()
             body = f"🔧 {headline}"
             if summary:
                 body = f"{body}\n\n{summary}"
         elif content_type == 'event':
-            headline = re.sub(r"^Star Citizen\s*\|\s*", "", title, flags=re.I).strip()
+            headline = STAR_CITIZEN_PREFIX_RE.sub("", title).strip()
             body = f"📡 {headline}"
             if summary:
                 body = f"{body}\n\n{summary}"
@@ -747,7 +967,9 @@ class StantonTimesContentProcessor:
         tweet_draft: str, 
         thread_draft: str = "",
         draft_status: str = "posted_for_review",
-        tier_reason: str = ""
+        tier_reason: str = "",
+        thread_status: str = "",
+        approval_tier: str = ""
     ):
         """
         Update the state file with processed content
@@ -763,6 +985,7 @@ class StantonTimesContentProcessor:
             "tier": content.get('tier'),
             "cluster_id": content.get('cluster_id'),
             "ledger_item_id": content.get('ledger_item_id'),
+            "trace_id": content.get('trace_id'),
             "content_score": score,
             "tweet_draft": tweet_draft,
             "draft_status": draft_status
@@ -770,9 +993,14 @@ class StantonTimesContentProcessor:
 
         if thread_draft:
             story["thread_draft"] = thread_draft
+            story["thread_status"] = "ready"
+        elif thread_status:
+            story["thread_status"] = thread_status
         
         if tier_reason:
             story["approval_tier_reason"] = tier_reason
+        if approval_tier:
+            story["approval_tier"] = approval_tier
 
         def _apply(state: Dict[str, Any]) -> Dict[str, Any]:
             state.setdefault("pending_stories", [])
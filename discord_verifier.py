@@ -1,11 +1,10 @@
 import json
 import logging
-from datetime import datetime
 
 from src.content_processor import StantonTimesContentProcessor
 from src.config import ensure_state_file, get_config_path, get_log_path, load_config
 from src.state.store import save_state
-from src.utils.discord_approval import send_approval_webhook
+from src.utils.discord_approval import post_stories_for_review
 
 class StantonTimesDiscordNotifier:
     def __init__(self, config_path=None, state_file_path=None):
@@ -30,35 +29,28 @@ class StantonTimesDiscordNotifier:
         if not self.webhook_url:
             raise ValueError('Discord webhook URL not configured (config or env).')
 
-    def send_webhook_message(self, story):
-        """
-        Send story draft to Discord via webhook
-        """
-        try:
-            message_id = send_approval_webhook(story, webhook_url=self.webhook_url)
-
-            if message_id:
-                story['discord_message_id'] = message_id
-                story['discord_message_ts'] = datetime.utcnow().isoformat()
-
-            self.logger.info(f"Successfully sent story draft for {story.get('topic')}")
-
-        except Exception as e:
-            self.logger.error(f"Error sending webhook: {str(e)}")
-
     def process_pending_stories(self):
         """
         Process and send pending stories
         """
         pending_stories = self.content_processor.state.get('pending_stories', [])
-        
-        for story in pending_stories:
-            if story.get('draft_status') == 'needs_review' and not story.get('discord_message_id'):
-                self.send_webhook_message(story)
-                story['draft_status'] = 'posted_for_review'
+        stories = [
+            story for story in pending_stories
+            if story.get('draft_status') == 'needs_review' and not story.get('discord_message_id')
+        ]
+
+        if stories:
+            # Sent through the ledger outbox; anything still queued stays
+            # needs_review and goes out on the next run.
+            try:
+                delivered = post_stories_for_review(stories, webhook_url=self.webhook_url)
+                self.logger.info(f"Sent {delivered} of {len(stories)} story drafts")
+            except Exception as e:
+                self.logger.error(f"Error sending webhook: {str(e)}")
 
         # Save updated state
         self.content_processor.state = save_state(self.content_processor.state_file_path, self.content_processor.state)
+        self.content_processor.flush_metrics('discord_verifier')
 
 def main():
     notifier = StantonTimesDiscordNotifier()
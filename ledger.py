@@ -1,4 +1,5 @@
 import hashlib
+import json
 import os
 import re
 import sqlite3
@@ -6,10 +7,14 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from src.config import get_db_path
 
+# Online scorer updates kept for a cold start (see ml_scorer); older rows are
+# dropped on insert.
+TRAINING_EXAMPLES_KEPT = 5000
+
 
 def _now_iso() -> str:
     return datetime.utcnow().isoformat()
@@ -57,6 +62,41 @@ def hamming_distance(a: int, b: int, bits: int = 64) -> int:
     return bin((a ^ b) & mask).count("1")
 
 
+@dataclass(frozen=True)
+class ScoreKey:
+    """
+    Everything a cached content score depends on.
+
+    `scoring_version` fingerprints the weights/mode/dictionaries and
+    `model_version` names the model baked into the score, so a change to
+    either misses the cache.
+    """
+
+    text_hash: str
+    source: str
+    priority: str
+    tier: str
+    seen: bool
+    scoring_version: str
+    model_version: str
+
+    def as_row(self) -> Tuple:
+        return (
+            self.text_hash,
+            self.source,
+            self.priority,
+            self.tier,
+            int(self.seen),
+            self.scoring_version,
+            self.model_version,
+        )
+
+
+# Per-item pipeline timestamps (UTC ISO), in hop order. `published_at` is the
+# source's own publish time; `tweeted_at` is when our tweet went out.
+HOP_COLUMNS: Tuple[str, ...] = ("fetched_at", "drafted_at", "posted_for_review_at", "approved_at", "tweeted_at")
+
+
 @dataclass
 class LedgerItem:
     item_id: int
@@ -65,10 +105,12 @@ class LedgerItem:
 
 
 class StantonTimesLedger:
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, check_same_thread: bool = True):
         self.db_path = str(db_path or get_db_path())
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
+        # Pass check_same_thread=False only when callers serialize access
+        # themselves (e.g. the scoring daemon's scorer lock).
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row
         self._init_db()
 
@@ -110,16 +152,120 @@ class StantonTimesLedger:
                 draft_text TEXT,
                 draft_hash TEXT,
                 tweet_id TEXT,
+                created_at TEXT,
+                score REAL,
+                trace_id TEXT,
+                fetched_at TEXT,
+                drafted_at TEXT,
+                posted_for_review_at TEXT,
+                approved_at TEXT,
+                tweeted_at TEXT
+            );
+            """
+        )
+        self._ensure_column(cur, "items", "score", "REAL")
+        self._ensure_column(cur, "items", "trace_id", "TEXT")
+        for column in HOP_COLUMNS:
+            self._ensure_column(cur, "items", column, "TEXT")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS training_examples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT,
+                score REAL,
                 created_at TEXT
             );
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS score_cache (
+                text_hash TEXT NOT NULL,
+                source TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                tier TEXT NOT NULL,
+                seen INTEGER NOT NULL,
+                scoring_version TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                score REAL NOT NULL,
+                created_at TEXT,
+                PRIMARY KEY (text_hash, source, priority, tier, seen, scoring_version, model_version)
+            );
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT NOT NULL UNIQUE,
+                story_id TEXT,
+                item_id INTEGER,
+                trace_id TEXT,
+                webhook_url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                reactions TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                message_id TEXT,
+                last_error TEXT,
+                created_at TEXT,
+                sent_at TEXT
+            );
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_outbox_members (
+                dedupe_key TEXT PRIMARY KEY,
+                outbox_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                story_id TEXT,
+                item_id INTEGER
+            );
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS publish_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                story_id TEXT,
+                item_id INTEGER,
+                cluster_id TEXT,
+                trace_id TEXT,
+                tweet_text TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 3,
+                approved_at TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                last_error TEXT,
+                tweet_id TEXT,
+                created_at TEXT,
+                claimed_at TEXT,
+                published_at TEXT
+            );
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_outbox_status ON webhook_outbox(status, id);")
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_publish_jobs_due ON publish_jobs(status, priority, approved_at, id);"
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_publish_jobs_published ON publish_jobs(published_at);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_outbox_members ON webhook_outbox_members(outbox_id);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_items_hash ON items(text_hash);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_items_cluster ON items(cluster_id);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_items_created ON items(created_at);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_clusters_last_seen ON clusters(last_seen);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_items_status ON items(status);")
         self.conn.commit()
 
+    def _ensure_column(self, cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+        # Ledgers created before a column existed are migrated in place.
+        cur.execute(f"PRAGMA table_info({table})")
+        if column not in {row["name"] for row in cur.fetchall()}:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
     def _text_hash(self, text: str) -> str:
         return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
 
@@ -154,12 +300,16 @@ class StantonTimesLedger:
         tier: Optional[str],
         cluster_window_days: int = 7,
         simhash_threshold: int = 8,
+        score: Optional[float] = None,
+        trace_id: Optional[str] = None,
+        fetched_at: Optional[str] = None,
     ) -> LedgerItem:
         text = f"{title} {description}"
         normalized = normalize_text(text)
         text_hash = self._text_hash(normalized)
         simhash = compute_simhash(normalized)
-        published_at = published_at or _now_iso()
+        created_at = _now_iso()
+        published_at = published_at or created_at
 
         cur = self.conn.cursor()
         cur.execute("SELECT id, cluster_id FROM items WHERE text_hash = ? LIMIT 1", (text_hash,))
@@ -203,8 +353,8 @@ class StantonTimesLedger:
             """
             INSERT INTO items (
                 source, title, url, published_at, normalized_text, text_hash, simhash,
-                cluster_id, priority, tier, status, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                cluster_id, priority, tier, status, created_at, score, trace_id, fetched_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 source,
@@ -218,7 +368,10 @@ class StantonTimesLedger:
                 priority,
                 tier,
                 "ingested",
-                _now_iso(),
+                created_at,
+                None if score is None else float(score),
+                trace_id,
+                fetched_at or created_at,
             ),
         )
         item_id = cur.lastrowid
@@ -230,20 +383,24 @@ class StantonTimesLedger:
         cur.execute("SELECT * FROM clusters WHERE cluster_id = ?", (cluster_id,))
         return cur.fetchone()
 
-    def mark_draft(self, item_id: int, cluster_id: str, draft_text: str):
+    def mark_draft(self, item_id: int, cluster_id: str, draft_text: str, auto_approved: bool = False):
         draft_hash = self._text_hash(draft_text)
+        now = _now_iso()
         cur = self.conn.cursor()
         cur.execute(
             """
-            UPDATE items SET status = ?, draft_text = ?, draft_hash = ? WHERE id = ?
+            UPDATE items
+            SET status = ?, draft_text = ?, draft_hash = ?, drafted_at = ?,
+                approved_at = CASE WHEN ? THEN COALESCE(approved_at, ?) ELSE approved_at END
+            WHERE id = ?
             """,
-            ("drafted", draft_text, draft_hash, item_id),
+            ("drafted", draft_text, draft_hash, now, int(auto_approved), now, item_id),
         )
         cur.execute(
             """
             UPDATE clusters SET last_draft_at = ? WHERE cluster_id = ?
             """,
-            (_now_iso(), cluster_id),
+            (now, cluster_id),
         )
         self.conn.commit()
 
@@ -251,19 +408,39 @@ class StantonTimesLedger:
         cur = self.conn.cursor()
         cur.execute(
             """
-            UPDATE items SET status = ? WHERE id = ?
+            UPDATE items
+            SET status = ?,
+                approved_at = CASE WHEN ? = 'approved' THEN COALESCE(approved_at, ?) ELSE approved_at END
+            WHERE id = ?
             """,
-            (status, item_id),
+            (status, status, _now_iso(), item_id),
+        )
+        self.conn.commit()
+
+    def mark_posted_for_review(self, item_id: int) -> None:
+        """
+        Stamp when the draft reached reviewers (first post only; reposts keep it).
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE items SET posted_for_review_at = COALESCE(posted_for_review_at, ?) WHERE id = ?",
+            (_now_iso(), item_id),
         )
         self.conn.commit()
 
+    def approved_at(self, item_id: int) -> Optional[str]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT approved_at FROM items WHERE id = ?", (item_id,))
+        row = cur.fetchone()
+        return row["approved_at"] if row else None
+
     def mark_published(self, item_id: int, cluster_id: str, tweet_id: str):
         cur = self.conn.cursor()
         cur.execute(
             """
-            UPDATE items SET status = ?, tweet_id = ? WHERE id = ?
+            UPDATE items SET status = ?, tweet_id = ?, tweeted_at = ? WHERE id = ?
             """,
-            ("published", tweet_id, item_id),
+            ("published", tweet_id, _now_iso(), item_id),
         )
         cur.execute(
             """
@@ -338,3 +515,396 @@ class StantonTimesLedger:
         )
         row = cur.fetchone()
         return int(row["count"] if row else 0)
+
+    def hop_timestamps(self, days: int = 7) -> List[sqlite3.Row]:
+        """
+        Source publish time and per-hop timestamps for items ingested in the
+        last `days` days (one range scan on idx_items_created).
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        cur = self.conn.cursor()
+        cur.execute(
+            f"""
+            SELECT source, priority, published_at, {", ".join(HOP_COLUMNS)}
+            FROM items
+            WHERE created_at >= ?
+            """,
+            (cutoff,),
+        )
+        return cur.fetchall()
+
+    def add_training_examples(
+        self, texts: Sequence[str], scores: Sequence[float], keep: int = TRAINING_EXAMPLES_KEPT
+    ) -> None:
+        """
+        Record online updates, keeping only the newest `keep` rows.
+        """
+        now = _now_iso()
+        cur = self.conn.cursor()
+        cur.executemany(
+            """
+            INSERT INTO training_examples (text, score, created_at) VALUES (?, ?, ?)
+            """,
+            [(text, float(score), now) for text, score in zip(texts, scores)],
+        )
+        cur.execute(
+            """
+            DELETE FROM training_examples
+            WHERE id < (SELECT id FROM training_examples ORDER BY id DESC LIMIT 1 OFFSET ?)
+            """,
+            (max(int(keep), 1) - 1,),
+        )
+        self.conn.commit()
+
+    def training_examples(self, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        cur = self.conn.cursor()
+        sql = "SELECT text, score FROM training_examples ORDER BY id"
+        params: Tuple = ()
+        if limit is not None:
+            sql = "SELECT text, score FROM (SELECT * FROM training_examples ORDER BY id DESC LIMIT ?) ORDER BY id"
+            params = (int(limit),)
+        cur.execute(sql, params)
+        return [(row["text"], float(row["score"])) for row in cur.fetchall()]
+
+    def outcome_examples(
+        self,
+        statuses: Sequence[str] = ("published", "approved", "rejected"),
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, str, Optional[float]]]:
+        """
+        Reviewed items as (normalized_text, status, score at ingest), oldest first.
+        """
+        if not statuses:
+            return []
+        placeholders = ", ".join("?" for _ in statuses)
+        sql = (
+            f"SELECT id, normalized_text, status, score FROM items "
+            f"WHERE status IN ({placeholders}) AND normalized_text IS NOT NULL "
+            f"ORDER BY id DESC"
+        )
+        params: Tuple = tuple(statuses)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        return [
+            (row["normalized_text"], row["status"], None if row["score"] is None else float(row["score"]))
+            for row in reversed(rows)
+        ]
+
+    def cached_scores(self, keys: Iterable[ScoreKey]) -> Dict[ScoreKey, float]:
+        """
+        Look up cached scores; keys without an entry are absent from the result.
+        """
+        cur = self.conn.cursor()
+        found: Dict[ScoreKey, float] = {}
+        for key in keys:
+            cur.execute(
+                """
+                SELECT score FROM score_cache
+                WHERE text_hash = ? AND source = ? AND priority = ? AND tier = ?
+                  AND seen = ? AND scoring_version = ? AND model_version = ?
+                """,
+                key.as_row(),
+            )
+            row = cur.fetchone()
+            if row is not None:
+                found[key] = float(row["score"])
+        return found
+
+    def store_scores(self, scores: Iterable[Tuple[ScoreKey, float]]) -> None:
+        now = _now_iso()
+        cur = self.conn.cursor()
+        cur.executemany(
+            """
+            INSERT OR REPLACE INTO score_cache (
+                text_hash, source, priority, tier, seen, scoring_version, model_version, score, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [key.as_row() + (float(score), now) for key, score in scores],
+        )
+        self.conn.commit()
+
+    def purge_score_cache(
+        self,
+        scoring_version: Optional[str] = None,
+        model_version: Optional[str] = None,
+        days: Optional[int] = None,
+    ) -> int:
+        """
+        Drop entries for other scoring/model versions, and/or older than `days`.
+        """
+        clauses = []
+        params: List = []
+        if scoring_version is not None:
+            clauses.append("scoring_version != ?")
+            params.append(scoring_version)
+        if model_version is not None:
+            clauses.append("model_version != ?")
+            params.append(model_version)
+        if days is not None:
+            clauses.append("created_at < ?")
+            params.append((datetime.utcnow() - timedelta(days=days)).isoformat())
+        if not clauses:
+            return 0
+        cur = self.conn.cursor()
+        cur.execute(f"DELETE FROM score_cache WHERE {' OR '.join(clauses)}", params)
+        self.conn.commit()
+        return cur.rowcount
+
+    def enqueue_webhook(
+        self,
+        dedupe_key: str,
+        webhook_url: str,
+        payload: Dict[str, Any],
+        story_id: Optional[str] = None,
+        item_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        reactions: Sequence[str] = (),
+        members: Sequence[Tuple[str, Optional[str], Optional[int]]] = (),
+    ) -> int:
+        """
+        Queue a webhook send. A key that is already queued (or sent) keeps its
+        original row, so re-enqueueing on the next run never duplicates.
+        `members` are (dedupe_key, story_id, item_id) of the stories a digest
+        post carries, in embed order.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO webhook_outbox (
+                dedupe_key, story_id, item_id, trace_id, webhook_url, payload, reactions, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                dedupe_key, story_id, item_id, trace_id, webhook_url,
+                json.dumps(payload), json.dumps(list(reactions)), _now_iso(),
+            ),
+        )
+        cur.execute("SELECT id FROM webhook_outbox WHERE dedupe_key = ?", (dedupe_key,))
+        outbox_id = int(cur.fetchone()["id"])
+        cur.executemany(
+            """
+            INSERT OR IGNORE INTO webhook_outbox_members (dedupe_key, outbox_id, position, story_id, item_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(key, outbox_id, position, member_story_id, member_item_id)
+             for position, (key, member_story_id, member_item_id) in enumerate(members)],
+        )
+        self.conn.commit()
+        return outbox_id
+
+    def next_webhook(self) -> Optional[sqlite3.Row]:
+        """
+        Oldest undelivered send. `sending` rows were claimed by a drain that
+        died before recording the result; they go out again.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT * FROM webhook_outbox WHERE status IN ('pending', 'sending') ORDER BY id LIMIT 1"
+        )
+        return cur.fetchone()
+
+    def claim_webhook(self, outbox_id: int) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE webhook_outbox SET status = 'sending', attempts = attempts + 1 WHERE id = ?",
+            (outbox_id,),
+        )
+        self.conn.commit()
+
+    def mark_webhook_sent(self, outbox_id: int, message_id: Optional[str]) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE webhook_outbox SET status = 'sent', message_id = ?, sent_at = ?, last_error = NULL WHERE id = ?",
+            (message_id, _now_iso(), outbox_id),
+        )
+        self.conn.commit()
+
+    def release_webhook(self, outbox_id: int, error: str, failed: bool = False) -> None:
+        """
+        Put a claimed send back in the queue after a retryable error, or give
+        up on it (`failed`).
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE webhook_outbox SET status = ?, last_error = ? WHERE id = ?",
+            ("failed" if failed else "pending", error[:500], outbox_id),
+        )
+        self.conn.commit()
+
+    def webhook_delivery(self, dedupe_key: str) -> Optional[sqlite3.Row]:
+        """
+        The outbox row for a send, or for the digest post carrying it (with
+        the story's `position` in the digest).
+        """
+        cur = self.conn.cursor()
+        cur.execute("SELECT *, NULL AS position FROM webhook_outbox WHERE dedupe_key = ?", (dedupe_key,))
+        row = cur.fetchone()
+        if row is not None:
+            return row
+        cur.execute(
+            """
+            SELECT o.*, m.position AS position FROM webhook_outbox_members m
+            JOIN webhook_outbox o ON o.id = m.outbox_id
+            WHERE m.dedupe_key = ?
+            """,
+            (dedupe_key,),
+        )
+        return cur.fetchone()
+
+    def webhook_members(self, outbox_id: int) -> List[sqlite3.Row]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM webhook_outbox_members WHERE outbox_id = ? ORDER BY position", (outbox_id,))
+        return cur.fetchall()
+
+    def webhook_backlog(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM webhook_outbox WHERE status IN ('pending', 'sending')")
+        return int(cur.fetchone()["n"])
+
+    def enqueue_publish_job(
+        self,
+        idempotency_key: str,
+        tweet_text: str,
+        priority: int,
+        approved_at: str,
+        story_id: Optional[str] = None,
+        item_id: Optional[int] = None,
+        cluster_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        queued_at: Optional[str] = None,
+    ) -> sqlite3.Row:
+        """
+        Queue a tweet, due at once. A key that is already queued (or
+        published) keeps its original row, so re-enqueueing on the next run
+        never duplicates. A cancelled key (the draft was edited away and
+        back) is queued again.
+        """
+        now = queued_at or _now_iso()
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO publish_jobs (
+                idempotency_key, story_id, item_id, cluster_id, trace_id, tweet_text,
+                priority, approved_at, next_attempt_at, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (idempotency_key, story_id, item_id, cluster_id, trace_id, tweet_text, priority, approved_at, now, now),
+        )
+        cur.execute(
+            """
+            UPDATE publish_jobs SET status = 'pending', attempts = 0, next_attempt_at = ?, last_error = NULL
+            WHERE idempotency_key = ? AND status = 'cancelled'
+            """,
+            (now, idempotency_key),
+        )
+        self.conn.commit()
+        return self.publish_job(idempotency_key)
+
+    def publish_job(self, idempotency_key: str) -> Optional[sqlite3.Row]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM publish_jobs WHERE idempotency_key = ?", (idempotency_key,))
+        return cur.fetchone()
+
+    def next_publish_job(self, now: str) -> Optional[sqlite3.Row]:
+        """
+        The due job to post next: highest priority, then earliest approval.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT * FROM publish_jobs
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY priority, approved_at, id LIMIT 1
+            """,
+            (now,),
+        )
+        return cur.fetchone()
+
+    def next_publish_attempt(self) -> Optional[str]:
+        """
+        When the earliest queued or in-doubt job becomes due.
+        """
+        cur = self.conn.cursor()
+        cur.execute("SELECT MIN(next_attempt_at) AS due FROM publish_jobs WHERE status IN ('pending', 'posting')")
+        row = cur.fetchone()
+        return row["due"] if row else None
+
+    def in_doubt_publish_jobs(self, now: str) -> List[sqlite3.Row]:
+        """
+        Jobs claimed by a run that died or could not tell whether the tweet
+        went out; they are checked against the timeline before any retry.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT * FROM publish_jobs WHERE status = 'posting' AND next_attempt_at <= ? ORDER BY id",
+            (now,),
+        )
+        return cur.fetchall()
+
+    def claim_publish_job(self, job_id: int, claimed_at: Optional[str] = None) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE publish_jobs SET status = 'posting', attempts = attempts + 1, claimed_at = ? WHERE id = ?",
+            (claimed_at or _now_iso(), job_id),
+        )
+        self.conn.commit()
+
+    def mark_publish_job_published(self, job_id: int, tweet_id: Optional[str], published_at: Optional[str] = None) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            UPDATE publish_jobs SET status = 'published', tweet_id = ?, published_at = ?, last_error = NULL
+            WHERE id = ?
+            """,
+            (tweet_id, published_at or _now_iso(), job_id),
+        )
+        self.conn.commit()
+
+    def reschedule_publish_job(self, job_id: int, status: str, next_attempt_at: str, error: Optional[str] = None) -> None:
+        """
+        Move a claimed job to `pending` (retry at `next_attempt_at`), back to
+        `posting` (in doubt: check the timeline at `next_attempt_at`), to
+        `failed`, or to `cancelled`.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE publish_jobs SET status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (status, next_attempt_at, error[:500] if error else None, job_id),
+        )
+        self.conn.commit()
+
+    def cancel_publish_jobs(self, key_prefix: str, keep_key: str, error: str) -> int:
+        """
+        Cancel the pending jobs under `key_prefix` (one story's tweets)
+        other than `keep_key`. Jobs being posted are left to settle.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            UPDATE publish_jobs SET status = 'cancelled', last_error = ?
+            WHERE status = 'pending' AND substr(idempotency_key, 1, ?) = ? AND idempotency_key != ?
+            """,
+            (error, len(key_prefix), key_prefix, keep_key),
+        )
+        self.conn.commit()
+        return cur.rowcount
+
+    def publish_times_since(self, since: str) -> List[str]:
+        """
+        `published_at` of every tweet posted since `since`, oldest first.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT published_at FROM publish_jobs WHERE published_at >= ? ORDER BY published_at",
+            (since,),
+        )
+        return [row["published_at"] for row in cur.fetchall()]
+
+    def publish_backlog(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) AS n FROM publish_jobs WHERE status IN ('pending', 'posting')")
+        return int(cur.fetchone()["n"])
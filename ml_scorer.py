@@ -1,119 +1,337 @@
 import numpy as np
 import os
 import json
-import pickle
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestRegressor
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import joblib
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+
+from src.config import PROJECT_ROOT, get_scorer_model_path
+
+# Bump whenever the pipeline layout changes; older artifacts are retrained.
+# v2: stateless HashingVectorizer + SGDRegressor so updates can use partial_fit.
+ARTIFACT_VERSION = 2
+
+# Checkpoint the online model after this many updates or this many seconds,
+# whichever comes first, instead of once per draft.
+DEFAULT_CHECKPOINT_EVERY = 25
+DEFAULT_CHECKPOINT_SECONDS = 900
+
+# Scores memoized per text hash; cleared whenever the model changes.
+DEFAULT_MEMO_SIZE = 4096
+
+# Used to check a loaded artifact end to end before trusting it.
+PROBE_TEXT = "Star Citizen Alpha patch notes"
+
+
+# Fallback when training_data.json is absent.
+DEFAULT_TRAINING_DATA = {
+    'texts': [
+        "Server meshing breakthrough in Star Citizen Alpha 4.6",
+        "New ship revealed at Invictus Launch Week",
+        "CitizenCon announces major gameplay updates",
+        "Minor bug fix released"
+    ],
+    'scores': [0.9, 0.8, 0.9, 0.3]
+}
+
+DEFAULT_ALPHA = 1e-4
+
+
+class ModelArtifactError(RuntimeError):
+    pass
+
+
+def load_seed_training_data() -> dict:
+    """
+    Seed examples from training_data.json, or the built-in defaults.
+    """
+    training_data_path = str(PROJECT_ROOT / 'training_data.json')
+    try:
+        with open(training_data_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {key: list(values) for key, values in DEFAULT_TRAINING_DATA.items()}
+
+
+def build_pipeline(alpha: float = DEFAULT_ALPHA) -> Pipeline:
+    return Pipeline([
+        # Stateless: no vocabulary to fit or persist, and new terms hash in
+        # without a refit.
+        ("vectorizer", HashingVectorizer(
+            stop_words='english',
+            n_features=2 ** 18,
+            ngram_range=(1, 2),
+            alternate_sign=False
+        )),
+        ("regressor", SGDRegressor(alpha=alpha, max_iter=1000, tol=1e-4, random_state=0)),
+    ])
+
+
+def save_artifact(pipeline: Pipeline, model_path: str) -> None:
+    """
+    Write vectorizer + regressor as one versioned artifact (atomic replace).
+    """
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "pipeline": pipeline,
+        "trained_at": datetime.utcnow().isoformat(),
+        "sklearn_version": sklearn.__version__,
+    }
+    tmp_path = f"{model_path}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, model_path)
+
+
+def load_artifact(model_path: str) -> dict:
+    """
+    Load an artifact, memory-mapping its arrays, and verify it can score.
+    """
+    artifact = joblib.load(model_path, mmap_mode='r')
+    if not isinstance(artifact, dict) or artifact.get("version") != ARTIFACT_VERSION:
+        raise ModelArtifactError(f"Unsupported model artifact at {model_path}")
+    pipeline = artifact.get("pipeline")
+    if not isinstance(pipeline, Pipeline):
+        raise ModelArtifactError(f"Model artifact at {model_path} has no pipeline")
+    # Fails fast on an unfitted vectorizer or regressor.
+    pipeline.predict([PROBE_TEXT])
+    return artifact
 
-from src.config import PROJECT_ROOT, get_ml_model_path
 
 class AdvancedContentScorer:
-    def __init__(self, model_path=None):
-        model_path = model_path or get_ml_model_path('content_scorer.pkl')
+    def __init__(
+        self,
+        model_path=None,
+        example_store=None,
+        checkpoint_every=DEFAULT_CHECKPOINT_EVERY,
+        checkpoint_seconds=DEFAULT_CHECKPOINT_SECONDS,
+        memo_size=DEFAULT_MEMO_SIZE,
+    ):
+        model_path = model_path or get_scorer_model_path()
         self.model_path = model_path
 
+        # Optional sink for training examples, replayed on a cold start
+        # (e.g. StantonTimesLedger)
+        self.example_store = example_store
+        self.checkpoint_every = max(int(checkpoint_every), 1)
+        self.checkpoint_seconds = float(checkpoint_seconds)
+        self.pending_updates = 0
+        self.last_checkpoint = time.monotonic()
+        self.memo_size = max(int(memo_size), 0)
+        self._memo = OrderedDict()
+
         # Ensure model directory exists
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
-        
-        # Text vectorization
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=5000,
-            ngram_range=(1, 2)
-        )
 
-        # Load or train model
+        # Load and verify the pipeline, or train one
+        self.pipeline = None
+        self._loaded_stamp = None
         if os.path.exists(model_path):
             try:
-                with open(model_path, 'rb') as f:
-                    self.model = pickle.load(f)
+                self._load_model()
             except Exception:
                 # If loading fails, train a new model
-                self.model = self._train_initial_model()
-                self._save_model(self.model_path)
-        else:
-            # Train initial model if no model exists
-            self.model = self._train_initial_model()
+                self.pipeline = None
+
+        if self.pipeline is None:
+            self.pipeline = self._train_initial_model()
             self._save_model(self.model_path)
 
+    @property
+    def vectorizer(self):
+        return self.pipeline.named_steps["vectorizer"]
+
+    @property
+    def model(self):
+        return self.pipeline.named_steps["regressor"]
+
     def _train_initial_model(self):
         """
         Train an initial machine learning model for content scoring
         """
         # Load or create default training data
-        training_data_path = str(PROJECT_ROOT / 'training_data.json')
+        training_data = load_seed_training_data()
+        texts = list(training_data['texts'])
+        scores = [float(score) for score in training_data['scores']]
+        if self.example_store is not None:
+            # Replay the online updates recorded before the artifact was lost
+            # or retired by a version bump.
+            for text, score in self.example_store.training_examples():
+                texts.append(text)
+                scores.append(score)
+
+        # Vectorize texts and train the regressor in one pipeline
+        pipeline = build_pipeline()
+        pipeline.fit(texts, scores)
+
+        return pipeline
+
+    def _artifact_stamp(self):
+        # mtime plus inode: an atomic replace always yields a new inode, even
+        # when two writes land within the filesystem's mtime resolution.
         try:
-            with open(training_data_path, 'r') as f:
-                training_data = json.load(f)
+            stat = os.stat(self.model_path)
         except FileNotFoundError:
-            # Default training data
-            training_data = {
-                'texts': [
-                    "Server meshing breakthrough in Star Citizen Alpha 4.6",
-                    "New ship revealed at Invictus Launch Week",
-                    "CitizenCon announces major gameplay updates",
-                    "Minor bug fix released"
-                ],
-                'scores': [0.9, 0.8, 0.9, 0.3]
-            }
-
-        # Vectorize texts
-        X = self.vectorizer.fit_transform(training_data['texts'])
-        y = training_data['scores']
-
-        # Train Random Forest Regressor
-        model = RandomForestRegressor(n_estimators=100)
-        model.fit(X, y)
-        
-        return model
+            return None
+        return (stat.st_mtime_ns, stat.st_ino)
+
+    def _load_model(self):
+        stamp = self._artifact_stamp()
+        self.pipeline = load_artifact(self.model_path)["pipeline"]
+        self._make_writable()
+        self._loaded_stamp = stamp
+        self._memo.clear()
+        self.pending_updates = 0
+
+    def reload_if_changed(self):
+        """
+        Pick up an artifact swapped in by another process (see `app.py retrain`).
+
+        Online updates not yet checkpointed are dropped in favour of the newer
+        artifact. Returns True when a new artifact was loaded.
+        """
+        stamp = self._artifact_stamp()
+        if stamp is None or stamp == self._loaded_stamp:
+            return False
+        try:
+            self._load_model()
+        except Exception:
+            # Keep serving the current model; retry on the next change.
+            self._loaded_stamp = stamp
+            return False
+        return True
+
+    def _make_writable(self):
+        """
+        partial_fit updates coefficients in place; memory-mapped arrays are read-only.
+        """
+        regressor = self.model
+        for name, value in list(vars(regressor).items()):
+            if isinstance(value, np.memmap):
+                setattr(regressor, name, np.array(value))
 
     def _save_model(self, model_path):
         """
-        Save the trained model
+        Save the trained pipeline
+        """
+        save_artifact(self.pipeline, model_path)
+        self.pending_updates = 0
+        self.last_checkpoint = time.monotonic()
+        if model_path == self.model_path:
+            self._loaded_stamp = self._artifact_stamp()
+
+    def checkpoint(self, force=False):
         """
-        with open(model_path, 'wb') as f:
-            pickle.dump(self.model, f)
+        Save pending online updates when the update count or interval is reached.
+
+        Returns True when the artifact was written.
+        """
+        if self.reload_if_changed() or not self.pending_updates:
+            return False
+        due = (
+            force
+            or self.pending_updates >= self.checkpoint_every
+            or time.monotonic() - self.last_checkpoint >= self.checkpoint_seconds
+        )
+        if not due:
+            return False
+        self._save_model(self.model_path)
+        return True
+
+    def _text_key(self, text):
+        return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
 
     def score_content(self, text):
         """
         Score content using machine learning model
         """
-        # Vectorize input text
-        text_vector = self.vectorizer.transform([text])
-        
-        # Predict score
-        predicted_score = self.model.predict(text_vector)[0]
-        
-        # Ensure score is between 0 and 1
-        return float(np.clip(predicted_score, 0, 1))
+        return self.score_many([text])[0]
+
+    def score_many(self, texts):
+        """
+        Score a batch of texts with one transform and one predict call.
+
+        Texts already scored by the current model come from the LRU memo; the
+        rest are vectorized together into a single sparse matrix.
+        """
+        self.reload_if_changed()
+        texts = list(texts)
+        results = [0.0] * len(texts)
+        misses = OrderedDict()
+        for idx, text in enumerate(texts):
+            key = self._text_key(text)
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                results[idx] = cached
+            else:
+                misses.setdefault(key, (text, []))[1].append(idx)
+
+        if misses:
+            # Vectorize and predict in one call
+            X = self.vectorizer.transform([text for text, _ in misses.values()])
+            # Ensure scores are between 0 and 1
+            predicted = np.clip(self.model.predict(X), 0, 1)
+            for (key, (_, indices)), score in zip(misses.items(), predicted):
+                score = float(score)
+                for idx in indices:
+                    results[idx] = score
+                self._remember(key, score)
+
+        return results
+
+    def _remember(self, key, score):
+        if not self.memo_size:
+            return
+        self._memo[key] = score
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
 
     def update_model(self, new_texts, new_scores):
         """
         Incrementally update the model with new training data
+
+        O(batch): one SGD pass over the new samples. The artifact is checkpointed
+        on a schedule (see `checkpoint`), not on every call.
         """
-        # Vectorize new texts
+        new_texts = list(new_texts)
+        new_scores = [float(score) for score in new_scores]
+        if not new_texts:
+            return
+
+        if self.example_store is not None:
+            self.example_store.add_training_examples(new_texts, new_scores)
+
+        # Vectorize new texts and take one online step
         X_new = self.vectorizer.transform(new_texts)
-        
-        # Retrain model
-        self.model.fit(X_new, new_scores)
-        
-        # Save updated model
-        self._save_model(self.model_path)
+        self.model.partial_fit(X_new, new_scores)
+        self._memo.clear()
+
+        self.pending_updates += len(new_texts)
+        self.checkpoint()
 
 def main():
     # Example usage
     scorer = AdvancedContentScorer()
-    
+
     # Score some example texts
     texts = [
         "Server meshing breakthrough in Star Citizen Alpha 4.6",
         "Minor bug fix released",
         "New ship revealed at Invictus Launch Week"
     ]
-    
+
     for text in texts:
         score = scorer.score_content(text)
         print(f"Text: {text}\nScore: {score}\n")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
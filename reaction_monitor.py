@@ -1,14 +1,98 @@
 import discord
+import copy
+import functools
 import json
 import logging
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from src.config import ensure_state_file, get_config_path, get_log_path, load_config
-from src.state.store import load_state, save_state
-from src.utils.approval_decision import decide_draft_status
+from src.state.store import load_state, update_state
+from src.telemetry.loop_lag import loop_lag_from_config
+from src.telemetry.metrics import ERRORS, queue_depth_collector, store_from_config
+from src.telemetry.tracing import tracer_from_config
+from src.utils.approval_decision import (
+    APPROVAL_REACTIONS,
+    DIGEST_REACTIONS,
+    THREAD_REQUEST_REACTION,
+    decide_draft_status,
+    digest_reaction_counts,
+    parse_digest_command,
+)
+from src.utils.discord_approval import EMBED_TITLE_PREFIX, STORY_ID_FIELD
+from src.utils.reaction_tallies import ReactionTallies
 from ledger import StantonTimesLedger
 
+DEFAULT_FETCH_CONCURRENCY = 5
+# Messages read by the first history sweep (no cursor yet)
+DEFAULT_HISTORY_SWEEP_LIMIT = 1000
+# State key for the persisted review-message index and sweep cursor
+REVIEW_INDEX_KEY = 'review_message_index'
+
+DEFAULT_REACTION_DEBOUNCE_SECONDS = 1.5
+
+REACTION_EMOJIS = tuple(APPROVAL_REACTIONS.values()) + (THREAD_REQUEST_REACTION,)
+# Tallied per message: a digest's numbers map to its stories' approvals.
+TALLY_EMOJIS = REACTION_EMOJIS + DIGEST_REACTIONS
+REVIEWABLE_STATUSES = ('posted_for_review', 'edit_requested')
+
+
+def _story_key(story):
+    # Stable across a cycle: discord_message_id may be backfilled mid-cycle.
+    return story.get('story_id') or story.get('topic') or story.get('title')
+
+
+def _message_age(message_id, now):
+    return now - discord.utils.snowflake_time(int(message_id))
+
+
+def _story_title(story):
+    return story.get('topic') or story.get('title') or ''
+
+
+def _pruned_review_index(index, stories):
+    """
+    The review index restricted to stories still in state, so it stays small.
+    """
+    story_ids = {story.get('story_id') for story in stories if story.get('story_id')}
+    titles = {_story_title(story) for story in stories}
+    return {
+        'cursor': index.get('cursor'),
+        'story_ids': {key: value for key, value in index['story_ids'].items() if key in story_ids},
+        'titles': {key: value for key, value in index['titles'].items() if key in titles},
+    }
+
+
+def _review_embed_keys(message):
+    """
+    (story_id, title) of each approval embed in a message (one for a single
+    review post, up to ten for a digest); empty for any other message.
+    """
+    keys = []
+    for embed in message.embeds:
+        title = embed.title or ''
+        if not title.startswith(EMBED_TITLE_PREFIX):
+            continue
+        story_id = next((field.value for field in embed.fields if field.name == STORY_ID_FIELD), None)
+        keys.append((story_id, title[len(EMBED_TITLE_PREFIX):]))
+    return keys
+
+
+def _story_reactions(story, counts):
+    """
+    The reactions that decide `story`: the message's own for a single review
+    post, the story's number (as ✅) for a digest.
+    """
+    position = story.get('digest_position')
+    if position is None:
+        return {emoji: counts.get(emoji, 0) for emoji in REACTION_EMOJIS}
+    reactions = {emoji: 0 for emoji in REACTION_EMOJIS}
+    reactions.update(digest_reaction_counts(counts, int(position)))
+    return reactions
+
+
 class StantonTimesReactionMonitor:
     def __init__(self, config_path=None, state_path=None):
         # Discord client setup
@@ -44,8 +128,46 @@ class StantonTimesReactionMonitor:
         self.verification_channel_id = int(self.config['discord']['verification_channel_id'])
         self.monitoring_interval = 900  # 15 minutes (fallback reconciliation)
         self.pending_stories_max_age = timedelta(hours=24)  # Stories older than 24 hours get auto-rejected
+        # Concurrent message fetches during reconciliation
+        self.fetch_concurrency = max(1, int(self.config['discord'].get('reconcile_concurrency', DEFAULT_FETCH_CONCURRENCY)))
+        self.history_sweep_limit = int(self.config['discord'].get('history_sweep_limit', DEFAULT_HISTORY_SWEEP_LIMIT))
+        self._review_index = None
+        self.tallies = ReactionTallies(TALLY_EMOJIS)
+        self._untracked_messages = set()
+        # Debounced per-message evaluation of reaction bursts
+        self.reaction_debounce_seconds = float(
+            self.config['discord'].get('reaction_debounce_seconds', DEFAULT_REACTION_DEBOUNCE_SECONDS)
+        )
+        self._pending_evaluations = {}
+        self._evaluation_locks = {}
+        self._seeding = {}
+        # Events received while a message's seed fetch is in flight
+        self._seed_events = {}
+
+        # State file, sqlite and trace/metrics writes run on one worker thread,
+        # off the event loop and in submission order (so the ledger connection
+        # is never used concurrently).
+        self.io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reaction-monitor-io')
+        self.ledger = StantonTimesLedger(check_same_thread=False)
+        self.tracer = tracer_from_config("reaction_monitor", self.config)
+        self.loop_lag = loop_lag_from_config(self.config, self.logger)
+        self._content_processor = None
+        self._content_processor_lock = threading.Lock()
+
+    @property
+    def content_processor(self):
+        """
+        Built on first use; only needed to generate deferred thread drafts.
+        Thread drafts are generated on executor threads, so the build is
+        locked: close approvals share one processor (one ledger connection,
+        one ML load).
+        """
+        with self._content_processor_lock:
+            if self._content_processor is None:
+                from src.content_processor import StantonTimesContentProcessor
 
-        self.ledger = StantonTimesLedger()
+                self._content_processor = StantonTimesContentProcessor(self.state_path, self.config_path)
+            return self._content_processor
 
     async def monitor_pending_stories(self):
         """
@@ -59,31 +181,122 @@ class StantonTimesReactionMonitor:
                 self.logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(self.monitoring_interval)
 
+    async def _run_io(self, func, *args, **kwargs):
+        """
+        Run blocking file/sqlite work on the monitor's I/O thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.io_executor, functools.partial(func, *args, **kwargs))
+
     async def check_pending_stories(self):
         """
         Check all pending stories for reaction status
         """
         # Reload state each cycle to pick up new drafts
-        self.state = self._load_state()
+        self.state = await self._run_io(self._load_state)
 
         channel = self.client.get_channel(self.verification_channel_id)
         if not channel:
             self.logger.error(f"Could not find channel with ID {self.verification_channel_id}")
             return
 
-        current_time = datetime.utcnow()
-        
-        for story in self.state.get('pending_stories', []):
-            if story.get('draft_status') == 'posted_for_review':
+        try:
+            await self._sweep_history(channel)
+        except Exception as e:
+            ERRORS.inc(system='discord', operation='history_sweep')
+            self.logger.error(f"History sweep failed: {e}")
+
+        current_time = discord.utils.utcnow()
+        stories = [
+            story for story in self.state.get('pending_stories', [])
+            if story.get('draft_status') == 'posted_for_review'
+        ]
+        loaded = {_story_key(story): copy.deepcopy(story) for story in stories}
+
+        # Fetch concurrently; discord.py queues requests per rate-limit bucket,
+        # the semaphore just bounds how many are in flight.
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        async def _fetch(story):
+            async with semaphore:
+                return await self._get_story_message(channel, story)
+
+        # A digest's stories share one message: fetch it once.
+        groups = {}
+        for story in stories:
+            groups.setdefault(story.get('discord_message_id') or id(story), []).append(story)
+        messages = await asyncio.gather(*(_fetch(group[0]) for group in groups.values()), return_exceptions=True)
+
+        for group, message in zip(groups.values(), messages):
+            for story in group:
                 try:
-                    message = await self._get_story_message(channel, story)
+                    if isinstance(message, BaseException):
+                        raise message
                     if message:
                         await self.process_story_reactions(message, story, current_time)
                 except Exception as e:
+                    ERRORS.inc(system='discord', operation='process_reactions')
                     self.logger.error(f"Error processing story {story.get('topic') or story.get('title')}: {e}")
 
-        # Save updated state
-        self._save_state()
+        # One state write per cycle, of the stories this cycle changed only:
+        # handlers may have decided others since they were loaded.
+        changed = [story for story in stories if story != loaded[_story_key(story)]]
+        await self._merge_stories(changed, {key: story.get('draft_status') for key, story in loaded.items()})
+        self._untracked_messages.clear()
+        under_review = {
+            str(story['discord_message_id']) for story in self.state.get('pending_stories', [])
+            if story.get('draft_status') in REVIEWABLE_STATUSES and story.get('discord_message_id')
+        }
+        self.tallies.retain(under_review)
+        for message_id in [key for key in self._evaluation_locks if key not in under_review]:
+            if not self._evaluation_locks[message_id].locked():
+                del self._evaluation_locks[message_id]
+        loop_lag = self.loop_lag.summary(reset=True)
+        if loop_lag['stalls']:
+            self.logger.warning(f"Event loop stalls since the last cycle: {loop_lag}")
+        await self._flush_metrics()
+
+    async def _merge_stories(self, stories, loaded_statuses):
+        """
+        Write `stories` back over their counterparts in the current state file,
+        keeping drafts other processes appended while this cycle ran. A story
+        is only replaced while its stored `draft_status` is still the one in
+        `loaded_statuses` (what the caller read before it awaited anything);
+        otherwise another handler decided it meanwhile and its write wins.
+        """
+        # Copies: the write runs on the I/O thread while handlers keep
+        # mutating the in-memory stories.
+        updated = {_story_key(story): copy.deepcopy(story) for story in stories}
+        index = copy.deepcopy(self._review_index)
+        superseded = []
+
+        def _merged(story):
+            key = _story_key(story)
+            if key not in updated:
+                return story
+            if story.get('draft_status') != loaded_statuses.get(key):
+                superseded.append(key)
+                return story
+            return updated[key]
+
+        def _apply(state):
+            state['pending_stories'] = [_merged(story) for story in state.get('pending_stories', [])]
+            if index is not None:
+                state[REVIEW_INDEX_KEY] = _pruned_review_index(index, state['pending_stories'])
+            return state
+
+        self.state = await self._run_io(update_state, self.state_path, _apply)
+        if self._review_index is not None:
+            self._review_index = _pruned_review_index(self._review_index, self.state['pending_stories'])
+        for key in superseded:
+            self.logger.info(f"Not saving stale copy of {key}: its status changed while it was processed")
+
+    async def _flush_metrics(self):
+        extra = queue_depth_collector(self.state.get('pending_stories', []))
+        try:
+            await self._run_io(store_from_config(self.config).flush, 'reaction_monitor', extra=extra)
+        except OSError as e:
+            self.logger.error(f"Failed to write metrics: {e}")
 
     async def _get_story_message(self, channel, story):
         """
@@ -94,75 +307,282 @@ class StantonTimesReactionMonitor:
             try:
                 return await channel.fetch_message(int(message_id))
             except Exception:
-                self.logger.warning(f"Could not fetch message {message_id}, falling back to search.")
+                ERRORS.inc(system='discord', operation='fetch_message')
+                self.logger.warning(f"Could not fetch message {message_id}, falling back to the history index.")
 
-        title = story.get('topic') or story.get('title') or ''
-        async for message in channel.history(limit=200):
-            if message.embeds and message.embeds[0].title == f"🗞️ Stanton Times Draft: {title}":
-                return message
-        return None
-
-    async def _handle_reaction_event(self, channel_id: int, message_id: int):
-        # Reload state for the latest story list
-        self.state = self._load_state()
-        story = next(
-            (s for s in self.state.get('pending_stories', [])
-             if str(s.get('discord_message_id')) == str(message_id)),
-            None
-        )
-        if not story or story.get('draft_status') not in ('posted_for_review', 'edit_requested'):
-            return
+        indexed_id = self._indexed_message_id(story)
+        if not indexed_id or str(indexed_id) == str(message_id):
+            return None
+        try:
+            message = await channel.fetch_message(int(indexed_id))
+        except Exception:
+            ERRORS.inc(system='discord', operation='fetch_message')
+            return None
+        # Backfill; written with the rest of the cycle's updates.
+        story['discord_message_id'] = str(indexed_id)
+        keys = _review_embed_keys(message)
+        story.pop('digest_position', None)
+        if len(keys) > 1:
+            story['digest_position'] = next(
+                (position for position, (story_id, title) in enumerate(keys)
+                 if (story.get('story_id') and story_id == story.get('story_id')) or title == _story_title(story)),
+                None,
+            )
+        return message
+
+    def _load_review_index(self):
+        if self._review_index is None:
+            stored = self.state.get(REVIEW_INDEX_KEY) or {}
+            self._review_index = {
+                'cursor': stored.get('cursor'),
+                'story_ids': dict(stored.get('story_ids') or {}),
+                'titles': dict(stored.get('titles') or {}),
+            }
+        return self._review_index
+
+    async def _sweep_history(self, channel):
+        """
+        Index approval embeds (story_id and title -> message id) posted since
+        the last sweep. The first sweep reads the newest `history_sweep_limit`
+        messages; later ones read only what came after the persisted cursor.
+        Returns the number of messages read.
+        """
+        index = self._load_review_index()
+        cursor = index['cursor']
+        if cursor:
+            # Oldest first: a repost after an edit replaces the older entry.
+            history = channel.history(limit=None, after=discord.Object(id=int(cursor)), oldest_first=True)
+            remember = dict.__setitem__
+        else:
+            # Newest first: keep the first (newest) message seen per key.
+            history = channel.history(limit=self.history_sweep_limit)
+            remember = dict.setdefault
+
+        newest = int(cursor) if cursor else 0
+        read = 0
+        async for message in history:
+            read += 1
+            newest = max(newest, message.id)
+            for story_id, title in _review_embed_keys(message):
+                if story_id:
+                    remember(index['story_ids'], story_id, str(message.id))
+                if title:
+                    remember(index['titles'], title, str(message.id))
+        if newest:
+            index['cursor'] = str(newest)
+        return read
+
+    def _indexed_message_id(self, story):
+        index = self._review_index or {}
+        story_id = story.get('story_id')
+        if story_id and story_id in index.get('story_ids', {}):
+            return index['story_ids'][story_id]
+        return index.get('titles', {}).get(_story_title(story))
+
+    def _stories_for_message(self, message_id):
+        """
+        Stories under review on a message (several for a digest).
+        """
+        return [
+            story for story in self.state.get('pending_stories', [])
+            if str(story.get('discord_message_id')) == str(message_id)
+            and story.get('draft_status') in REVIEWABLE_STATUSES
+        ]
 
+    async def _resolve_channel(self, channel_id: int):
         channel = self.client.get_channel(channel_id)
         if channel is None:
             try:
                 channel = await self.client.fetch_channel(channel_id)
             except Exception as e:
                 self.logger.error(f"Unable to fetch channel {channel_id}: {e}")
+                return None
+        return channel
+
+    async def _handle_reaction_event(self, payload, added: bool):
+        """
+        Move the in-memory tally by one gateway event and schedule a debounced
+        evaluation of the story. Only the first event for a message since
+        startup costs a REST fetch.
+        """
+        message_id = str(payload.message_id)
+        emoji = str(payload.emoji)
+        if emoji not in self.tallies.emojis:
+            return
+        event = (emoji, payload.user_id, added)
+        if self.tallies.tracks(message_id):
+            self.tallies.apply(message_id, *event)
+        else:
+            # Events arriving while the seed fetch is in flight share it. The
+            # seed applies them, in arrival order, on top of its snapshot: per
+            # user, a click the snapshot already includes is not counted again.
+            seeding = self._seeding.get(message_id)
+            if seeding is None:
+                self._seed_events[message_id] = []
+                seeding = self._seeding[message_id] = asyncio.ensure_future(
+                    self._seed_tally(payload.channel_id, message_id)
+                )
+
+                def _seeded(_):
+                    self._seeding.pop(message_id, None)
+                    self._seed_events.pop(message_id, None)
+
+                seeding.add_done_callback(_seeded)
+            self._seed_events[message_id].append(event)
+            if not await asyncio.shield(seeding):
                 return
+        if self.reaction_debounce_seconds > 0:
+            self._schedule_evaluation(payload.channel_id, message_id)
+        else:
+            await self._evaluate_serialized(payload.channel_id, message_id)
 
+    def _schedule_evaluation(self, channel_id: int, message_id: str):
+        """
+        Collapse a burst of events on one message into a single evaluation,
+        `reaction_debounce_seconds` after the first event of the burst. It
+        reads the tally as it is then, so the outcome does not depend on how
+        the burst was split.
+        """
+        if message_id in self._pending_evaluations:
+            return
+        self._pending_evaluations[message_id] = asyncio.ensure_future(
+            self._debounced_evaluation(channel_id, message_id)
+        )
+
+    async def _debounced_evaluation(self, channel_id: int, message_id: str):
+        try:
+            await asyncio.sleep(self.reaction_debounce_seconds)
+        finally:
+            # Events from here on schedule the next evaluation.
+            self._pending_evaluations.pop(message_id, None)
+        try:
+            await self._evaluate_serialized(channel_id, message_id)
+        except Exception as e:
+            ERRORS.inc(system='discord', operation='process_reactions')
+            self.logger.error(f"Error evaluating reactions for message {message_id}: {e}")
+
+    async def _evaluate_serialized(self, channel_id: int, message_id: str):
+        # A burst arriving while the previous evaluation is still generating a
+        # thread or writing state waits for it instead of racing it.
+        lock = self._evaluation_locks.setdefault(message_id, asyncio.Lock())
+        async with lock:
+            await self._evaluate_message(channel_id, message_id)
+
+    async def _seed_tally(self, channel_id: int, message_id: str) -> bool:
+        if message_id in self._untracked_messages:
+            return False
+        if not self._stories_for_message(message_id):
+            # Posted since the last reload?
+            self.state = await self._run_io(self._load_state)
+        if not self._stories_for_message(message_id):
+            # Not a review message; skip the state reload until the next cycle.
+            self._untracked_messages.add(message_id)
+            return False
+
+        channel = await self._resolve_channel(channel_id)
+        if channel is None:
+            return False
         try:
-            message = await channel.fetch_message(message_id)
+            message = await channel.fetch_message(int(message_id))
+            users = await self._reaction_users(message)
         except Exception as e:
+            ERRORS.inc(system='discord', operation='fetch_message')
             self.logger.error(f"Unable to fetch message {message_id}: {e}")
+            return False
+        # No await from here on: later events see the message as tracked and
+        # apply themselves, after the ones queued during the fetch.
+        self.tallies.reconcile(message_id, users)
+        for event in self._seed_events.pop(message_id, ()):
+            self.tallies.apply(message_id, *event)
+        return True
+
+    def _needs_update(self, story, counts, message_age):
+        reactions = _story_reactions(story, counts)
+        next_status = decide_draft_status(
+            reaction_counts=reactions,
+            message_age=message_age,
+            max_age=self.pending_stories_max_age,
+        )
+        wants_thread = story.get('thread_status') == 'pending' and (
+            next_status == 'approved' or reactions[THREAD_REQUEST_REACTION] > 0
+        )
+        return next_status not in (None, story.get('draft_status')) or wants_thread
+
+    async def _evaluate_message(self, channel_id: int, message_id: str):
+        """
+        Decide from the tallies; state is only read and written when a
+        story's status actually changes (or its thread draft is requested).
+        """
+        counts = self.tallies.counts(message_id)
+        message_age = _message_age(message_id, discord.utils.utcnow())
+        if not any(self._needs_update(story, counts, message_age) for story in self._stories_for_message(message_id)):
             return
 
-        prev_status = story.get('draft_status')
-        await self.process_story_reactions(message, story, datetime.utcnow())
-        if story.get('draft_status') != prev_status and story.get('draft_status') == 'edit_requested':
-            try:
-                await self._post_edit_request(channel, story)
-            except Exception as e:
-                self.logger.error(f"Failed to post edit request: {e}")
+        channel = await self._resolve_channel(channel_id)
+        if channel is None:
+            return
+        # Apply to the current copies of the stories, not the ones cached in memory.
+        self.state = await self._run_io(self._load_state)
+        changed = [
+            story for story in self._stories_for_message(message_id)
+            if self._needs_update(story, counts, message_age)
+        ]
+        loaded_statuses = {_story_key(story): story.get('draft_status') for story in changed}
+        for story in changed:
+            prev_status = story.get('draft_status')
+            await self._apply_reactions(channel, story, _story_reactions(story, counts), message_age)
+            if story.get('draft_status') != prev_status and story.get('draft_status') == 'edit_requested':
+                try:
+                    await self._post_edit_request(channel, story)
+                except Exception as e:
+                    self.logger.error(f"Failed to post edit request: {e}")
 
-        self._save_state()
+        if changed:
+            await self._merge_stories(changed, loaded_statuses)
 
-    async def process_story_reactions(self, message, story, current_time):
+    def _reaction_counts(self, message):
+        reactions = {emoji: 0 for emoji in TALLY_EMOJIS}
+        for reaction in message.reactions:
+            emoji = str(reaction.emoji)
+            if emoji in reactions:
+                # Leave out the bot's own seeded reaction
+                reactions[emoji] = max(reaction.count - (1 if reaction.me else 0), 0)
+        return reactions
+
+    async def _reaction_users(self, message):
         """
-        Process reactions for a specific story message
+        Ids of the users behind each approval reaction, leaving out the bot's
+        own seeded reaction (one REST call per emoji in use).
         """
-        # Check message age
-        message_age = current_time - message.created_at
-
-        # Count reactions
-        reactions = {
-            '✅': 0,
-            '❌': 0,
-            '🤔': 0,
-            '✏️': 0
-        }
-
+        users = {}
         for reaction in message.reactions:
-            if str(reaction.emoji) in reactions:
-                reactions[str(reaction.emoji)] = max(reaction.count - 1, 0)  # Subtract bot's own reaction
+            emoji = str(reaction.emoji)
+            if emoji not in self.tallies.emojis or reaction.count <= (1 if reaction.me else 0):
+                continue
+            users[emoji] = [user.id async for user in reaction.users() if user.id != self.client.user.id]
+        return users
+
+    async def process_story_reactions(self, message, story, current_time):
+        """
+        Process reactions for a specific story message (fetched during
+        reconciliation; also corrects the in-memory tally for it)
+        """
+        counts = self._reaction_counts(message)
+        if self.tallies.tracks(message.id) and self.tallies.counts(message.id) != counts:
+            drift = self.tallies.reconcile(message.id, await self._reaction_users(message))
+            self.logger.info(f"Corrected reaction tally drift for message {message.id}: {drift}")
+        await self._apply_reactions(
+            message.channel, story, _story_reactions(story, counts), current_time - message.created_at
+        )
 
+    async def _apply_reactions(self, channel, story, reactions, message_age):
         title = story.get('topic') or story.get('title') or 'Untitled'
 
         # Auto-reject stories older than 24 hours
         if message_age > self.pending_stories_max_age:
             story['draft_status'] = 'rejected'
             self.logger.info(f"Story auto-rejected due to age: {title}")
-            self._update_ledger_status(story, 'rejected')
+            await self._update_ledger_status(story, 'rejected')
             return
 
         next_status = decide_draft_status(
@@ -170,6 +590,10 @@ class StantonTimesReactionMonitor:
             message_age=message_age,
             max_age=self.pending_stories_max_age,
         )
+
+        if next_status == 'approved' or reactions[THREAD_REQUEST_REACTION] > 0:
+            await self._generate_thread(channel, story)
+
         if not next_status:
             return
 
@@ -182,7 +606,7 @@ class StantonTimesReactionMonitor:
             self.logger.info(f"Story rejected by community: {title}")
         elif next_status == 'hold':
             self.logger.info(f"Story held for review: {title}")
-        self._update_ledger_status(story, next_status)
+        await self._update_ledger_status(story, next_status)
 
     def _load_state(self):
         return load_state(self.state_path)
@@ -202,8 +626,40 @@ class StantonTimesReactionMonitor:
             message += f"Current draft: {trimmed}"
         await channel.send(message)
 
-    def _update_ledger_status(self, story, status: str):
-        item_id = story.get('ledger_item_id')
+    async def _generate_thread(self, channel, story):
+        """
+        Build a deferred thread draft (transcript fetch runs off the event loop)
+        and post it for review.
+        """
+        if story.get('thread_status') != 'pending':
+            return
+        title = story.get('topic') or story.get('title') or 'Untitled'
+        loop = asyncio.get_running_loop()
+        # The processor is built on first use, which is slow too: do it off the
+        # loop, on a copy (the I/O thread may be copying `story` for a state
+        # write meanwhile), and apply the result back here on the loop.
+        result = copy.deepcopy(story)
+        thread_draft = await loop.run_in_executor(
+            None, lambda: self.content_processor.generate_thread_for_story(result)
+        )
+        for key in ('thread_status', 'thread_draft'):
+            if key in result:
+                story[key] = result[key]
+        self.logger.info(f"Thread draft {story.get('thread_status')}: {title}")
+        if not thread_draft:
+            return
+        trimmed = thread_draft if len(thread_draft) <= 1900 else thread_draft[:1897] + '...'
+        try:
+            await channel.send(f"🧵 **Thread draft** for **{title}** (`{story.get('story_id', 'unknown')}`):\n{trimmed}")
+        except Exception as e:
+            self.logger.error(f"Failed to post thread draft: {e}")
+
+    async def _update_ledger_status(self, story, status: str):
+        await self._run_io(self._record_decision, story.get('trace_id'), story.get('story_id'),
+                           story.get('ledger_item_id'), status)
+
+    def _record_decision(self, trace_id, story_id, item_id, status: str):
+        self.tracer.event('review_decision', trace_id, story_id, decision=status)
         if not item_id:
             return
         try:
@@ -211,19 +667,14 @@ class StantonTimesReactionMonitor:
         except Exception as e:
             self.logger.error(f"Failed to update ledger status: {e}")
 
-    def _save_state(self):
-        """
-        Save updated state to file
-        """
-        self.state = save_state(self.state_path, self.state)
-
     async def on_ready(self):
         """
         Bot startup routine
         """
         self.logger.info(f'Logged in as {self.client.user} - Reaction Monitor')
-        # Start reconciliation loop in background
+        # Start reconciliation loop and loop-lag probe in background
         self.client.loop.create_task(self.monitor_pending_stories())
+        self.client.loop.create_task(self.loop_lag.run())
 
     async def on_raw_reaction_add(self, payload):
         if payload.user_id == self.client.user.id:
@@ -231,7 +682,7 @@ class StantonTimesReactionMonitor:
         if payload.channel_id != self.verification_channel_id:
             return
         try:
-            await self._handle_reaction_event(payload.channel_id, payload.message_id)
+            await self._handle_reaction_event(payload, added=True)
         except Exception as e:
             self.logger.error(f"Error handling reaction add: {e}")
 
@@ -242,6 +693,11 @@ class StantonTimesReactionMonitor:
             return
 
         content = message.content.strip()
+        reference = getattr(message, 'reference', None)
+        command = parse_digest_command(content)
+        if command and reference is not None and reference.message_id:
+            await self._apply_digest_command(message.channel, str(reference.message_id), *command)
+            return
         if not content.lower().startswith('edit:'):
             return
 
@@ -250,7 +706,7 @@ class StantonTimesReactionMonitor:
             return
 
         # Apply to most recent edit_requested story
-        self.state = self._load_state()
+        self.state = await self._run_io(self._load_state)
         target = None
         for story in reversed(self.state.get('pending_stories', [])):
             if story.get('draft_status') == 'edit_requested':
@@ -264,28 +720,62 @@ class StantonTimesReactionMonitor:
         target['draft_status'] = 'needs_review'
         target['discord_message_id'] = None
         target['discord_message_ts'] = None
-        self._update_ledger_status(target, 'edited')
-        self._save_state()
+        target.pop('digest_position', None)
+        await self._update_ledger_status(target, 'edited')
+        await self._merge_stories([target], {_story_key(target): 'edit_requested'})
 
         await message.channel.send(f"✅ Updated draft for **{target.get('topic') or target.get('title')}**. Re-posting for review.")
 
         # Re-post approval message
         try:
             from src.utils.discord_approval import send_approval_webhook
-            message_id = send_approval_webhook(target)
+            # Blocking webhook POST and reaction PUTs: run on the default
+            # executor so a slow Discord API does not hold up the I/O thread.
+            loop = asyncio.get_running_loop()
+            message_id = await loop.run_in_executor(None, send_approval_webhook, copy.deepcopy(target))
             if message_id:
                 target['discord_message_id'] = message_id
                 target['discord_message_ts'] = datetime.utcnow().isoformat()
                 target['draft_status'] = 'posted_for_review'
-                self._save_state()
+                await self._merge_stories([target], {_story_key(target): 'needs_review'})
         except Exception as e:
             self.logger.error(f"Failed to re-post edited draft: {e}")
 
+    async def _apply_digest_command(self, channel, message_id, status, positions):
+        """
+        Reject, hold or request edits for single drafts of a digest post (a
+        reply such as `reject 3`); the digest's reactions can only approve.
+        """
+        self.state = await self._run_io(self._load_state)
+        targets = [
+            story for story in self._stories_for_message(message_id)
+            if story.get('digest_position') in positions
+        ]
+        if not targets:
+            return
+        loaded_statuses = {_story_key(story): story.get('draft_status') for story in targets}
+        for story in targets:
+            story['draft_status'] = status
+            self.logger.info(f"Digest draft {story['digest_position'] + 1} marked {status}: {_story_title(story)}")
+            await self._update_ledger_status(story, status)
+        await self._merge_stories(targets, loaded_statuses)
+
+        summary = ', '.join(f"{story['digest_position'] + 1}. **{_story_title(story)}**" for story in targets)
+        await channel.send(f"Marked {status}: {summary}")
+        if status == 'edit_requested':
+            for story in targets:
+                try:
+                    await self._post_edit_request(channel, story)
+                except Exception as e:
+                    self.logger.error(f"Failed to post edit request: {e}")
+
     async def on_raw_reaction_remove(self, payload):
+        if payload.user_id == self.client.user.id:
+            return
         if payload.channel_id != self.verification_channel_id:
             return
         try:
-            await self._handle_reaction_event(payload.channel_id, payload.message_id)
+            await self._handle_reaction_event(payload, added=False)
         except Exception as e:
             self.logger.error(f"Error handling reaction remove: {e}")
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark ML scoring one text at a time against `score_many`.
+
+Scores synthetic, distinct texts with a throwaway model so the memo never
+hits; a second `score_many` pass over the same texts shows the memoized cost.
+
+Usage:
+  python scripts/bench_scoring.py [--sizes 1 100 10000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ml_scorer import AdvancedContentScorer  # noqa: E402
+
+TOPICS = (
+    "Server meshing test on the PTU",
+    "Patch notes for Alpha 4.6",
+    "Behind the Ships: Drake Golem",
+    "Invictus Launch Week schedule",
+    "Inside Star Citizen: engineering gameplay",
+)
+
+
+def _texts(count: int):
+    return [f"{TOPICS[i % len(TOPICS)]} item {i}" for i in range(count)]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        model_path = str(Path(workdir) / "scorer.joblib")
+        for size in sizes:
+            texts = _texts(size)
+            single = AdvancedContentScorer(model_path=model_path, memo_size=0)
+            batch = AdvancedContentScorer(model_path=model_path, memo_size=max(size, 1))
+            one_at_a_time = _timed(lambda: [single.score_content(text) for text in texts])
+            batched = _timed(lambda: batch.score_many(texts))
+            memoized = _timed(lambda: batch.score_many(texts))
+            rows.append((size, one_at_a_time, batched, memoized))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    args = parser.parse_args()
+
+    print(f"{'texts':>7}  {'single ms':>10}  {'batch ms':>10}  {'memo ms':>10}  {'speedup':>8}")
+    for size, single, batched, memoized in bench(args.sizes):
+        speedup = single / batched if batched else float("inf")
+        print(
+            f"{size:7d}  {single * 1000:10.1f}  {batched * 1000:10.1f}  "
+            f"{memoized * 1000:10.1f}  {speedup:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
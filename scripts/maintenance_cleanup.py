@@ -32,6 +32,7 @@ def main():
     ci = config.get("content_intelligence", {}) or {}
     archive_days = int(ci.get("draft_archive_days", 7))
     cluster_purge_days = int(ci.get("cluster_purge_days", 60))
+    score_cache_days = int(ci.get("score_cache_days", 14))
 
     state_path = Path(ensure_state_file())
     state = json.loads(state_path.read_text())
@@ -68,6 +69,7 @@ def main():
     ledger = StantonTimesLedger()
     ledger.archive_stale_items(days=archive_days)
     ledger.purge_old_clusters(days=cluster_purge_days)
+    ledger.purge_score_cache(days=score_cache_days)
 
 
 if __name__ == "__main__":
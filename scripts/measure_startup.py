@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Measure content processor startup cost with and without the ML scorer.
+
+Each scenario runs in a fresh interpreter (so import caches don't leak between
+runs) against a throwaway state file and ledger:
+
+- `local`: construct StantonTimesContentProcessor in local mode (production).
+- `ml`: same, then force the ML scorer to load (what every command paid before
+  the scorer was made lazy).
+
+Usage:
+  python scripts/measure_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from content_processor import StantonTimesContentProcessor
+processor = StantonTimesContentProcessor()
+if {force_ml!r}:
+    processor.config.setdefault("content_intelligence", {{}})["mode"] = "hybrid"
+    processor.ml_scorer
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "sklearn_loaded": "sklearn" in sys.modules,
+    "numpy_loaded": "numpy" in sys.modules,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def _run(force_ml: bool, workdir: str) -> dict:
+    env = dict(os.environ)
+    env["STANTON_TIMES_STATE_PATH"] = str(Path(workdir) / "state.json")
+    env["STANTON_TIMES_DB_PATH"] = str(Path(workdir) / "ledger.sqlite")
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(force_ml=force_ml)],
+        capture_output=True,
+        text=True,
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(runs: int) -> dict:
+    report = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, force_ml in (("local", False), ("ml", True)):
+            samples = [_run(force_ml, workdir) for _ in range(runs)]
+            report[name] = {
+                "median_seconds": statistics.median(s["seconds"] for s in samples),
+                "sklearn_loaded": samples[-1]["sklearn_loaded"],
+                "numpy_loaded": samples[-1]["numpy_loaded"],
+                "modules": samples[-1]["modules"],
+            }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    for name, row in report.items():
+        print(
+            f"{name:>6}: {row['median_seconds'] * 1000:8.1f} ms  "
+            f"modules={row['modules']:5d}  sklearn={row['sklearn_loaded']}  numpy={row['numpy_loaded']}"
+        )
+    saving = report["ml"]["median_seconds"] - report["local"]["median_seconds"]
+    print(f"saving: {saving * 1000:.1f} ms per command in local mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 import argparse
+import signal
+import sys
+from typing import Optional
 
 from src.source_monitor import AdvancedSourceMonitor
-from src.config import PROJECT_ROOT
+from src.config import (
+    PROJECT_ROOT,
+    ensure_state_file,
+    get_metrics_path,
+    get_scorer_model_path,
+    get_scoring_socket_path,
+    load_config,
+)
 from discord_verifier import StantonTimesDiscordNotifier
 from reaction_monitor import StantonTimesReactionMonitor
 from tweet_publisher import TweetPublisher
@@ -25,8 +35,16 @@ def run_reactions() -> None:
     monitor.run()
 
 
-def run_publish() -> None:
+def run_publish(watch: bool = False) -> None:
     publisher = TweetPublisher()
+    if watch:
+        # Unwind on SIGTERM (launchd stop) so the wakeup socket is removed.
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            publisher.watch()
+        except KeyboardInterrupt:
+            pass
+        return
     publisher.publish_pending_tweets()
 
 
@@ -36,13 +54,181 @@ def run_cleanup() -> None:
     cleaner.archive_old_stories(str(PROJECT_ROOT / 'archives'))
 
 
+def run_threads() -> None:
+    from src.content_processor import StantonTimesContentProcessor
+
+    processor = StantonTimesContentProcessor()
+    count = processor.generate_pending_threads()
+    processor.dump_stage_timings()
+    print(f"Generated thread drafts for {count} approved stories")
+
+
+def run_timings(runs: Optional[int] = None) -> None:
+    from src.telemetry.stages import load_runs, summarize
+
+    loaded = load_runs(get_metrics_path('stage_timings.jsonl'), limit=runs)
+    if not loaded:
+        print("No stage timings recorded yet")
+        return
+    print(f"Stage timings over {len(loaded)} runs (p50/p95 are histogram bucket bounds)")
+    print(f"{'stage':<22} {'count':>7} {'errors':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>9}  slowest")
+    rows = sorted(summarize(loaded).items(), key=lambda item: -item[1]["total_seconds"])
+    for stage, row in rows:
+        slowest = ", ".join(
+            f"{item['story_id'] or '-'}={item['seconds'] * 1000:.0f}ms" for item in row["slowest"][:3]
+        )
+        print(
+            f"{stage:<22} {row['count']:>7} {row['errors']:>6} {row['mean_seconds'] * 1000:>9.1f} "
+            f"{row['p50_seconds'] * 1000:>8.1f} {row['p95_seconds'] * 1000:>8.1f} "
+            f"{row['max_seconds'] * 1000:>9.1f}  {slowest}"
+        )
+
+
+def run_trace(target: Optional[str]) -> None:
+    from src.state.store import load_state
+    from src.telemetry.tracing import format_timeline, load_spans, tracer_from_config
+
+    if not target:
+        print("Usage: trace <story_id|trace_id>")
+        return
+    config = load_config()
+    stories = load_state(str(ensure_state_file())).get("pending_stories", [])
+    story = next((item for item in stories if target in (item.get("story_id"), item.get("trace_id"))), None)
+    trace_id = (story or {}).get("trace_id") or target
+    story_id = (story or {}).get("story_id") or target
+    spans = load_spans(tracer_from_config("app", config).exporter, trace_id=trace_id, story_id=story_id)
+    if not spans:
+        print(f"No spans recorded for {target}")
+        return
+    title = (story or {}).get("topic") or (story or {}).get("title") or ""
+    story_id = next((span["story_id"] for span in spans if span.get("story_id")), story_id)
+    print(f"Trace {spans[0]['trace_id']} story={story_id} {title}".rstrip())
+    for line in format_timeline(spans):
+        print(line)
+
+
+def run_freshness(days: int) -> None:
+    from ledger import StantonTimesLedger
+    from src.telemetry.freshness import ALL_GROUP, HOPS, format_duration, freshness_report
+
+    report = freshness_report(StantonTimesLedger().hop_timestamps(days=days))
+    if not report:
+        print(f"No ledger items in the last {days} days")
+        return
+    print(f"Freshness over the last {days} days (count p50/p95/p99 per hop)")
+    groups = sorted(report, key=lambda group: (group == ALL_GROUP, group))
+    for source, priority in groups:
+        print(f"{source} [{priority}]")
+        hops = report[(source, priority)]
+        for hop, _, _ in HOPS:
+            stats = hops.get(hop)
+            if not stats:
+                continue
+            print(
+                f"  {hop:<20} {stats['count']:>6}  {format_duration(stats['p50']):>7} "
+                f"{format_duration(stats['p95']):>7} {format_duration(stats['p99']):>7}"
+            )
+
+
+def run_metrics(serve: bool, port: int) -> None:
+    from src.state.store import load_state
+    from src.telemetry.metrics import queue_depth_collector, serve_http, store_from_config
+
+    store = store_from_config(load_config())
+    state_path = str(ensure_state_file())
+
+    def render_page() -> str:
+        # Queue depth is read fresh on every scrape.
+        return store.exposition(queue_depth_collector(load_state(state_path).get("pending_stories", [])))
+
+    if not serve:
+        print(render_page(), end="")
+        return
+    server = serve_http(render_page, port=port)
+    print(f"Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def run_retrain(workers: Optional[int] = None) -> None:
+    # sklearn is only needed here; keep it out of the other commands.
+    from ledger import StantonTimesLedger
+    from src.scoring.retrain import retrain
+
+    report = retrain(StantonTimesLedger(), get_scorer_model_path(), workers=workers)
+    live = "n/a" if report.live_mse is None else f"{report.live_mse:.4f}"
+    print(
+        f"Retrained on {report.examples} examples ({report.outcome_examples} from ledger outcomes) "
+        f"in {report.seconds:.1f}s: alpha={report.alpha:g} holdout_mse={report.holdout_mse:.4f} "
+        f"live_mse={live} -> {report.model_path}"
+    )
+
+
+def run_scoring_daemon() -> None:
+    from ledger import StantonTimesLedger
+    from ml_scorer import DEFAULT_CHECKPOINT_EVERY, DEFAULT_CHECKPOINT_SECONDS, AdvancedContentScorer
+    from src.scoring.daemon import serve
+
+    settings = load_config().get("content_intelligence", {}) or {}
+    scorer = AdvancedContentScorer(
+        example_store=StantonTimesLedger(check_same_thread=False),
+        checkpoint_every=settings.get("ml_checkpoint_every", DEFAULT_CHECKPOINT_EVERY),
+        checkpoint_seconds=settings.get("ml_checkpoint_seconds", DEFAULT_CHECKPOINT_SECONDS),
+    )
+    serve(get_scoring_socket_path(), scorer)
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Stanton Times unified entrypoint")
     parser.add_argument(
         "command",
-        choices=["monitor", "verify", "react", "publish", "cleanup"],
+        choices=["monitor", "verify", "react", "publish", "cleanup", "threads", "timings", "retrain", "serve", "trace", "freshness", "metrics"],
         help="Task to run",
     )
+    parser.add_argument(
+        "target",
+        nargs="?",
+        default=None,
+        help="Story id or trace id for trace",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=None,
+        help="Most recent runs to aggregate for timings (default: all)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Lookback window for freshness (default: 7)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="For metrics: serve /metrics over HTTP on localhost instead of printing",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=9464,
+        help="Port for metrics --serve (default: 9464)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="For publish: stay up and publish auto-approved drafts as soon as they are drafted",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for retrain (default: CPU count)",
+    )
     return parser
 
 
@@ -57,9 +243,23 @@ def main() -> None:
     elif args.command == "react":
         run_reactions()
     elif args.command == "publish":
-        run_publish()
+        run_publish(args.watch)
     elif args.command == "cleanup":
         run_cleanup()
+    elif args.command == "threads":
+        run_threads()
+    elif args.command == "timings":
+        run_timings(args.runs)
+    elif args.command == "retrain":
+        run_retrain(args.workers)
+    elif args.command == "serve":
+        run_scoring_daemon()
+    elif args.command == "trace":
+        run_trace(args.target)
+    elif args.command == "freshness":
+        run_freshness(args.days)
+    elif args.command == "metrics":
+        run_metrics(args.serve, args.port)
 
 
 if __name__ == "__main__":
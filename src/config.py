@@ -11,12 +11,16 @@ DEFAULT_ARCHIVE_DIR = PROJECT_ROOT / "archives"
 DEFAULT_METRICS_DIR = PROJECT_ROOT / "metrics"
 DEFAULT_ML_MODELS_DIR = PROJECT_ROOT / "ml_models"
 DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "stanton_times_ledger.sqlite"
+DEFAULT_SCORING_SOCKET_PATH = PROJECT_ROOT / "data" / "scoring.sock"
+DEFAULT_PUBLISH_SOCKET_PATH = PROJECT_ROOT / "data" / "publish.sock"
 DEFAULT_CREDENTIALS_DIR = Path.home() / ".credentials"
 
 # Environment variable conventions
 ENV_CONFIG_PATH = "STANTON_TIMES_CONFIG_PATH"
 ENV_STATE_PATH = "STANTON_TIMES_STATE_PATH"
 ENV_DB_PATH = "STANTON_TIMES_DB_PATH"
+ENV_SCORING_SOCKET = "STANTON_TIMES_SCORING_SOCKET"
+ENV_PUBLISH_SOCKET = "STANTON_TIMES_PUBLISH_SOCKET"
 ENV_WEBHOOK_URL = "STANTON_TIMES_DISCORD_WEBHOOK_URL"
 ENV_WEBHOOK_FILE = "STANTON_TIMES_DISCORD_WEBHOOK_FILE"
 ENV_BOT_TOKEN = "STANTON_TIMES_DISCORD_BOT_TOKEN"
@@ -52,6 +56,14 @@ def get_db_path() -> Path:
     return Path(os.getenv(ENV_DB_PATH, DEFAULT_DB_PATH))
 
 
+def get_scoring_socket_path() -> Path:
+    return Path(os.getenv(ENV_SCORING_SOCKET, DEFAULT_SCORING_SOCKET_PATH))
+
+
+def get_publish_socket_path() -> Path:
+    return Path(os.getenv(ENV_PUBLISH_SOCKET, DEFAULT_PUBLISH_SOCKET_PATH))
+
+
 def ensure_state_file() -> Path:
     state_path = get_state_path()
     state_path.parent.mkdir(parents=True, exist_ok=True)
@@ -121,6 +133,10 @@ def get_ml_model_path(filename: str) -> str:
     return str(DEFAULT_ML_MODELS_DIR / filename)
 
 
+def get_scorer_model_path() -> str:
+    return get_ml_model_path("content_scorer.joblib")
+
+
 def get_bird_auth_script() -> str:
     """
     Path to the bird authentication wrapper script.
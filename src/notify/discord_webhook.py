@@ -1,14 +1,106 @@
 from __future__ import annotations
 
+import atexit
 import json
-from typing import Any, Dict, Iterable, Optional
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import requests
 
+from src.telemetry.metrics import ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a Discord HTTP call is abandoned as a (retryable) failure
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
 
 class DiscordWebhookError(RuntimeError):
-    pass
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        # Network errors (no status), rate limits and server errors.
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class DiscordRateLimited(DiscordWebhookError):
+    def __init__(self, message: str, retry_after: float, is_global: bool = False):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+        self.is_global = is_global
+
+
+class RateLimiter:
+    """
+    Tracks Discord's per-route rate-limit buckets from response headers.
+
+    `X-RateLimit-Bucket`, `-Remaining` and `-Reset-After` say how many calls
+    the route has left and when the bucket refills; a 429 carries
+    `retry_after` (and `global` for the account-wide limit). `wait(route)`
+    sleeps only when the bucket is exhausted, so a burst goes out at exactly
+    the rate Discord allows instead of hitting 429s.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}
+        # bucket -> (remaining, reset at)
+        self._buckets: Dict[str, tuple] = {}
+        self._global_until = 0.0
+
+    def _bucket(self, route: str) -> str:
+        return self._route_buckets.get(route, route)
+
+    def delay(self, route: str) -> float:
+        now = self.clock()
+        with self._lock:
+            delay = self._global_until - now
+            remaining, reset_at = self._buckets.get(self._bucket(route), (1, 0.0))
+            if remaining <= 0:
+                delay = max(delay, reset_at - now)
+        return max(delay, 0.0)
+
+    def wait(self, route: str) -> None:
+        delay = self.delay(route)
+        if delay > 0:
+            self.sleep(delay)
+
+    def update(self, route: str, headers: Mapping[str, Any]) -> None:
+        headers = {str(key).lower(): value for key, value in (headers or {}).items()}
+        if "x-ratelimit-reset-after" not in headers:
+            return
+        now = self.clock()
+        with self._lock:
+            bucket = headers.get("x-ratelimit-bucket")
+            if bucket:
+                self._route_buckets[route] = str(bucket)
+            try:
+                remaining = int(headers.get("x-ratelimit-remaining", 1))
+                reset_at = now + float(headers["x-ratelimit-reset-after"])
+            except (TypeError, ValueError):
+                return
+            self._buckets[self._bucket(route)] = (remaining, reset_at)
+
+    def blocked(self, route: str, retry_after: float, is_global: bool = False) -> None:
+        until = self.clock() + max(retry_after, 0.0)
+        with self._lock:
+            if is_global:
+                self._global_until = max(self._global_until, until)
+            else:
+                self._buckets[self._bucket(route)] = (0, until)
+
+
+# Shared by every webhook call in the process.
+RATE_LIMITER = RateLimiter()
 
 
 def with_wait_param(webhook_url: str) -> str:
@@ -19,12 +111,58 @@ def with_wait_param(webhook_url: str) -> str:
     return urlunparse(parsed._replace(query=new_query))
 
 
-def send_webhook_payload(webhook_url: str, payload: Dict[str, Any]) -> Optional[str]:
+def webhook_route(webhook_url: str) -> str:
+    # The webhook id/token path identifies the rate-limit route.
+    return urlunparse(urlparse(webhook_url)._replace(query="", fragment=""))
+
+
+def _retry_after(resp: Any) -> tuple:
+    try:
+        body = resp.json()
+    except (json.JSONDecodeError, ValueError):
+        body = {}
+    headers = {str(key).lower(): value for key, value in (getattr(resp, "headers", None) or {}).items()}
+    retry_after = body.get("retry_after", headers.get("retry-after", 1))
+    is_global = bool(body.get("global")) or str(headers.get("x-ratelimit-global", "")).lower() == "true"
+    try:
+        return float(retry_after), is_global
+    except (TypeError, ValueError):
+        return 1.0, is_global
+
+
+def send_webhook_payload(
+    webhook_url: str,
+    payload: Dict[str, Any],
+    *,
+    limiter: Optional[RateLimiter] = None,
+    max_rate_limit_retries: int = 3,
+    post: Optional[Callable[..., Any]] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Optional[str]:
     """
     POST a webhook payload and return Discord message id when available.
-    Uses `wait=true` so Discord returns a message object.
+    Uses `wait=true` so Discord returns a message object. Waits out the
+    route's rate-limit bucket first; a 429 is retried after `retry_after`
+    (up to `max_rate_limit_retries` times) before `DiscordRateLimited`. A
+    POST with no response within `timeout` seconds fails as a network error.
     """
-    resp = requests.post(with_wait_param(webhook_url), json=payload)
+    limiter = limiter or RATE_LIMITER
+    route = webhook_route(webhook_url)
+    attempts = 0
+    while True:
+        limiter.wait(route)
+        try:
+            resp = (post or requests.post)(with_wait_param(webhook_url), json=payload, timeout=timeout)
+        except requests.RequestException as e:
+            raise DiscordWebhookError(f"Failed to send webhook: {e}") from e
+        limiter.update(route, getattr(resp, "headers", None) or {})
+        if resp.status_code != 429:
+            break
+        retry_after, is_global = _retry_after(resp)
+        limiter.blocked(route, retry_after, is_global)
+        attempts += 1
+        if attempts > max_rate_limit_retries:
+            raise DiscordRateLimited(f"Webhook rate limited: retry after {retry_after}s", retry_after, is_global)
 
     if resp.status_code in (200, 204):
         if resp.status_code == 200:
@@ -36,7 +174,120 @@ def send_webhook_payload(webhook_url: str, payload: Dict[str, Any]) -> Optional[
             return str(message_id) if message_id else None
         return None
 
-    raise DiscordWebhookError(f"Failed to send webhook: {resp.status_code} {resp.text}")
+    raise DiscordWebhookError(f"Failed to send webhook: {resp.status_code} {resp.text}", resp.status_code)
+
+
+REACTION_URL = "https://discord.com/api/v10/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """
+    Process-wide keep-alive session for Discord API calls.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def put_reaction(
+    *,
+    message_id: str,
+    channel_id: str,
+    bot_token: str,
+    emoji: str,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[RateLimiter] = None,
+    max_rate_limit_retries: int = 3,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> bool:
+    """
+    Add one reaction as the bot, paced by the channel's reaction bucket.
+    Returns False when Discord refused it; a network error or timeout raises
+    `DiscordWebhookError`.
+    """
+    limiter = limiter or RATE_LIMITER
+    session = session or http_session()
+    route = f"reactions:{channel_id}"
+    url = REACTION_URL.format(channel_id=channel_id, message_id=message_id, emoji=requests.utils.quote(str(emoji)))
+    for _ in range(max_rate_limit_retries + 1):
+        limiter.wait(route)
+        try:
+            resp = session.put(url, headers={"Authorization": f"Bot {bot_token}"}, timeout=timeout)
+        except requests.RequestException as e:
+            raise DiscordWebhookError(f"Failed to add reaction {emoji}: {e}") from e
+        limiter.update(route, getattr(resp, "headers", None) or {})
+        if resp.status_code != 429:
+            return resp.status_code in (200, 204)
+        retry_after, is_global = _retry_after(resp)
+        limiter.blocked(route, retry_after, is_global)
+    return False
+
+
+class ReactionSeeder:
+    """
+    Seeds reactions on a background thread so a review post costs only its
+    webhook round trip. Reactions go out in submission order (the emoji order
+    reviewers see), over one pooled session, paced by the rate limiter; the
+    next webhook post overlaps with them instead of waiting. They are sent one
+    at a time: every review post is in one channel, and Discord's reaction
+    bucket is per channel, so parallel PUTs would only wait on the limiter or
+    draw 429s. A failed reaction is logged and counted in `stanton_errors`;
+    the review still works without it.
+    """
+
+    def __init__(self, put: Callable[..., bool] = put_reaction):
+        self.put = put
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, *, message_id: str, channel_id: str, bot_token: str, emojis: Iterable[str]) -> None:
+        for emoji in emojis:
+            self._queue.put(
+                {"message_id": message_id, "channel_id": channel_id, "bot_token": bot_token, "emoji": emoji}
+            )
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="discord-reaction-seeder", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if not self.put(**job):
+                    raise DiscordWebhookError("refused by Discord")
+            except Exception as e:
+                ERRORS.inc(system="discord", operation="reaction")
+                logger.warning("Unable to add reaction %s to message %s: %s", job["emoji"], job["message_id"], e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted reaction was sent (or `timeout` passed).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+
+REACTION_SEEDER = ReactionSeeder()
+# Cron commands exit right after posting; let queued reactions go out first.
+atexit.register(REACTION_SEEDER.flush, 30)
 
 
 def add_reactions(
@@ -45,21 +296,15 @@ def add_reactions(
     channel_id: str,
     bot_token: str,
     emojis: Iterable[str],
+    wait: bool = False,
 ) -> None:
     """
-    Best-effort reaction seeding. No-op on errors.
+    Best-effort reaction seeding, queued on `REACTION_SEEDER`. Returns right
+    away unless `wait`.
     """
     if not (message_id and channel_id and bot_token):
         return
 
-    headers = {"Authorization": f"Bot {bot_token}"}
-    for emoji in emojis:
-        try:
-            encoded = requests.utils.quote(str(emoji))
-            url = f"https://discord.com/api/v10/channels/{channel_id}/messages/{message_id}/reactions/{encoded}/@me"
-            resp = requests.put(url, headers=headers)
-            if resp.status_code not in (200, 204):
-                continue
-        except Exception:
-            continue
-
+    REACTION_SEEDER.submit(message_id=message_id, channel_id=channel_id, bot_token=bot_token, emojis=list(emojis))
+    if wait:
+        REACTION_SEEDER.flush()
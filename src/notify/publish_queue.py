@@ -0,0 +1,280 @@
+"""
+Persistent, prioritised queue of tweets to publish.
+
+Approved stories are queued in the ledger's `publish_jobs` table under an
+idempotency key (story plus a hash of the tweet text), so queueing the same
+tweet again is a no-op and a published tweet is never queued twice. A drain
+posts due jobs highest priority first (P0 before P1 ...), then by approval
+time, within a tweets-per-window budget and a minimum spacing between
+tweets. Jobs that fail are retried with exponential backoff and given up on
+(`failed`) after `max_attempts` tries.
+
+A job is only posted while its story still stands behind it: queueing a new
+text for a story (an edited draft) cancels the story's other pending jobs,
+and a drain cancels any due job that `is_current` rejects (the story was
+rejected, held or edited after it was queued).
+
+A job is claimed (`posting`) before its tweet is sent. If the run dies, or
+the post's outcome is unknown (bird timed out, or posted without returning
+an id), the job stays `posting` and the next drain looks for its text on the
+account's timeline before anything is re-posted: found means published,
+missing means it goes back in the queue. Until the timeline can be read the
+job is held, never re-posted blind.
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_TWEETS_PER_WINDOW = 10
+DEFAULT_WINDOW_SECONDS = 3600
+DEFAULT_MIN_INTERVAL_SECONDS = 20
+DEFAULT_RETRY_BASE_SECONDS = 60
+DEFAULT_RETRY_MAX_SECONDS = 3600
+DEFAULT_MAX_ATTEMPTS = 5
+
+PRIORITY_RANKS = {"P0": 0, "P1": 1, "P2": 2}
+UNRANKED = len(PRIORITY_RANKS)
+
+URL_RE = re.compile(r"https?://\S+")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# post(job) -> tweet id; recent_tweets() -> [{id, text}] or None when unreadable
+PostFn = Callable[[sqlite3.Row], str]
+RecentTweetsFn = Callable[[], Optional[List[Dict[str, Any]]]]
+PublishedFn = Callable[[sqlite3.Row], None]
+CurrentFn = Callable[[sqlite3.Row], bool]
+
+
+class PublishError(RuntimeError):
+    """
+    A post that did not (or, with `in_doubt`, may not) have gone out.
+    """
+
+    def __init__(self, message: str, in_doubt: bool = False):
+        super().__init__(message)
+        self.in_doubt = in_doubt
+
+
+def publish_key_prefix(story: Dict[str, Any]) -> str:
+    return f"publish:{story.get('story_id') or story.get('topic') or story.get('title')}:"
+
+
+def publish_key(story: Dict[str, Any], tweet_text: str) -> str:
+    digest = hashlib.sha1(tweet_text.encode("utf-8")).hexdigest()[:16]
+    return f"{publish_key_prefix(story)}{digest}"
+
+
+def priority_rank(priority: Optional[str]) -> int:
+    return PRIORITY_RANKS.get((priority or "").upper(), UNRANKED)
+
+
+def _normalized(text: str) -> str:
+    # The timeline shows links as t.co and escapes &, < and >.
+    return WHITESPACE_RE.sub(" ", URL_RE.sub("URL", html.unescape(text))).strip()
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+@dataclass
+class PublishBudget:
+    tweets_per_window: int = DEFAULT_TWEETS_PER_WINDOW
+    window_seconds: float = DEFAULT_WINDOW_SECONDS
+    min_interval_seconds: float = DEFAULT_MIN_INTERVAL_SECONDS
+
+    def delay(self, recent: Sequence[datetime], now: datetime) -> float:
+        """
+        Seconds until another tweet fits, given the (ascending) times of the
+        tweets posted in the last window.
+        """
+        wait = 0.0
+        if recent:
+            wait = self.min_interval_seconds - (now - recent[-1]).total_seconds()
+        if self.tweets_per_window > 0 and len(recent) >= self.tweets_per_window:
+            oldest = recent[-self.tweets_per_window]
+            wait = max(wait, self.window_seconds - (now - oldest).total_seconds())
+        return max(wait, 0.0)
+
+
+@dataclass
+class PublishRun:
+    published: List[sqlite3.Row] = field(default_factory=list)
+    failed: List[sqlite3.Row] = field(default_factory=list)
+    cancelled: List[sqlite3.Row] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    # Seconds until the queue has a job it may post (None: nothing queued)
+    next_due_in: Optional[float] = None
+
+
+class PublishQueue:
+    def __init__(
+        self,
+        ledger: Any,
+        post: PostFn,
+        recent_tweets: Optional[RecentTweetsFn] = None,
+        on_published: Optional[PublishedFn] = None,
+        is_current: Optional[CurrentFn] = None,
+        budget: Optional[PublishBudget] = None,
+        retry_base_seconds: float = DEFAULT_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = DEFAULT_RETRY_MAX_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.ledger = ledger
+        self.post = post
+        self.recent_tweets = recent_tweets
+        self.on_published = on_published
+        self.is_current = is_current
+        self.budget = budget or PublishBudget()
+        self.retry_base_seconds = float(retry_base_seconds)
+        self.retry_max_seconds = float(retry_max_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.clock = clock
+        self.sleep = sleep
+
+    def enqueue(self, story: Dict[str, Any], tweet_text: str, approved_at: Optional[str] = None) -> sqlite3.Row:
+        item_id = story.get("ledger_item_id")
+        now = _iso(self.clock())
+        key = publish_key(story, tweet_text)
+        job = self.ledger.enqueue_publish_job(
+            key,
+            tweet_text,
+            priority=priority_rank(story.get("priority")),
+            approved_at=approved_at or now,
+            story_id=story.get("story_id"),
+            item_id=int(item_id) if item_id else None,
+            cluster_id=story.get("cluster_id"),
+            trace_id=story.get("trace_id"),
+            queued_at=now,
+        )
+        # An edited draft replaces the story's earlier text.
+        self.ledger.cancel_publish_jobs(publish_key_prefix(story), key, "superseded by an edited draft")
+        return job
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(self.retry_base_seconds * 2 ** max(attempts - 1, 0), self.retry_max_seconds)
+
+    def _recent_posts(self, now: datetime) -> List[datetime]:
+        since = now - timedelta(seconds=self.budget.window_seconds)
+        return [datetime.fromisoformat(stamp) for stamp in self.ledger.publish_times_since(_iso(since))]
+
+    def _published(self, job: sqlite3.Row, tweet_id: Optional[str], run: PublishRun) -> None:
+        self.ledger.mark_publish_job_published(job["id"], tweet_id, _iso(self.clock()))
+        row = self.ledger.publish_job(job["idempotency_key"])
+        run.published.append(row)
+        if self.on_published is not None:
+            self.on_published(row)
+
+    def reconcile(self, run: PublishRun) -> None:
+        """
+        Settle in-doubt jobs against the account's recent tweets.
+        """
+        jobs = self.ledger.in_doubt_publish_jobs(_iso(self.clock()))
+        if not jobs:
+            return
+        timeline = self.recent_tweets() if self.recent_tweets is not None else None
+        if timeline is None:
+            # Unreadable: hold the jobs rather than risk a second tweet.
+            for job in jobs:
+                self.ledger.reschedule_publish_job(
+                    job["id"], "posting", _iso(self.clock() + timedelta(seconds=self.retry_delay(1))),
+                    "in doubt: timeline unavailable",
+                )
+            return
+        posted = {_normalized(tweet.get("text") or ""): tweet.get("id") for tweet in timeline}
+        for job in jobs:
+            text = _normalized(job["tweet_text"])
+            if text in posted:
+                self._published(job, posted[text], run)
+            else:
+                self._retry_or_fail(job, job["last_error"] or "not on timeline after an interrupted post", run)
+
+    def _retry_or_fail(self, job: sqlite3.Row, error: str, run: PublishRun) -> None:
+        run.errors[job["idempotency_key"]] = error
+        if job["attempts"] >= self.max_attempts:
+            self.ledger.reschedule_publish_job(job["id"], "failed", job["next_attempt_at"], error)
+            run.failed.append(self.ledger.publish_job(job["idempotency_key"]))
+            return
+        retry_at = self.clock() + timedelta(seconds=self.retry_delay(job["attempts"]))
+        self.ledger.reschedule_publish_job(job["id"], "pending", _iso(retry_at), error)
+
+    def _post(self, job: sqlite3.Row, run: PublishRun) -> None:
+        self.ledger.claim_publish_job(job["id"], _iso(self.clock()))
+        job = self.ledger.publish_job(job["idempotency_key"])
+        try:
+            tweet_id = self.post(job)
+        except PublishError as e:
+            if e.in_doubt:
+                # Give the timeline time to show it before checking.
+                check_at = self.clock() + timedelta(seconds=self.retry_delay(1))
+                self.ledger.reschedule_publish_job(job["id"], "posting", _iso(check_at), str(e))
+                run.errors[job["idempotency_key"]] = str(e)
+                return
+            self._retry_or_fail(job, str(e), run)
+            return
+        self._published(job, tweet_id, run)
+
+    def drain(self, max_wait: Optional[float] = None) -> PublishRun:
+        """
+        Post due jobs until the queue is empty or the budget is spent.
+        Waits up to `max_wait` (default: the minimum spacing) for the next
+        slot; a longer wait ends the drain with `next_due_in` set.
+        """
+        if max_wait is None:
+            max_wait = self.budget.min_interval_seconds
+        run = PublishRun()
+        self.reconcile(run)
+        while True:
+            now = self.clock()
+            job = self.ledger.next_publish_job(_iso(now))
+            if job is None:
+                break
+            if self.is_current is not None and not self.is_current(job):
+                self.ledger.reschedule_publish_job(
+                    job["id"], "cancelled", job["next_attempt_at"], "story no longer approved with this text"
+                )
+                run.cancelled.append(self.ledger.publish_job(job["idempotency_key"]))
+                continue
+            wait = self.budget.delay(self._recent_posts(now), now)
+            if wait > max_wait:
+                break
+            if wait > 0:
+                self.sleep(wait)
+                continue
+            self._post(job, run)
+        run.next_due_in = self.next_due_in()
+        return run
+
+    def next_due_in(self) -> Optional[float]:
+        due = self.ledger.next_publish_attempt()
+        if due is None:
+            return None
+        now = self.clock()
+        wait = max((datetime.fromisoformat(due) - now).total_seconds(), 0.0)
+        return max(wait, self.budget.delay(self._recent_posts(now), now))
+
+
+def publish_queue_from_config(config: Dict[str, Any], ledger: Any, **kwargs: Any) -> PublishQueue:
+    settings = config.get("publishing") or {}
+    budget = PublishBudget(
+        tweets_per_window=int(settings.get("tweets_per_window", DEFAULT_TWEETS_PER_WINDOW)),
+        window_seconds=float(settings.get("window_seconds", DEFAULT_WINDOW_SECONDS)),
+        min_interval_seconds=float(settings.get("min_interval_seconds", DEFAULT_MIN_INTERVAL_SECONDS)),
+    )
+    return PublishQueue(
+        ledger,
+        budget=budget,
+        retry_base_seconds=float(settings.get("retry_base_seconds", DEFAULT_RETRY_BASE_SECONDS)),
+        retry_max_seconds=float(settings.get("retry_max_seconds", DEFAULT_RETRY_MAX_SECONDS)),
+        max_attempts=int(settings.get("max_attempts", DEFAULT_MAX_ATTEMPTS)),
+        **kwargs,
+    )
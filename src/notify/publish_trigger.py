@@ -0,0 +1,117 @@
+"""
+Wake the publisher as soon as a draft is auto-approved.
+
+A watching publisher (`src/app.py publish --watch`) binds `PublishWakeups`, a
+Unix datagram socket, and runs a publish pass whenever a story id arrives
+(and every `publishing.watch_poll_seconds` regardless). The content processor
+calls `notify_publisher` after writing an auto-approved story to state. With
+no publisher listening, it can start a one-shot `src/app.py publish` instead
+(`publishing.spawn_on_auto_approve`), otherwise the story waits for the next
+scheduled publish run.
+
+A wakeup only says "look now": every publish pass queues the publishable
+stories from the state file, so a lost datagram costs latency, never a story.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import select
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional, Union
+
+from src.config import PROJECT_ROOT, get_publish_socket_path
+
+SIGNALLED = "signalled"
+SPAWNED = "spawned"
+QUEUED = "queued"
+
+logger = logging.getLogger(__name__)
+
+
+def notify_publisher(
+    story_id: Optional[str],
+    socket_path: Optional[Union[str, Path]] = None,
+    spawn: bool = False,
+) -> str:
+    """
+    Tell a watching publisher that `story_id` is ready. Returns `signalled`,
+    `spawned` (a one-shot publish run was started) or `queued` (left for the
+    next scheduled run).
+    """
+    path = str(socket_path or get_publish_socket_path())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(json.dumps({"story_id": story_id}).encode("utf-8"), path)
+        return SIGNALLED
+    except OSError:
+        pass  # nobody listening (missing socket, or one left by a dead publisher)
+    finally:
+        sock.close()
+    if not spawn:
+        return QUEUED
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "src.app", "publish"],
+            cwd=str(PROJECT_ROOT),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.warning("Unable to start a publish run for %s: %s", story_id, e)
+        return QUEUED
+    return SPAWNED
+
+
+class PublishWakeups:
+    """
+    The publisher's end of the wakeup socket.
+    """
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None):
+        self.socket_path = str(socket_path or get_publish_socket_path())
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            # Left behind by a publisher that did not shut down cleanly.
+            os.unlink(self.socket_path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self._sock.setblocking(False)
+
+    def wait(self, timeout: Optional[float]) -> List[Optional[str]]:
+        """
+        Block until at least one wakeup arrives or `timeout` passes, then
+        return the story ids of every wakeup queued so far (a burst of
+        auto-approvals becomes one publish pass).
+        """
+        readable, _, _ = select.select([self._sock], [], [], timeout)
+        story_ids: List[Optional[str]] = []
+        if not readable:
+            return story_ids
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except BlockingIOError:
+                return story_ids
+            try:
+                story_ids.append(json.loads(data.decode("utf-8")).get("story_id"))
+            except (ValueError, AttributeError):
+                story_ids.append(None)
+
+    def close(self) -> None:
+        self._sock.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "PublishWakeups":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
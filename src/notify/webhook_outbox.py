@@ -0,0 +1,145 @@
+"""
+Persistent outbox for Discord webhook sends.
+
+Callers queue a send in the ledger's `webhook_outbox` table (keyed by a
+dedupe key, so queueing the same post again is a no-op) and then drain it.
+One drain runs at a time across processes (a file lock next to the ledger)
+and sends rows strictly in queue order, paced by the shared rate limiter in
+`discord_webhook`. A retryable failure (network, 429 past its retries, 5xx,
+or any unexpected exception from the send) leaves the row at the head of the
+queue and ends the drain, so later posts
+never overtake it; the next drain picks up where this one stopped. Rows are
+given up on (`failed`) after a non-retryable error or `max_attempts` tries.
+
+A crash between Discord accepting a post and the row being marked `sent`
+is the only way a message can go out twice: the claimed row is re-sent.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from src.notify.discord_webhook import DiscordWebhookError, send_webhook_payload
+from src.telemetry.metrics import ERRORS, WEBHOOK_LATENCY
+from src.telemetry.tracing import Tracer
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+SendFn = Callable[[str, Dict[str, Any]], Optional[str]]
+DeliveredFn = Callable[[sqlite3.Row, Optional[str]], None]
+
+
+@dataclass
+class DrainResult:
+    sent: int = 0
+    failed: int = 0
+    # Still queued after the drain (retryable error, or queued meanwhile)
+    pending: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class WebhookOutbox:
+    def __init__(
+        self,
+        ledger: Any,
+        send: SendFn = send_webhook_payload,
+        on_delivered: Optional[DeliveredFn] = None,
+        tracer: Optional[Tracer] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lock_path: Optional[str] = None,
+    ):
+        self.ledger = ledger
+        self.send = send
+        self.on_delivered = on_delivered
+        self.tracer = tracer or Tracer("webhook_outbox", enabled=False)
+        self.max_attempts = max(1, int(max_attempts))
+        self.lock_path = Path(lock_path or f"{ledger.db_path}.outbox.lock")
+
+    def enqueue(
+        self,
+        dedupe_key: str,
+        webhook_url: str,
+        payload: Dict[str, Any],
+        story_id: Optional[str] = None,
+        item_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        reactions: Sequence[str] = (),
+        members: Sequence[Tuple[str, Optional[str], Optional[int]]] = (),
+    ) -> int:
+        return self.ledger.enqueue_webhook(
+            dedupe_key, webhook_url, payload,
+            story_id=story_id, item_id=item_id, trace_id=trace_id, reactions=reactions, members=members,
+        )
+
+    def delivery(self, dedupe_key: str) -> Optional[sqlite3.Row]:
+        return self.ledger.webhook_delivery(dedupe_key)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock:
+            # Blocking: a drain that is running delivers our rows first, then
+            # this one sends whatever it left.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def drain(self) -> DrainResult:
+        """
+        Send queued rows in order until the queue is empty or a send fails
+        with a retryable error.
+        """
+        result = DrainResult()
+        with self._locked():
+            while True:
+                row = self.ledger.next_webhook()
+                if row is None or not self._deliver(row, result):
+                    break
+        result.pending = self.ledger.webhook_backlog()
+        return result
+
+    def _deliver(self, row: sqlite3.Row, result: DrainResult) -> bool:
+        """
+        Send one row. Returns False when the drain has to stop here.
+        """
+        self.ledger.claim_webhook(row["id"])
+        start = time.time()
+        began = time.perf_counter()
+        try:
+            message_id = self.send(row["webhook_url"], json.loads(row["payload"]))
+        except Exception as e:
+            # Anything but a non-retryable Discord error is retried, so a
+            # claimed row is never left `sending`.
+            retryable = e.retryable if isinstance(e, DiscordWebhookError) else True
+            elapsed = time.perf_counter() - began
+            WEBHOOK_LATENCY.observe(elapsed, outcome="error")
+            ERRORS.inc(system="discord", operation="webhook")
+            self.tracer.record(
+                "approval_webhook", row["trace_id"], start, start + elapsed,
+                story_id=row["story_id"], status="error", error=str(e),
+            )
+            give_up = not retryable or row["attempts"] + 1 >= self.max_attempts
+            self.ledger.release_webhook(row["id"], str(e), failed=give_up)
+            result.errors[row["dedupe_key"]] = str(e)
+            if give_up:
+                result.failed += 1
+            return give_up
+        elapsed = time.perf_counter() - began
+        WEBHOOK_LATENCY.observe(elapsed, outcome="ok")
+        self.tracer.record(
+            "approval_webhook", row["trace_id"], start, start + elapsed,
+            story_id=row["story_id"], message_id=message_id,
+        )
+        self.ledger.mark_webhook_sent(row["id"], message_id)
+        result.sent += 1
+        if self.on_delivered is not None:
+            self.on_delivered(row, message_id)
+        return True
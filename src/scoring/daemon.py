@@ -0,0 +1,284 @@
+"""
+Optional long-lived scoring daemon on a Unix domain socket.
+
+Each cron command used to import sklearn and load its own copy of the model.
+`ScoringServer` keeps one `AdvancedContentScorer` (and its score memo) loaded
+and serves batched requests; `RemoteScorer` is a drop-in client with the same
+`score_content` / `score_many` / `update_model` / `checkpoint` methods that
+falls back to an in-process scorer whenever the daemon is absent or goes away.
+
+Wire format: every message is a 4-byte big-endian length followed by that many
+bytes of UTF-8 JSON. Requests carry an `op` (`ping`, `score`, `update`,
+`checkpoint`); responses carry `ok` plus the result or an `error` string.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+class ProtocolError(RuntimeError):
+    pass
+
+
+class ScoringError(RuntimeError):
+    """The daemon answered, but could not serve the request."""
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(body) > MAX_FRAME_BYTES:
+        raise ProtocolError(f"Frame of {len(body)} bytes exceeds {MAX_FRAME_BYTES}")
+    return HEADER.pack(len(body)) + body
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 65536))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Read one message, or None if the peer closed the connection cleanly.
+    """
+    header = _recv_exact(sock, HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ProtocolError("Truncated frame header")
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+    body = _recv_exact(sock, length)
+    if len(body) < length:
+        raise ProtocolError("Truncated frame body")
+    message = json.loads(body.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame is not a JSON object")
+    return message
+
+
+def write_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall(encode_frame(message))
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                request = read_frame(self.request)
+            except (ProtocolError, ValueError, OSError) as e:
+                logger.warning("Dropping scoring client: %s", e)
+                return
+            if request is None:
+                return
+            write_frame(self.request, self.server.dispatch(request))
+
+
+class ScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serve one scorer to many short-lived clients. Calls into the scorer are
+    serialized; connections are handled on their own threads.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Union[str, Path], scorer: Any):
+        self.socket_path = str(socket_path)
+        self.scorer = scorer
+        self._scorer_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            # Left behind by a daemon that did not shut down cleanly.
+            os.unlink(self.socket_path)
+        super().__init__(self.socket_path, _Handler)
+        os.chmod(self.socket_path, 0o600)
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        try:
+            with self._scorer_lock:
+                if op == "ping":
+                    return {"ok": True, "pid": os.getpid()}
+                if op == "score":
+                    return {"ok": True, "scores": self.scorer.score_many(request.get("texts") or [])}
+                if op == "update":
+                    self.scorer.update_model(request.get("texts") or [], request.get("scores") or [])
+                    return {"ok": True}
+                if op == "checkpoint":
+                    return {"ok": True, "written": bool(self.scorer.checkpoint(force=bool(request.get("force"))))}
+        except Exception as e:
+            logger.exception("Scoring request failed")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+    def server_close(self) -> None:
+        try:
+            with self._scorer_lock:
+                self.scorer.checkpoint(force=True)
+        except Exception:
+            logger.exception("Final checkpoint failed")
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class RemoteScorer:
+    """
+    Client for `ScoringServer` with in-process fallback.
+
+    `fallback` builds a local scorer; it is only called once the daemon turns
+    out to be unreachable, and is used for the rest of the process lifetime.
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path],
+        fallback: Optional[Callable[[], Any]] = None,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._fallback_factory = fallback
+        self._local: Any = None
+        self._sock: Optional[socket.socket] = None
+
+    @property
+    def is_remote(self) -> bool:
+        return self._local is None
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            sock = self._connect()
+            write_frame(sock, request)
+            response = read_frame(sock)
+            if response is None:
+                raise ConnectionError("Scoring daemon closed the connection")
+        except (OSError, ProtocolError, ValueError):
+            self.close()
+            raise
+        if not response.get("ok"):
+            raise ScoringError(response.get("error") or "Scoring daemon error")
+        return response
+
+    def _use_local(self, error: Exception) -> Any:
+        if self._fallback_factory is None:
+            raise error
+        logger.warning("Scoring daemon unavailable at %s (%s); scoring in-process", self.socket_path, error)
+        self._local = self._fallback_factory()
+        return self._local
+
+    def _remote_or_local(
+        self,
+        request: Dict[str, Any],
+        remote_result: Callable[[Dict[str, Any]], Any],
+        local_call: Callable[[Any], Any],
+    ) -> Any:
+        if self._local is not None:
+            return local_call(self._local)
+        try:
+            response = self._call(request)
+        except (OSError, ProtocolError, ValueError) as e:
+            return local_call(self._use_local(e))
+        return remote_result(response)
+
+    def ping(self) -> bool:
+        try:
+            self._call({"op": "ping"})
+        except (OSError, ProtocolError, ValueError, ScoringError):
+            return False
+        return True
+
+    def score_many(self, texts: Iterable[str]) -> List[float]:
+        texts = list(texts)
+        return self._remote_or_local(
+            {"op": "score", "texts": texts},
+            lambda response: [float(score) for score in response["scores"]],
+            lambda scorer: scorer.score_many(texts),
+        )
+
+    def score_content(self, text: str) -> float:
+        return self.score_many([text])[0]
+
+    def update_model(self, new_texts: Iterable[str], new_scores: Iterable[float]) -> None:
+        texts = list(new_texts)
+        scores = [float(score) for score in new_scores]
+        self._remote_or_local(
+            {"op": "update", "texts": texts, "scores": scores},
+            lambda response: None,
+            lambda scorer: scorer.update_model(texts, scores),
+        )
+
+    def checkpoint(self, force: bool = False) -> bool:
+        return bool(self._remote_or_local(
+            {"op": "checkpoint", "force": force},
+            lambda response: response.get("written"),
+            lambda scorer: scorer.checkpoint(force=force),
+        ))
+
+
+def connect_scorer(socket_path: Union[str, Path], fallback: Callable[[], Any]) -> Any:
+    """
+    A `RemoteScorer` when a daemon answers at `socket_path`, else `fallback()`.
+    """
+    if not os.path.exists(str(socket_path)):
+        return fallback()
+    remote = RemoteScorer(socket_path, fallback=fallback)
+    if remote.ping():
+        return remote
+    remote.close()
+    return fallback()
+
+
+def _exit_on_sigterm(signum, frame) -> None:
+    raise SystemExit(0)
+
+
+def serve(socket_path: Union[str, Path], scorer: Any) -> None:
+    server = ScoringServer(socket_path, scorer)
+    if threading.current_thread() is threading.main_thread():
+        # Unwind through server_close: final checkpoint and socket cleanup.
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    logger.info("Scoring daemon listening on %s", socket_path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,306 @@
+"""
+Feature extraction shared by scoring and drafting.
+
+Every scorer and draft template used to rebuild the same lowercase
+topic/title/description haystack and re-run its own regexes. `FeatureExtractor`
+analyzes an item once and caches the resulting `ContentFeatures` record so the
+scoring and drafting paths read from the same place.
+"""
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.scoring.keywords import KeywordAutomaton, KeywordMatches, KeywordSpec, merge_dictionaries
+
+
+DESCRIPTION_SEPARATOR = "------------------------------------------"
+
+# Keyword dictionaries used by the traditional scorer.
+HIGH_INTEREST_KEYWORDS: Tuple[str, ...] = (
+    'patch', 'patch notes', 'update', 'ptu', 'hotfix', 'roadmap',
+    'alpha', 'beta', 'release', 'improvement', 'spectrum',
+    'inside star citizen', 'star citizen live', 'behind the ships', 'tech talk',
+    'ship', 'ships', 'vehicle', 'freighter', 'hauler', 'cargo', 'engineering',
+    'server meshing', 'performance', 'optimization', 'invictus', 'citizencon',
+    'iae', 'ship talk', 'introducing', 'new ship', 'squadron 42',
+)
+
+TECHNICAL_KEYWORDS: Tuple[str, ...] = (
+    'performance', 'optimization', 'networking',
+    'server meshing', 'technical', 'implementation',
+    'engineering', 'tech talk', 'latency', 'persistence',
+    'rendering', 'physics', 'netcode',
+)
+
+# Content-type detection (checked in order by `infer_content_type`).
+PATCH_KEYWORDS: Tuple[str, ...] = ('patch notes', 'patch report', 'hotfix')
+LIVE_SHOW_KEYWORDS: Tuple[str, ...] = ('star citizen live', 'scl', 'tech talk')
+SHIP_REVEAL_KEYWORDS: Tuple[str, ...] = ('introducing', 'new ship')
+SHIP_KEYWORDS: Tuple[str, ...] = ('ship', 'ships', 'vehicle')
+MANUFACTURER_KEYWORDS: Tuple[str, ...] = (
+    'rsi', 'drake', 'aegis', 'anvil', 'origin', 'crusader', 'misc', 'argo', 'kruger'
+)
+EVENT_KEYWORDS: Tuple[str, ...] = ('citizencon', 'invictus', 'iae', 'event')
+
+# First match wins; mirrors the order the style guide has always used.
+HASHTAG_MAP: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('patch', ('#StarCitizen', '#PatchNotes')),
+    ('server', ('#StarCitizen', '#ServerTech')),
+    ('event', ('#StarCitizen', '#CommunityEvent')),
+    ('ship', ('#StarCitizen', '#SpaceShip')),
+)
+
+SHIP_STOP_WORDS = frozenset({"vehicle", "highlights", "preview", "overview", "trailer", "feature", "update"})
+
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+SUMMARY_KEYWORD_RE = re.compile(
+    r"(patch|alpha|ship|cargo|freighter|hauler|engineering|server|live|inside|update|event|performance)",
+    re.I,
+)
+SHIP_TITLE_RES: Tuple[re.Pattern, ...] = (
+    re.compile(r"Behind the Ships:\s*(.+)$", re.I),
+    re.compile(r"Introducing (?:the )?(.*)$", re.I),
+)
+SHIP_MANUFACTURER_RE = re.compile(r"(RSI|Drake|Aegis|Anvil|Origin|Crusader|MISC|Argo|Kruger)\s+([A-Za-z0-9\- ]+)")
+FACTOID_SPLIT_RE = re.compile(r"[;\n•]")
+FACTOID_COMMA_RE = re.compile(r",")
+DIGIT_RE = re.compile(r"\b\d")
+SIZE_CLASS_RE = re.compile(r"\bS\d\b")
+LEADING_CONJUNCTION_RE = re.compile(r"^\s*(and|plus|with)\s+", re.I)
+
+
+@dataclass(frozen=True)
+class ContentFeatures:
+    """
+    Everything the scorers and draft templates need to know about one item.
+
+    `haystack` is the lowercase topic/title/description text the scorers match
+    against; `title`/`description` are the draft-facing values (primary
+    description only).
+    """
+
+    title: str
+    description: str
+    haystack: str
+    keyword_hits: Mapping[str, Tuple[str, ...]]
+    keyword_scores: Mapping[str, float]
+    content_type: str
+    summary: str
+    ship_name: str
+    factoids: Tuple[str, ...]
+    hashtags: Tuple[str, ...]
+
+    def hit_count(self, dictionary: str) -> int:
+        return len(self.keyword_hits.get(dictionary, ()))
+
+    def keyword_score(self, dictionary: str) -> float:
+        return float(self.keyword_scores.get(dictionary, 0.0))
+
+
+def primary_description(description: str) -> str:
+    if not description:
+        return ""
+    primary = description.split(DESCRIPTION_SEPARATOR)[0]
+    return WHITESPACE_RE.sub(" ", primary).strip()
+
+
+def first_sentence(text: str) -> str:
+    if not text:
+        return ""
+    sentences = [s.strip() for s in SENTENCE_SPLIT_RE.split(text) if s.strip()]
+    if not sentences:
+        return text.strip()
+
+    for sentence in sentences:
+        if SUMMARY_KEYWORD_RE.search(sentence):
+            return sentence
+
+    for sentence in sentences:
+        if len(sentence) >= 40:
+            return sentence
+
+    return sentences[0]
+
+
+def extract_ship_name(topic: str) -> str:
+    for pattern in SHIP_TITLE_RES:
+        match = pattern.search(topic or "")
+        if match:
+            return match.group(1).strip()
+    match = SHIP_MANUFACTURER_RE.search(topic or "")
+    if match:
+        name = f"{match.group(1)} {match.group(2)}".strip()
+        words = []
+        for word in name.split():
+            if word.lower() in SHIP_STOP_WORDS:
+                break
+            words.append(word)
+        return " ".join(words) if words else name
+    return (topic or "").strip()
+
+
+def extract_factoids(text: str, limit: int = 3) -> List[str]:
+    if not text:
+        return []
+    snippet = text[:300]
+    parts = FACTOID_SPLIT_RE.split(snippet)
+    if len(parts) == 1:
+        parts = FACTOID_COMMA_RE.split(snippet)
+    factoids: List[str] = []
+    for part in parts:
+        if DIGIT_RE.search(part) or SIZE_CLASS_RE.search(part) or 'scu' in part.lower():
+            cleaned = LEADING_CONJUNCTION_RE.sub("", part).strip()
+            cleaned = WHITESPACE_RE.sub(" ", cleaned).strip(" -–•")
+            if ':' in cleaned:
+                _, suffix = cleaned.split(':', 1)
+                if DIGIT_RE.search(suffix) or 'scu' in suffix.lower():
+                    cleaned = suffix.strip()
+            if cleaned and cleaned not in factoids:
+                if len(cleaned) > 80:
+                    cleaned = cleaned[:77].rsplit(" ", 1)[0] + "..."
+                factoids.append(cleaned)
+        if len(factoids) >= limit:
+            break
+    return factoids
+
+
+# Scoring dictionaries are matched against the scoring haystack and may be
+# extended from config; drafting dictionaries are matched against the draft
+# title/description and stay fixed.
+SCORING_DICTIONARIES: Dict[str, Tuple[str, ...]] = {
+    "community_interest": HIGH_INTEREST_KEYWORDS,
+    "technical_depth": TECHNICAL_KEYWORDS,
+}
+
+DRAFTING_DICTIONARIES: Dict[str, Tuple[str, ...]] = {
+    "patch": PATCH_KEYWORDS,
+    "inside_sc": ('inside star citizen',),
+    "live_show": LIVE_SHOW_KEYWORDS,
+    "ship_feature": ('behind the ships',),
+    "ship_reveal": SHIP_REVEAL_KEYWORDS,
+    "ship": SHIP_KEYWORDS,
+    "manufacturer": MANUFACTURER_KEYWORDS,
+    "event": EVENT_KEYWORDS,
+    "hashtag": tuple(key for key, _ in HASHTAG_MAP),
+}
+
+DRAFTING_AUTOMATON = KeywordAutomaton(DRAFTING_DICTIONARIES)
+
+
+def content_type_from_matches(matches: KeywordMatches) -> str:
+    if matches.any('patch'):
+        return 'patch'
+    if matches.any('inside_sc'):
+        return 'inside_sc'
+    if matches.any('live_show'):
+        return 'live_show'
+    if matches.any('ship_feature'):
+        return 'ship_feature'
+    if matches.any('ship_reveal'):
+        return 'ship_reveal'
+    if matches.any('ship') and matches.any('manufacturer'):
+        return 'ship_reveal'
+    if matches.any('event'):
+        return 'event'
+    return 'general'
+
+
+def hashtags_from_matches(matches: KeywordMatches) -> List[str]:
+    found = set(matches.hits.get('hashtag', ()))
+    for key, tags in HASHTAG_MAP:
+        if key in found:
+            return list(tags)
+    return ['#StarCitizen']
+
+
+def infer_content_type(text: str) -> str:
+    """
+    Classify lowercase `title description` text into a draft template type.
+    """
+    return content_type_from_matches(DRAFTING_AUTOMATON.match(text))
+
+
+def suggest_hashtags(text: str) -> List[str]:
+    """
+    Hashtags for already-lowercased text (see `TweetStyleGuide.suggest_hashtags`).
+    """
+    return hashtags_from_matches(DRAFTING_AUTOMATON.match(text))
+
+
+def draft_hashtags(tags: List[str]) -> Tuple[str, ...]:
+    if '#StarCitizen' not in tags:
+        tags = ['#StarCitizen'] + tags
+    return tuple(dict.fromkeys(tags))
+
+
+def scoring_haystack(content: Mapping[str, Any]) -> str:
+    return " ".join(
+        part for part in (content.get('topic'), content.get('title'), content.get('description'))
+        if part
+    ).lower()
+
+
+class FeatureExtractor:
+    """
+    Build `ContentFeatures` once per distinct item and memoize the result.
+
+    The cache is keyed by the text fields the analysis depends on, so the same
+    feed entry seen again on a later poll (or scored and then drafted) reuses
+    the existing record.
+
+    `keyword_dictionaries` extends the scoring dictionaries (see
+    `content_intelligence.keyword_dictionaries` in config).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        keyword_dictionaries: Optional[Mapping[str, KeywordSpec]] = None,
+    ):
+        self.max_entries = max_entries
+        self.scoring_automaton = KeywordAutomaton(merge_dictionaries(SCORING_DICTIONARIES, keyword_dictionaries))
+        self._cache: "OrderedDict[Tuple[Optional[str], ...], ContentFeatures]" = OrderedDict()
+
+    def _cache_key(self, content: Mapping[str, Any]) -> Tuple[Optional[str], ...]:
+        return (content.get('topic'), content.get('title'), content.get('description'))
+
+    def extract(self, content: Mapping[str, Any]) -> ContentFeatures:
+        key = self._cache_key(content)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        features = self._analyze(content)
+        self._cache[key] = features
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return features
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _analyze(self, content: Mapping[str, Any]) -> ContentFeatures:
+        haystack = scoring_haystack(content)
+        scoring = self.scoring_automaton.match(haystack)
+
+        title = content.get('topic') or content.get('title') or 'Star Citizen Update'
+        description = primary_description(content.get('description', ''))
+        drafting = DRAFTING_AUTOMATON.match(f"{title} {description}".lower())
+
+        return ContentFeatures(
+            title=title,
+            description=description,
+            haystack=haystack,
+            keyword_hits=scoring.hits,
+            keyword_scores=scoring.scores,
+            content_type=content_type_from_matches(drafting),
+            summary=first_sentence(description),
+            ship_name=extract_ship_name(title),
+            factoids=tuple(extract_factoids(description)),
+            hashtags=draft_hashtags(hashtags_from_matches(drafting)),
+        )
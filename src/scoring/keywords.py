@@ -0,0 +1,182 @@
+"""
+Multi-keyword matching with a single Aho-Corasick automaton.
+
+Keyword checks used to be `keyword in text` once per keyword, i.e. one pass of
+the haystack per entry. `KeywordAutomaton` compiles every configured
+dictionary into one trie with failure links and reports all hits in a single
+linear pass, so dictionaries can grow to hundreds of entries without slowing
+filtering or scoring down.
+
+Matching keeps the substring semantics of `keyword in text` (so `ship` also
+hits `ships`), and each keyword is counted at most once per text.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+
+KeywordSpec = Union[Mapping[str, Any], Iterable[str]]
+
+
+@dataclass(frozen=True)
+class KeywordEntry:
+    dictionary: str
+    keyword: str
+    weight: float
+    order: int
+
+
+@dataclass(frozen=True)
+class KeywordMatches:
+    """
+    Per-dictionary hits for one text.
+
+    `hits` lists matched keywords in dictionary definition order; `scores` is
+    the sum of their weights.
+    """
+
+    hits: Mapping[str, Tuple[str, ...]]
+    scores: Mapping[str, float]
+
+    def hit_count(self, dictionary: str) -> int:
+        return len(self.hits.get(dictionary, ()))
+
+    def score(self, dictionary: str) -> float:
+        return float(self.scores.get(dictionary, 0.0))
+
+    def any(self, dictionary: str) -> bool:
+        return bool(self.hits.get(dictionary))
+
+
+def normalize_dictionary(spec: Optional[KeywordSpec], default_weight: float = 1.0) -> Dict[str, float]:
+    """
+    Accept either `{keyword: weight}` or a plain list of keywords.
+
+    Keywords are lowercased; entries with non-numeric weights are skipped.
+    """
+    if not spec:
+        return {}
+    if isinstance(spec, str):
+        spec = [spec]
+    if isinstance(spec, Mapping):
+        items = spec.items()
+    else:
+        items = ((keyword, default_weight) for keyword in spec)
+
+    normalized: Dict[str, float] = {}
+    for keyword, weight in items:
+        keyword = str(keyword).strip().lower()
+        if not keyword:
+            continue
+        try:
+            normalized[keyword] = float(weight)
+        except (TypeError, ValueError):
+            continue
+    return normalized
+
+
+def merge_dictionaries(
+    base: Mapping[str, KeywordSpec],
+    overrides: Optional[Mapping[str, KeywordSpec]],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Extend `base` dictionaries with configured entries (config wins on weight).
+    """
+    merged = {name: normalize_dictionary(spec) for name, spec in base.items()}
+    if not isinstance(overrides, Mapping):
+        return merged
+    for name, spec in overrides.items():
+        merged.setdefault(str(name), {}).update(normalize_dictionary(spec))
+    return merged
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over one or more weighted keyword dictionaries.
+    """
+
+    def __init__(self, dictionaries: Mapping[str, KeywordSpec]):
+        self.entries: List[KeywordEntry] = []
+        self.dictionary_names: Tuple[str, ...] = tuple(str(name) for name in dictionaries)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        pending_out: List[List[int]] = [[]]
+        for name, spec in dictionaries.items():
+            for order, (keyword, weight) in enumerate(normalize_dictionary(spec).items()):
+                entry_id = len(self.entries)
+                self.entries.append(KeywordEntry(str(name), keyword, weight, order))
+                node = 0
+                for char in keyword:
+                    nxt = self._goto[node].get(char)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][char] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        pending_out.append([])
+                    node = nxt
+                pending_out[node].append(entry_id)
+
+        self._build_failure_links(pending_out)
+
+    def _build_failure_links(self, pending_out: List[List[int]]) -> None:
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # BFS order guarantees the failure target's outputs are final.
+                pending_out[child].extend(pending_out[self._fail[child]])
+
+        self._out = [tuple(ids) for ids in pending_out]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(self, text: str) -> List[int]:
+        """
+        Return the ids of every entry found in `text` (each id at most once).
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        seen = set()
+        found: List[int] = []
+        node = 0
+        for char in text or "":
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for entry_id in out[node]:
+                if entry_id not in seen:
+                    seen.add(entry_id)
+                    found.append(entry_id)
+        return found
+
+    def match(self, text: str) -> KeywordMatches:
+        grouped: Dict[str, List[KeywordEntry]] = {name: [] for name in self.dictionary_names}
+        for entry_id in self.find(text):
+            entry = self.entries[entry_id]
+            grouped[entry.dictionary].append(entry)
+
+        hits: Dict[str, Tuple[str, ...]] = {}
+        scores: Dict[str, float] = {}
+        for name, entries in grouped.items():
+            entries.sort(key=lambda e: e.order)
+            hits[name] = tuple(e.keyword for e in entries)
+            scores[name] = float(sum(e.weight for e in entries))
+        return KeywordMatches(hits=hits, scores=scores)
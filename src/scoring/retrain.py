@@ -0,0 +1,141 @@
+"""
+Offline retraining of the ML scorer from ledger outcomes.
+
+Drafting only takes cheap online steps (`AdvancedContentScorer.update_model`).
+Full retrains run here, outside the request path: reviewed ledger items become
+labelled examples, a small regularization grid is evaluated across a process
+pool, and the winning pipeline is written with `save_artifact` (atomic
+replace). Running scorers notice the new file by mtime and reload it.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ml_scorer import build_pipeline, load_seed_training_data, save_artifact
+
+
+# Human review outcomes mapped to regression targets.
+OUTCOME_TARGETS: Dict[str, float] = {
+    "published": 1.0,
+    "approved": 0.8,
+    "rejected": 0.0,
+}
+
+DEFAULT_ALPHAS: Tuple[float, ...] = (1e-5, 1e-4, 1e-3, 1e-2)
+
+# Every Nth example is held out for choosing alpha.
+HOLDOUT_EVERY = 5
+MIN_HOLDOUT_EXAMPLES = 10
+
+
+@dataclass
+class TrainingSet:
+    texts: List[str] = field(default_factory=list)
+    targets: List[float] = field(default_factory=list)
+    # Ingest-time scores of the reviewed items, for the baseline error.
+    live_scores: List[float] = field(default_factory=list)
+    live_targets: List[float] = field(default_factory=list)
+    outcome_count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+@dataclass
+class RetrainReport:
+    model_path: str
+    examples: int
+    outcome_examples: int
+    alpha: float
+    holdout_mse: float
+    live_mse: Optional[float]
+    grid: Dict[float, float]
+    seconds: float
+
+
+def build_training_set(ledger, limit: Optional[int] = None) -> TrainingSet:
+    """
+    Seed examples plus every reviewed ledger item, labelled by its outcome.
+    """
+    seed = load_seed_training_data()
+    training = TrainingSet(texts=list(seed["texts"]), targets=[float(s) for s in seed["scores"]])
+    for text, status, score in ledger.outcome_examples(statuses=tuple(OUTCOME_TARGETS), limit=limit):
+        target = OUTCOME_TARGETS[status]
+        training.texts.append(text)
+        training.targets.append(target)
+        training.outcome_count += 1
+        if score is not None:
+            training.live_scores.append(score)
+            training.live_targets.append(target)
+    return training
+
+
+def _split(count: int) -> Tuple[List[int], List[int]]:
+    if count < MIN_HOLDOUT_EXAMPLES:
+        # Too small to hold anything out; evaluate on the training data.
+        everything = list(range(count))
+        return everything, everything
+    holdout = [i for i in range(count) if i % HOLDOUT_EVERY == 0]
+    train = [i for i in range(count) if i % HOLDOUT_EVERY != 0]
+    return train, holdout
+
+
+def _mse(predicted: Sequence[float], targets: Sequence[float]) -> float:
+    predicted_arr = np.clip(np.asarray(predicted, dtype=np.float64), 0, 1)
+    return float(np.mean((predicted_arr - np.asarray(targets, dtype=np.float64)) ** 2))
+
+
+def _evaluate_alpha(alpha: float, texts: List[str], targets: List[float]) -> Tuple[float, float]:
+    train, holdout = _split(len(texts))
+    pipeline = build_pipeline(alpha=alpha)
+    pipeline.fit([texts[i] for i in train], [targets[i] for i in train])
+    predicted = pipeline.predict([texts[i] for i in holdout])
+    return alpha, _mse(predicted, [targets[i] for i in holdout])
+
+
+def _fit(alpha: float, texts: List[str], targets: List[float]):
+    pipeline = build_pipeline(alpha=alpha)
+    pipeline.fit(texts, targets)
+    return pipeline
+
+
+def retrain(
+    ledger,
+    model_path: str,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    workers: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> RetrainReport:
+    """
+    Train on ledger outcomes in a process pool and swap the artifact in.
+    """
+    start = time.perf_counter()
+    training = build_training_set(ledger, limit=limit)
+    alphas = tuple(alphas) or DEFAULT_ALPHAS
+    workers = max(1, min(workers or os.cpu_count() or 1, len(alphas)))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_evaluate_alpha, alpha, training.texts, training.targets) for alpha in alphas]
+        grid = dict(future.result() for future in futures)
+        best_alpha = min(grid, key=grid.get)
+        pipeline = pool.submit(_fit, best_alpha, training.texts, training.targets).result()
+
+    save_artifact(pipeline, model_path)
+
+    live_mse = _mse(training.live_scores, training.live_targets) if training.live_scores else None
+    return RetrainReport(
+        model_path=model_path,
+        examples=len(training),
+        outcome_examples=training.outcome_count,
+        alpha=best_alpha,
+        holdout_mse=grid[best_alpha],
+        live_mse=live_mse,
+        grid=grid,
+        seconds=time.perf_counter() - start,
+    )
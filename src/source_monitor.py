@@ -4,6 +4,7 @@ import json
 import logging
 import hashlib
 import sys
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 import requests
@@ -15,11 +16,30 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.config import ensure_state_file, get_config_path, get_log_path, load_config
+from src.scoring.keywords import KeywordAutomaton, merge_dictionaries
 from src.sources.rss import fetch_rss_entries
 from src.state.store import StateValidationError, load_state, save_state
-from src.utils.discord_approval import send_approval_webhook
+from src.telemetry.metrics import ITEMS_FETCHED, ITEMS_FILTERED
+from src.telemetry.tracing import new_trace_id, tracer_from_config
+from src.utils.discord_approval import post_stories_for_review
 from src.content_processor import StantonTimesContentProcessor
 
+# Relevance weights for sources that don't bypass the keyword filter.
+# Extend via `content_intelligence.keyword_dictionaries.relevance` in config.
+DEFAULT_RELEVANCE_KEYWORDS: Dict[str, float] = {
+    'star citizen': 0.7,
+    'update': 0.5,
+    'patch': 0.6,
+    'patch notes': 0.7,
+    'ptu': 0.7,
+    'hotfix': 0.6,
+    'release': 0.6,
+    'development': 0.5,
+    'roadmap': 0.5,
+    'inside star citizen': 0.4,
+    'star citizen live': 0.4
+}
+
 class AdvancedSourceMonitor:
     def __init__(self, config_path: str = None):
         # Logging setup
@@ -38,6 +58,8 @@ class AdvancedSourceMonitor:
         self.state_file = str(ensure_state_file())
         self.state = self._load_state()
         self.content_processor = StantonTimesContentProcessor(self.state_file, self.config_path)
+        self._filter_automata: Dict[tuple, KeywordAutomaton] = {}
+        self.tracer = tracer_from_config("source_monitor", self.config)
 
     def load_config(self):
         """
@@ -172,33 +194,21 @@ class AdvancedSourceMonitor:
         Advanced content filtering
         """
         filtered_contents = []
-        keywords = {
-            'star citizen': 0.7,
-            'update': 0.5,
-            'patch': 0.6,
-            'patch notes': 0.7,
-            'ptu': 0.7,
-            'hotfix': 0.6,
-            'release': 0.6,
-            'development': 0.5,
-            'roadmap': 0.5,
-            'inside star citizen': 0.4,
-            'star citizen live': 0.4
-        }
 
         include_keywords = [k.lower() for k in (source_config or {}).get('include_keywords', [])]
         exclude_keywords = [k.lower() for k in (source_config or {}).get('exclude_keywords', [])]
         bypass_filter = bool((source_config or {}).get('bypass_keyword_filter'))
+        automaton = self._filter_automaton(include_keywords, exclude_keywords)
 
         for content in contents:
             title = content.get('title', '').lower()
             description = content.get('description', '').lower()
-            haystack = f"{title} {description}"
+            matches = automaton.match(f"{title} {description}")
 
-            if exclude_keywords and any(k in haystack for k in exclude_keywords):
+            if exclude_keywords and matches.any('exclude'):
                 continue
 
-            if include_keywords and not any(k in haystack for k in include_keywords):
+            if include_keywords and not matches.any('include'):
                 continue
 
             if bypass_filter:
@@ -207,11 +217,7 @@ class AdvancedSourceMonitor:
                 continue
 
             # Calculate relevance score
-            score = sum(
-                keywords.get(keyword.lower(), 0)
-                for keyword in keywords
-                if keyword.lower() in haystack
-            )
+            score = matches.score('relevance')
 
             if score > 0.5:  # Configurable relevance threshold
                 content['score'] = score
@@ -219,6 +225,26 @@ class AdvancedSourceMonitor:
 
         return filtered_contents
 
+    def _filter_automaton(self, include_keywords: List[str], exclude_keywords: List[str]) -> KeywordAutomaton:
+        """
+        One automaton per distinct include/exclude combination, built on first use.
+        """
+        key = (tuple(include_keywords), tuple(exclude_keywords))
+        automaton = self._filter_automata.get(key)
+        if automaton is None:
+            configured = (self.config.get('content_intelligence', {}) or {}).get('keyword_dictionaries') or {}
+            relevance = merge_dictionaries(
+                {'relevance': DEFAULT_RELEVANCE_KEYWORDS},
+                {'relevance': configured.get('relevance')} if isinstance(configured, dict) else None,
+            )['relevance']
+            automaton = KeywordAutomaton({
+                'relevance': relevance,
+                'include': include_keywords,
+                'exclude': exclude_keywords,
+            })
+            self._filter_automata[key] = automaton
+        return automaton
+
     def _make_story_id(self, source: str, title: str, timestamp: str, link: str) -> str:
         raw = f"{source}|{title}|{timestamp}|{link}"
         return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
@@ -236,12 +262,17 @@ class AdvancedSourceMonitor:
         for source_name, source_config in self.config.get('sources', {}).items():
             try:
                 # Fetch content
+                fetch_started = time.time()
                 contents = self.fetch_source_content(source_name, source_config)
 
                 # Filter content
                 filtered_contents = self.filter_content(contents, source_config)
+                fetched_at = time.time()
+                ITEMS_FETCHED.inc(len(contents), source=source_name)
+                ITEMS_FILTERED.inc(len(contents) - len(filtered_contents), source=source_name)
 
                 # Use content processor to decide draft vs skip
+                payloads = []
                 for content in filtered_contents:
                     story_id = self._make_story_id(
                         source_name,
@@ -267,12 +298,26 @@ class AdvancedSourceMonitor:
                         'published_at': content.get('published'),
                         'id': story_id,
                         'priority': source_config.get('priority', 'P2'),
-                        'tier': source_config.get('tier')
+                        'tier': source_config.get('tier'),
+                        'trace_id': new_trace_id(),
+                        'fetched_at': datetime.utcfromtimestamp(fetched_at).isoformat(),
                     }
+                    # The fetch is shared by every item of this source; each
+                    # item's trace starts with that window.
+                    self.tracer.record(
+                        'fetch', payload['trace_id'], fetch_started, fetched_at,
+                        source=source_name, fetched=len(contents), kept=len(filtered_contents),
+                    )
+                    payloads.append(payload)
 
-                    result = self.content_processor.process_content(payload)
+                # Score the whole pass at once, then draft item by item
+                scores = self.content_processor.calculate_content_scores(payloads)
+                for payload, score in zip(payloads, scores):
+                    if payload['id'] in seen_story_ids:
+                        continue
+                    result = self.content_processor.process_content(payload, score=score)
                     if result.get('status') == 'draft_ready':
-                        seen_story_ids.add(story_id)
+                        seen_story_ids.add(payload['id'])
                         self.logger.info(f"Draft created from {source_name}: {payload['topic']}")
 
                 # Update last checked timestamp
@@ -281,6 +326,10 @@ class AdvancedSourceMonitor:
             except Exception as e:
                 self.logger.error(f"Error processing source {source_name}: {e}")
 
+        self.content_processor.checkpoint_ml_model()
+        self.content_processor.dump_stage_timings()
+        self.content_processor.flush_metrics("source_monitor")
+
         # Reload to merge pending_stories written by content_processor
         self.state = self._load_state()
         self.state.setdefault('last_checked', {}).update(last_checked_updates)
@@ -310,16 +359,23 @@ class AdvancedSourceMonitor:
             self.logger.warning("No Discord webhook URL configured")
             return
 
-        for story in self.state['pending_stories']:
-            if story['draft_status'] == 'needs_review' and not story.get('discord_message_id'):
-                try:
-                    message_id = send_approval_webhook(story, webhook_url=webhook_url)
-                    if message_id:
-                        story['discord_message_id'] = message_id
-                        story['discord_message_ts'] = datetime.utcnow().isoformat()
-                    story['draft_status'] = 'posted_for_review'
-                except Exception as e:
-                    self.logger.error(f"Discord notification error: {e}")
+        stories = [
+            story for story in self.state['pending_stories']
+            if story['draft_status'] == 'needs_review' and not story.get('discord_message_id')
+        ]
+        if stories:
+            # Queued in the ledger outbox and sent in order at Discord's rate
+            # limit; undelivered posts stay needs_review for the next run.
+            try:
+                delivered = post_stories_for_review(stories, webhook_url=webhook_url)
+                if delivered < len(stories):
+                    failed = sum(1 for story in stories if story['draft_status'] == 'review_post_failed')
+                    self.logger.warning(
+                        f"{len(stories) - delivered - failed} review posts still queued in the webhook outbox, "
+                        f"{failed} failed"
+                    )
+            except Exception as e:
+                self.logger.error(f"Discord notification error: {e}")
 
         self._save_state()
 
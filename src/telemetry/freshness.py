@@ -0,0 +1,121 @@
+"""
+Source-to-tweet freshness from the ledger's per-hop timestamps.
+
+Every ledger item records when it was fetched, drafted, posted for review,
+approved and tweeted (`ledger.HOP_COLUMNS`) next to the source's own
+`published_at`. `freshness_report` turns the rows from
+`StantonTimesLedger.hop_timestamps` into exact p50/p95/p99 latencies per hop,
+grouped by source and priority, so it is clear whether cron cadence
+(source -> fetch), review time (review -> approval) or publish batching
+(approval -> tweet) dominates.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# (hop, from column, to column)
+HOPS: Tuple[Tuple[str, str, str], ...] = (
+    ("source_to_fetch", "published_at", "fetched_at"),
+    ("fetch_to_draft", "fetched_at", "drafted_at"),
+    ("draft_to_review", "drafted_at", "posted_for_review_at"),
+    ("review_to_approval", "posted_for_review_at", "approved_at"),
+    ("approval_to_tweet", "approved_at", "tweeted_at"),
+    ("source_to_tweet", "published_at", "tweeted_at"),
+)
+
+_COLUMNS = tuple(dict.fromkeys(column for _, start, end in HOPS for column in (start, end)))
+
+QUANTILES: Tuple[float, ...] = (0.50, 0.95, 0.99)
+
+ALL_GROUP = ("ALL", "ALL")
+
+# X/Twitter `created_at`, e.g. "Wed Oct 10 20:19:24 +0000 2018".
+_TWITTER_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Naive UTC datetime from ISO 8601, RFC 822 (RSS) or X timestamps.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    parsed: Optional[datetime] = None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        for parse in (parsedate_to_datetime, lambda text: datetime.strptime(text, _TWITTER_FORMAT)):
+            try:
+                parsed = parse(value)
+                break
+            except (TypeError, ValueError, IndexError):
+                continue
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted sequence.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def hop_latencies(row: Mapping[str, Any]) -> Dict[str, float]:
+    """
+    Seconds spent in each hop the item has completed. Negative gaps (clock
+    skew, back-dated sources) are dropped rather than clamped.
+    """
+    stamps = {column: parse_timestamp(row[column]) for column in _COLUMNS}
+    latencies = {}
+    for hop, start_column, end_column in HOPS:
+        start, end = stamps[start_column], stamps[end_column]
+        if start is None or end is None:
+            continue
+        seconds = (end - start).total_seconds()
+        if seconds >= 0:
+            latencies[hop] = seconds
+    return latencies
+
+
+def freshness_report(
+    rows: Iterable[Mapping[str, Any]],
+) -> Dict[Tuple[str, str], Dict[str, Dict[str, float]]]:
+    """
+    {(source, priority): {hop: {count, p50, p95, p99, max}}}, seconds, plus an
+    `ALL_GROUP` rollup.
+    """
+    samples: Dict[Tuple[str, str], Dict[str, List[float]]] = {}
+    for row in rows:
+        group = (row["source"] or "unknown", row["priority"] or "-")
+        for hop, seconds in hop_latencies(row).items():
+            for key in (group, ALL_GROUP):
+                samples.setdefault(key, {}).setdefault(hop, []).append(seconds)
+
+    report: Dict[Tuple[str, str], Dict[str, Dict[str, float]]] = {}
+    for group, hops in samples.items():
+        report[group] = {}
+        for hop, values in hops.items():
+            values.sort()
+            stats = {"count": len(values), "max": values[-1]}
+            for q in QUANTILES:
+                stats[f"p{round(q * 100)}"] = percentile(values, q)
+            report[group][hop] = stats
+    return report
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
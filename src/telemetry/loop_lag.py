@@ -0,0 +1,85 @@
+"""
+Event-loop lag probe for the long-running Discord bots.
+
+A coroutine sleeps `interval` seconds at a time and measures how late each
+wakeup is. Lateness means something ran on the loop without yielding (a
+synchronous file, sqlite or HTTP call) and held up gateway heartbeats and
+every other event for that long. Every wakeup is observed in
+`stanton_event_loop_lag_seconds`; wakeups late by `threshold` or more count as
+stalls (`stanton_event_loop_stalls`, `stanton_event_loop_stalled_seconds`) and
+are logged.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from src.telemetry.metrics import LOOP_LAG, LOOP_STALLED_SECONDS, LOOP_STALLS
+
+DEFAULT_INTERVAL = 0.25
+DEFAULT_THRESHOLD = 0.1
+
+
+class LoopLagMonitor:
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        threshold: float = DEFAULT_THRESHOLD,
+        logger: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.logger = logger
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples = 0
+        self.stalls = 0
+        self.stalled_seconds = 0.0
+        self.max_lag = 0.0
+
+    def observe(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        LOOP_LAG.observe(lag)
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        if lag < self.threshold:
+            return
+        self.stalls += 1
+        self.stalled_seconds += lag
+        LOOP_STALLS.inc()
+        LOOP_STALLED_SECONDS.inc(lag)
+        if self.logger is not None:
+            self.logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms")
+
+    async def run(self) -> None:
+        while True:
+            started = self.clock()
+            await asyncio.sleep(self.interval)
+            self.observe(self.clock() - started - self.interval)
+
+    def summary(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Stall counts since the last reset, for a periodic log line.
+        """
+        summary = {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "stalled_seconds": round(self.stalled_seconds, 3),
+            "max_lag_seconds": round(self.max_lag, 3),
+        }
+        if reset:
+            self.reset()
+        return summary
+
+
+def loop_lag_from_config(config: Optional[Mapping[str, Any]], logger: Any = None) -> LoopLagMonitor:
+    telemetry = (config or {}).get("telemetry") or {}
+    return LoopLagMonitor(
+        interval=float(telemetry.get("loop_lag_interval", DEFAULT_INTERVAL)),
+        threshold=float(telemetry.get("loop_lag_threshold", DEFAULT_THRESHOLD)),
+        logger=logger,
+    )
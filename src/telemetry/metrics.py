@@ -0,0 +1,390 @@
+"""
+Pipeline metrics: counters, gauges and histograms with OpenMetrics export.
+
+Instrumented code updates the process-wide `REGISTRY` (a dict update under a
+lock, no I/O). Cron commands are short-lived, so at the end of each run
+`flush(component)` folds the run's deltas into `metrics/registry/<component>.json`
+(cumulative counters and histograms, latest gauges) under a file lock and
+rewrites one OpenMetrics textfile for node_exporter's textfile collector.
+`src/app.py metrics` prints the same exposition or serves it over HTTP.
+
+Every exported sample carries a `component` label, so processes that update
+the same metric never collide.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from src.config import get_metrics_path
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_HTTP_PORT = 9464
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+
+    def _key(self, labels: Mapping[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, value: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = 0
+        while idx < len(self.buckets) and value > self.buckets[idx]:
+            idx += 1
+        with self._lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[idx] += 1
+            row[-1] += value
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, _Metric] = {}
+
+    def _get(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs: Any):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, documentation, labelnames, self._lock, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        JSON-friendly copy of every metric; `reset` clears the values so the
+        next snapshot holds only new observations.
+        """
+        with self._lock:
+            snap = {}
+            for name, metric in self.metrics.items():
+                entry: Dict[str, Any] = {
+                    "kind": metric.kind,
+                    "help": metric.documentation,
+                    "labels": list(metric.labelnames),
+                    "values": [[list(key), value if not isinstance(value, list) else list(value)]
+                               for key, value in metric.values.items()],
+                }
+                if isinstance(metric, Histogram):
+                    entry["buckets"] = list(metric.buckets)
+                snap[name] = entry
+                if reset:
+                    metric.values = {}
+            return snap
+
+
+REGISTRY = Registry()
+
+# Pipeline funnel
+ITEMS_FETCHED = REGISTRY.counter("stanton_items_fetched", "Items returned by source fetches.", ("source",))
+ITEMS_FILTERED = REGISTRY.counter(
+    "stanton_items_filtered", "Fetched items dropped by keyword/source filters.", ("source",)
+)
+ITEMS_INGESTED = REGISTRY.counter("stanton_items_ingested", "Items written to the ledger.", ("source",))
+ITEMS_DRAFTED = REGISTRY.counter("stanton_items_drafted", "Tweet drafts created.", ("source", "draft_status"))
+DRAFTS_REJECTED = REGISTRY.counter(
+    "stanton_drafts_rejected", "Drafts skipped by budget checks.", ("reason",)
+)
+# External calls
+WEBHOOK_LATENCY = REGISTRY.histogram(
+    "stanton_webhook_latency_seconds", "Discord approval webhook round trip.", ("outcome",)
+)
+PUBLISH_DELAY = REGISTRY.histogram(
+    "stanton_publish_delay_seconds",
+    "Approval (or auto-approval) to tweet, per published story.",
+    ("priority", "approval"),
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0),
+)
+ERRORS = REGISTRY.counter("stanton_errors", "Failed Discord and bird calls.", ("system", "operation"))
+# Event loop health (long-running bots); see src/telemetry/loop_lag.py
+LOOP_LAG = REGISTRY.histogram(
+    "stanton_event_loop_lag_seconds",
+    "Delay of the loop-lag probe's wakeups past their deadline.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = REGISTRY.counter("stanton_event_loop_stalls", "Probe wakeups late by at least the stall threshold.")
+LOOP_STALLED_SECONDS = REGISTRY.counter(
+    "stanton_event_loop_stalled_seconds", "Total lateness of the probe wakeups counted as stalls."
+)
+# Queue depth is read from the state file at export time; see `queue_depth_collector`.
+PENDING_STORIES = "stanton_pending_stories"
+
+
+def merge_snapshot(into: Dict[str, Dict[str, Any]], delta: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fold one run's snapshot into stored totals: counters and histograms add,
+    gauges take the newer value.
+    """
+    for name, entry in delta.items():
+        if not entry["values"]:
+            continue
+        stored = into.get(name)
+        if stored is None or stored.get("kind") != entry["kind"] or stored.get("buckets") != entry.get("buckets"):
+            stored = into[name] = {key: value for key, value in entry.items() if key != "values"}
+            stored["values"] = []
+        stored["help"] = entry["help"]
+        values = {tuple(key): value for key, value in stored["values"]}
+        for key, value in entry["values"]:
+            key = tuple(key)
+            previous = values.get(key)
+            if entry["kind"] == "gauge" or previous is None:
+                values[key] = value
+            elif entry["kind"] == "histogram":
+                values[key] = [a + b for a, b in zip(previous, value)]
+            else:
+                values[key] = previous + value
+        stored["values"] = [[list(key), value] for key, value in values.items()]
+    return into
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _format(value: float) -> str:
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def render(components: Mapping[str, Mapping[str, Mapping[str, Any]]]) -> str:
+    """
+    OpenMetrics text for {component: snapshot}.
+    """
+    families: Dict[str, List[Tuple[str, Mapping[str, Any]]]] = {}
+    for component in sorted(components):
+        for name, entry in components[component].items():
+            families.setdefault(name, []).append((component, entry))
+
+    lines: List[str] = []
+    for name in sorted(families):
+        entries = families[name]
+        kind, documentation = entries[0][1]["kind"], entries[0][1]["help"]
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {documentation}")
+        for component, entry in entries:
+            if entry["kind"] != kind:
+                continue
+            for key, value in entry["values"]:
+                pairs = [("component", component)] + list(zip(entry["labels"], key))
+                if kind == "counter":
+                    lines.append(f"{name}_total{_labels(pairs)} {_format(value)}")
+                elif kind == "gauge":
+                    lines.append(f"{name}{_labels(pairs)} {_format(value)}")
+                else:
+                    cumulative = 0
+                    bounds = list(entry["buckets"]) + [float("inf")]
+                    for bound, count in zip(bounds, value[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(pairs + [('le', _format_bound(bound))])} {int(cumulative)}")
+                    lines.append(f"{name}_count{_labels(pairs)} {int(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(pairs)} {_format(value[-1])}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def queue_depth_collector(stories: Iterable[Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshot-shaped `stanton_pending_stories{draft_status}` gauge.
+    """
+    depth: Dict[str, int] = {}
+    for story in stories:
+        status = str(story.get("draft_status") or "unknown")
+        depth[status] = depth.get(status, 0) + 1
+    return {
+        PENDING_STORIES: {
+            "kind": "gauge",
+            "help": "Stories in the state file by draft_status.",
+            "labels": ["draft_status"],
+            "values": [[[status], count] for status, count in sorted(depth.items())],
+        }
+    }
+
+
+class MetricsStore:
+    """
+    Per-component cumulative snapshots on disk plus the exported textfile.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        textfile: Union[str, Path, None] = None,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory or get_metrics_path("registry"))
+        self.textfile = Path(textfile or get_metrics_path("stanton_times.prom"))
+        self.enabled = enabled
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _component_path(self, component: str) -> Path:
+        return self.directory / f"{component}.json"
+
+    def load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        components = {}
+        if self.directory.exists():
+            for path in sorted(self.directory.glob("*.json")):
+                try:
+                    components[path.stem] = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+        return components
+
+    def exposition(self, extra: Optional[Mapping[str, Mapping[str, Any]]] = None) -> str:
+        components = self.load()
+        if extra:
+            components["pipeline"] = dict(extra)
+        return render(components)
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text)
+        os.replace(tmp, path)
+
+    def flush(
+        self,
+        component: str,
+        registry: Registry = REGISTRY,
+        extra: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> None:
+        """
+        Fold `registry`'s deltas into `component`'s totals and rewrite the textfile.
+        """
+        delta = registry.snapshot(reset=True)
+        if not self.enabled:
+            return
+        with self._locked():
+            path = self._component_path(component)
+            try:
+                stored = json.loads(path.read_text())
+            except (OSError, ValueError):
+                stored = {}
+            self._write_atomic(path, json.dumps(merge_snapshot(stored, delta), separators=(",", ":")))
+            self._write_atomic(self.textfile, self.exposition(extra))
+
+
+def store_from_config(config: Optional[Mapping[str, Any]]) -> MetricsStore:
+    telemetry = (config or {}).get("telemetry") or {}
+    return MetricsStore(
+        telemetry.get("metrics_dir"),
+        telemetry.get("metrics_textfile"),
+        enabled=bool(telemetry.get("metrics", True)),
+    )
+
+
+def serve_http(
+    render_page: Callable[[], str],
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_HTTP_PORT,
+) -> ThreadingHTTPServer:
+    """
+    A local `/metrics` endpoint; `render_page` runs per scrape. The caller
+    runs `serve_forever()`.
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_page().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return ThreadingHTTPServer((host, port), _Handler)
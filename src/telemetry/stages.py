@@ -0,0 +1,198 @@
+"""
+Per-stage timing for the content pipeline.
+
+`StageTimer.span(stage, story_id)` wraps one stage of `process_content` in a
+monotonic-clock span. Spans are folded into per-stage histograms (fixed
+buckets), counters and a short list of the slowest story ids, then appended to
+`metrics/stage_timings.jsonl` once per run by `dump`. `load_runs` and
+`summarize` read that file back for `src/app.py timings`.
+
+A disabled timer hands out one shared no-op context manager, so the
+instrumentation costs an attribute lookup and a call per stage.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Upper bounds in seconds; the last bucket catches everything slower.
+BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOWEST_KEPT = 5
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class StageStats:
+    __slots__ = ("count", "errors", "total", "max", "buckets", "slowest")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.slowest: List[Tuple[float, Optional[str]]] = []
+
+    def observe(self, seconds: float, story_id: Optional[str], error: bool = False) -> None:
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+        if seconds > self.max:
+            self.max = seconds
+        idx = 0
+        while idx < len(BUCKETS) and seconds > BUCKETS[idx]:
+            idx += 1
+        self.buckets[idx] += 1
+        if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, story_id))
+            self.slowest.sort(key=lambda item: -item[0])
+            del self.slowest[SLOWEST_KEPT:]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": self.total,
+            "max_seconds": self.max,
+            "buckets": list(self.buckets),
+            "slowest": [{"seconds": seconds, "story_id": story_id} for seconds, story_id in self.slowest],
+        }
+
+
+class StageTimer:
+    def __init__(self, enabled: bool = True, component: str = "content_processor"):
+        self.enabled = enabled
+        self.component = component
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.started_at = datetime.utcnow().isoformat()
+
+    def span(self, stage: str, story_id: Optional[str] = None):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self._span(stage, story_id)
+
+    @contextmanager
+    def _span(self, stage: str, story_id: Optional[str]) -> Iterator[None]:
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.observe(time.perf_counter() - start, story_id, error)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "component": self.component,
+            "started_at": self.started_at,
+            "finished_at": datetime.utcnow().isoformat(),
+            "pid": os.getpid(),
+            "bucket_bounds": list(BUCKETS),
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def reset(self) -> None:
+        self.stages = {}
+        self.counters = {}
+        self.started_at = datetime.utcnow().isoformat()
+
+    def dump(self, path: Union[str, Path]) -> bool:
+        """
+        Append this run's aggregates as one JSON line and reset. Returns False
+        when there was nothing to write.
+        """
+        if not self.enabled or not (self.stages or self.counters):
+            return False
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(json.dumps(self.snapshot(), separators=(",", ":")) + "\n")
+        self.reset()
+        return True
+
+
+def load_runs(path: Union[str, Path], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    runs = []
+    with path.open("r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs[-limit:] if limit else runs
+
+
+def bucket_quantile(buckets: Sequence[int], q: float) -> float:
+    """
+    Upper bound of the bucket holding the q-quantile (inf for the overflow bucket).
+    """
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for idx, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            return BUCKETS[idx] if idx < len(BUCKETS) else float("inf")
+    return float("inf")
+
+
+def summarize(runs: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge per-run stage aggregates into one row per stage.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        for stage, stats in (run.get("stages") or {}).items():
+            row = merged.setdefault(stage, {
+                "count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                "buckets": [0] * (len(BUCKETS) + 1), "slowest": [],
+            })
+            row["count"] += stats.get("count", 0)
+            row["errors"] += stats.get("errors", 0)
+            row["total_seconds"] += stats.get("total_seconds", 0.0)
+            row["max_seconds"] = max(row["max_seconds"], stats.get("max_seconds", 0.0))
+            for idx, value in enumerate(stats.get("buckets", [])[: len(row["buckets"])]):
+                row["buckets"][idx] += value
+            row["slowest"].extend(stats.get("slowest", []))
+
+    for row in merged.values():
+        row["mean_seconds"] = row["total_seconds"] / row["count"] if row["count"] else 0.0
+        row["p50_seconds"] = bucket_quantile(row["buckets"], 0.50)
+        row["p95_seconds"] = bucket_quantile(row["buckets"], 0.95)
+        row["slowest"] = sorted(row["slowest"], key=lambda item: -item["seconds"])[:SLOWEST_KEPT]
+    return merged
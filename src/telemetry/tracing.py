@@ -0,0 +1,210 @@
+"""
+Cross-process pipeline tracing with a local JSONL span exporter.
+
+A trace id is assigned when an item is ingested and travels with it on the
+story (`data/state.json`) and in the ledger. Each process along the way
+(source monitor, content processor, approval webhook, reaction monitor,
+publisher) appends spans for that trace to `logs/traces.jsonl`;
+`src/app.py trace <story_id>` reads them back into one timeline.
+
+Spans use wall-clock start times so separate processes line up, and
+`perf_counter` for durations. Each span is written as a single append of one
+line, so concurrent writers don't interleave. The file rotates by size like
+`RotatingFileHandler` (`traces.jsonl.1`, `.2`, ...).
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from src.config import get_log_path
+
+ENV_TRACE_PATH = "STANTON_TIMES_TRACE_PATH"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def default_trace_path() -> str:
+    return os.getenv(ENV_TRACE_PATH) or get_log_path("traces.jsonl")
+
+
+class SpanExporter:
+    """
+    Append-only JSONL writer with size-based rotation.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.backups = int(backups)
+
+    def _rotate(self) -> None:
+        for idx in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{idx}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{idx + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def export(self, span: Mapping[str, Any]) -> None:
+        line = (json.dumps(span, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if self.max_bytes and self.path.stat().st_size + len(line) > self.max_bytes:
+                self._rotate()
+        except FileNotFoundError:
+            pass
+        fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def files(self) -> List[Path]:
+        """
+        Oldest first: rotated backups, then the live file.
+        """
+        rotated = [self.path.with_name(f"{self.path.name}.{idx}") for idx in range(self.backups, 0, -1)]
+        return [path for path in rotated + [self.path] if path.exists()]
+
+
+class Tracer:
+    def __init__(self, component: str, exporter: Optional[SpanExporter] = None, enabled: bool = True):
+        self.component = component
+        self.exporter = exporter or SpanExporter(default_trace_path())
+        self.enabled = enabled
+
+    def record(
+        self,
+        name: str,
+        trace_id: Optional[str],
+        start: float,
+        end: Optional[float] = None,
+        story_id: Optional[str] = None,
+        status: str = "ok",
+        **attrs: Any,
+    ) -> None:
+        """
+        Export one span with explicit wall-clock bounds (`end` defaults to `start`).
+        """
+        if not self.enabled or not trace_id:
+            return
+        end = start if end is None else end
+        span = {
+            "trace_id": trace_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "story_id": story_id,
+            "component": self.component,
+            "name": name,
+            "start": start,
+            "end": end,
+            "duration_ms": round((end - start) * 1000, 3),
+            "status": status,
+            "pid": os.getpid(),
+        }
+        if attrs:
+            span["attrs"] = attrs
+        try:
+            self.exporter.export(span)
+        except OSError:
+            # Tracing must never break the pipeline.
+            pass
+
+    def event(self, name: str, trace_id: Optional[str], story_id: Optional[str] = None, **attrs: Any) -> None:
+        self.record(name, trace_id, time.time(), story_id=story_id, **attrs)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        trace_id: Optional[str],
+        story_id: Optional[str] = None,
+        **attrs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block. The yielded dict collects extra attributes to attach.
+        """
+        extra: Dict[str, Any] = {}
+        if not self.enabled or not trace_id:
+            yield extra
+            return
+        start = time.time()
+        began = time.perf_counter()
+        status = "ok"
+        try:
+            yield extra
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            end = start + (time.perf_counter() - began)
+            self.record(name, trace_id, start, end, story_id=story_id, status=status, **attrs, **extra)
+
+
+def tracer_from_config(component: str, config: Optional[Mapping[str, Any]]) -> Tracer:
+    telemetry = (config or {}).get("telemetry") or {}
+    exporter = SpanExporter(
+        telemetry.get("trace_path") or default_trace_path(),
+        max_bytes=telemetry.get("trace_max_bytes", DEFAULT_MAX_BYTES),
+        backups=telemetry.get("trace_backups", DEFAULT_BACKUPS),
+    )
+    return Tracer(component, exporter, enabled=bool(telemetry.get("tracing", True)))
+
+
+def load_spans(
+    exporter: SpanExporter,
+    trace_id: Optional[str] = None,
+    story_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Spans matching `trace_id` or `story_id`, ordered by start time.
+    """
+    spans = []
+    for path in exporter.files():
+        with path.open("r") as f:
+            for line in f:
+                if (trace_id and trace_id in line) or (story_id and story_id in line):
+                    try:
+                        span = json.loads(line)
+                    except ValueError:
+                        continue
+                    if (trace_id and span.get("trace_id") == trace_id) or (
+                        story_id and span.get("story_id") == story_id
+                    ):
+                        spans.append(span)
+    spans.sort(key=lambda span: (span.get("start", 0), span.get("end", 0)))
+    return spans
+
+
+def format_timeline(spans: List[Dict[str, Any]]) -> List[str]:
+    if not spans:
+        return []
+    origin = spans[0]["start"]
+    lines = []
+    for span in spans:
+        offset = span["start"] - origin
+        attrs = span.get("attrs") or {}
+        detail = " ".join(f"{key}={value}" for key, value in attrs.items())
+        lines.append(
+            f"+{offset:10.3f}s  {span['duration_ms']:10.1f} ms  {span['component']:<18} "
+            f"{span['name']:<22} {span.get('status', 'ok'):<5} {detail}".rstrip()
+        )
+    total = max(span["end"] for span in spans) - origin
+    lines.append(f"end-to-end: {total:.3f}s across {len({span.get('pid') for span in spans})} processes")
+    return lines
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import re
 from datetime import timedelta
-from typing import Mapping, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
 
 
 # Emoji set used by the Discord approval workflow.
@@ -12,6 +13,41 @@ APPROVAL_REACTIONS = {
     "edit": "✏️",
 }
 
+# Not a decision: asks for the deferred thread draft to be generated now.
+THREAD_REQUEST_REACTION = "🧵"
+
+# Digest posts carry up to 10 drafts (Discord's embed limit per message);
+# reacting with a draft's number approves that draft.
+DIGEST_REACTIONS = ("1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟")
+
+
+def digest_reaction_counts(reaction_counts: Mapping[str, int], position: int) -> Dict[str, int]:
+    """
+    A digest message's reactions as seen by the draft at `position`: its
+    number counts as ✅, nothing else applies to it.
+    """
+    return {APPROVAL_REACTIONS["approve"]: int(reaction_counts.get(DIGEST_REACTIONS[position], 0) or 0)}
+
+
+# A reply to a digest post decides single drafts by number: "reject 3",
+# "hold 2 5", "edit 4".
+DIGEST_COMMANDS = {"reject": "rejected", "hold": "hold", "edit": "edit_requested"}
+DIGEST_COMMAND_RE = re.compile(r"^(reject|hold|edit)\s+(\d+(?:[\s,]+\d+)*)$", re.IGNORECASE)
+
+
+def parse_digest_command(text: str) -> Optional[Tuple[str, List[int]]]:
+    """
+    (next draft_status, 0-based digest positions) for a digest reply
+    command, or None when `text` is not one.
+    """
+    match = DIGEST_COMMAND_RE.match((text or "").strip())
+    if not match:
+        return None
+    numbers = [int(number) for number in re.findall(r"\d+", match.group(2))]
+    if not all(1 <= number <= len(DIGEST_REACTIONS) for number in numbers):
+        return None
+    return DIGEST_COMMANDS[match.group(1).lower()], sorted({number - 1 for number in numbers})
+
 
 def decide_draft_status(
     *,
@@ -1,8 +1,22 @@
+import hashlib
+import json
+import logging
+import sqlite3
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from src.config import load_config
-from src.notify.discord_webhook import add_reactions, send_webhook_payload
+from src.notify.discord_webhook import DiscordWebhookError, add_reactions, send_webhook_payload
+from src.notify.webhook_outbox import DEFAULT_MAX_ATTEMPTS, WebhookOutbox
+from src.telemetry.metrics import ERRORS
+from src.telemetry.tracing import tracer_from_config
+from src.utils.approval_decision import DIGEST_REACTIONS, THREAD_REQUEST_REACTION
+
+logger = logging.getLogger(__name__)
+
+# reaction_monitor.py indexes review messages by these.
+EMBED_TITLE_PREFIX = "🗞️ Stanton Times Draft: "
+STORY_ID_FIELD = "Story ID"
 
 APPROVAL_EMOJIS = {
     "approve": "✅",
@@ -11,11 +25,20 @@ APPROVAL_EMOJIS = {
     "edit": "✏️",
 }
 
+# Discord caps a message at 10 embeds and 6000 embed characters in total.
+DIGEST_MAX_STORIES = len(DIGEST_REACTIONS)
+DIGEST_MAX_CHARS = 5500
+DIGEST_DESCRIPTION_CHARS = 600
+
 
 def _story_title(story: Dict[str, Any]) -> str:
     return story.get("topic") or story.get("title") or "Untitled"
 
 
+def _thread_pending(story: Dict[str, Any]) -> bool:
+    return story.get("thread_status") == "pending" and not story.get("thread_draft")
+
+
 def build_approval_embed(story: Dict[str, Any]) -> Dict[str, Any]:
     title = _story_title(story)
     description = (
@@ -43,13 +66,19 @@ def build_approval_embed(story: Dict[str, Any]) -> Dict[str, Any]:
     if thread_draft:
         trimmed = thread_draft if len(thread_draft) <= 1000 else thread_draft[:997] + "..."
         fields.append({"name": "Thread Draft", "value": trimmed, "inline": False})
+    elif _thread_pending(story):
+        fields.append({
+            "name": "Thread Draft",
+            "value": f"⏳ Generated on approval. React {THREAD_REQUEST_REACTION} to generate it now.",
+            "inline": False,
+        })
 
     story_id = story.get("story_id")
     if story_id:
-        fields.append({"name": "Story ID", "value": story_id, "inline": True})
+        fields.append({"name": STORY_ID_FIELD, "value": story_id, "inline": True})
 
     return {
-        "title": f"🗞️ Stanton Times Draft: {title}",
+        "title": f"{EMBED_TITLE_PREFIX}{title}",
         "description": description,
         "color": 5793266,
         "fields": fields,
@@ -60,29 +89,220 @@ def build_approval_embed(story: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def send_approval_webhook(story: Dict[str, Any], webhook_url: Optional[str] = None, mention: Optional[str] = None) -> Optional[str]:
-    config = load_config()
-    webhook_url = webhook_url or config.get("discord", {}).get("webhook_url", "")
+def build_approval_payload(story: Dict[str, Any], mention: str = "") -> Dict[str, Any]:
+    return {
+        "content": mention,
+        "embeds": [build_approval_embed(story)],
+    }
 
-    if not webhook_url:
-        raise ValueError("Discord webhook URL not configured.")
 
-    mention_text = mention or config.get("discord", {}).get("approval_mention", "")
-    payload = {
-        "content": mention_text,
-        "embeds": [build_approval_embed(story)],
+def review_dedupe_key(story: Dict[str, Any]) -> str:
+    """
+    Outbox key for a story's review post: a re-queued post of the same draft
+    is ignored, an edited draft is a new post.
+    """
+    draft = story.get("tweet_draft") or story.get("simulated_draft") or story.get("description") or ""
+    digest = hashlib.sha1(draft.encode("utf-8")).hexdigest()[:16]
+    return f"review:{story.get('story_id') or _story_title(story)}:{digest}"
+
+
+def build_digest_embed(story: Dict[str, Any], position: int) -> Dict[str, Any]:
+    """
+    A story's embed inside a digest post: shorter, numbered, and without the
+    per-message reaction footer.
+    """
+    embed = build_approval_embed(story)
+    number = DIGEST_REACTIONS[position]
+    if len(embed["description"]) > DIGEST_DESCRIPTION_CHARS:
+        embed["description"] = embed["description"][:DIGEST_DESCRIPTION_CHARS - 3] + "..."
+    for field in embed["fields"]:
+        if field["name"] == "Thread Draft" and len(field["value"]) > 300:
+            field["value"] = field["value"][:297] + "..."
+    embed["author"] = {"name": f"{number} Draft {position + 1}"}
+    embed["footer"] = {"text": f"React {number} to approve; reply reject/hold/edit {position + 1}"}
+    return embed
+
+
+def _embed_chars(embed: Dict[str, Any]) -> int:
+    return (
+        len(embed.get("title", "")) + len(embed.get("description", ""))
+        + len(embed.get("author", {}).get("name", "")) + len(embed.get("footer", {}).get("text", ""))
+        + sum(len(field["name"]) + len(field["value"]) for field in embed.get("fields", []))
+    )
+
+
+def digest_batches(stories: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Pack stories, in order, into digests within Discord's per-message limits.
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    batch: List[Dict[str, Any]] = []
+    chars = 0
+    for story in stories:
+        size = _embed_chars(build_digest_embed(story, len(batch) % DIGEST_MAX_STORIES))
+        if batch and (len(batch) == DIGEST_MAX_STORIES or chars + size > DIGEST_MAX_CHARS):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(story)
+        chars += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_digest_payload(stories: Sequence[Dict[str, Any]], mention: str = "") -> Dict[str, Any]:
+    numbers = f"{DIGEST_REACTIONS[0]}-{DIGEST_REACTIONS[len(stories) - 1]}"
+    intro = (
+        f"**{len(stories)} drafts for review.** React {numbers} to approve a draft, or reply to this post with "
+        f"`reject 2`, `hold 2` or `edit 2` (several numbers allowed); unapproved drafts expire."
+    )
+    return {
+        "content": f"{mention}\n{intro}" if mention else intro,
+        "embeds": [build_digest_embed(story, position) for position, story in enumerate(stories)],
     }
 
-    message_id = send_webhook_payload(webhook_url, payload)
-    if message_id:
-        discord_cfg = config.get("discord", {})
-        channel_id = str(discord_cfg.get("channel_id") or discord_cfg.get("verification_channel_id") or "")
-        bot_token = str(discord_cfg.get("bot_token") or "")
+
+def _digest_enabled(config: Dict[str, Any], story: Dict[str, Any]) -> bool:
+    return story.get("approval_tier") == "batch_digest" and bool(config.get("discord", {}).get("digest_reviews", True))
+
+
+def approval_outbox(config: Dict[str, Any], ledger: Any) -> WebhookOutbox:
+    discord_cfg = config.get("discord", {})
+    channel_id = str(discord_cfg.get("channel_id") or discord_cfg.get("verification_channel_id") or "")
+    bot_token = str(discord_cfg.get("bot_token") or "")
+
+    def _delivered(row: Any, message_id: Optional[str]) -> None:
+        if not message_id:
+            return
         add_reactions(
             message_id=str(message_id),
             channel_id=channel_id,
             bot_token=bot_token,
-            emojis=APPROVAL_EMOJIS.values(),
+            emojis=json.loads(row["reactions"] or "[]"),
         )
+        item_ids = [member["item_id"] for member in ledger.webhook_members(row["id"])] or [row["item_id"]]
+        try:
+            for item_id in item_ids:
+                if item_id:
+                    ledger.mark_posted_for_review(int(item_id))
+        except sqlite3.Error:
+            # Freshness bookkeeping must not block the review post.
+            pass
+
+    return WebhookOutbox(
+        ledger,
+        send=lambda webhook_url, payload: send_webhook_payload(webhook_url, payload),
+        on_delivered=_delivered,
+        tracer=tracer_from_config("discord_approval", config),
+        max_attempts=int(discord_cfg.get("webhook_max_attempts", DEFAULT_MAX_ATTEMPTS)),
+    )
 
-    return message_id
+
+def _deliver_for_review(
+    stories: Sequence[Dict[str, Any]],
+    webhook_url: Optional[str] = None,
+    mention: Optional[str] = None,
+) -> List[Any]:
+    """
+    Queue each story's review post in the ledger outbox, drain it, and return
+    each story's outbox row (status `sent`, `pending` or `failed`). With
+    `discord.digest_reviews` (default on), batch_digest-tier stories are
+    packed into digest posts; their rows carry the story's `position`.
+    """
+    config = load_config()
+    webhook_url = webhook_url or config.get("discord", {}).get("webhook_url", "")
+
+    if not webhook_url:
+        raise ValueError("Discord webhook URL not configured.")
+
+    mention_text = mention or config.get("discord", {}).get("approval_mention", "")
+    from ledger import StantonTimesLedger
+
+    ledger = StantonTimesLedger()
+    try:
+        outbox = approval_outbox(config, ledger)
+        keys = [review_dedupe_key(story) for story in stories]
+        # Stories already queued (alone or in a digest) keep their post.
+        fresh = [(key, story) for key, story in zip(keys, stories) if outbox.delivery(key) is None]
+        digest = [story for key, story in fresh if _digest_enabled(config, story)]
+        for batch in digest_batches(digest):
+            if len(batch) == 1:
+                continue  # a lone story gets the full single-post controls
+            members = [
+                (review_dedupe_key(story), story.get("story_id"),
+                 int(story["ledger_item_id"]) if story.get("ledger_item_id") else None)
+                for story in batch
+            ]
+            member_keys = "|".join(key for key, _, _ in members)
+            digest_key = "digest:" + hashlib.sha1(member_keys.encode("utf-8")).hexdigest()[:16]
+            outbox.enqueue(
+                digest_key,
+                webhook_url,
+                build_digest_payload(batch, mention_text),
+                reactions=DIGEST_REACTIONS[:len(batch)],
+                members=members,
+            )
+        for key, story in fresh:
+            if outbox.delivery(key) is not None:
+                continue
+            item_id = story.get("ledger_item_id")
+            outbox.enqueue(
+                key,
+                webhook_url,
+                build_approval_payload(story, mention_text),
+                story_id=story.get("story_id"),
+                item_id=int(item_id) if item_id else None,
+                trace_id=story.get("trace_id"),
+                reactions=list(APPROVAL_EMOJIS.values()) + ([THREAD_REQUEST_REACTION] if _thread_pending(story) else []),
+            )
+        outbox.drain()
+        return [outbox.delivery(key) for key in keys]
+    finally:
+        ledger.conn.close()
+
+
+def post_stories_for_review(
+    stories: Sequence[Dict[str, Any]],
+    webhook_url: Optional[str] = None,
+    mention: Optional[str] = None,
+) -> int:
+    """
+    Post review embeds for `stories` through the outbox and mark the delivered
+    ones `posted_for_review`. Stories whose post is still queued keep their
+    status; the next run delivers them without posting twice. Stories whose
+    post the outbox gave up on become `review_post_failed` (with
+    `review_error`), since their post is never sent again on its own.
+    """
+    delivered = 0
+    for story, row in zip(stories, _deliver_for_review(stories, webhook_url, mention)):
+        if row is not None and row["status"] == "failed":
+            logger.error("Review post for %s failed: %s", story.get("story_id") or _story_title(story), row["last_error"])
+            ERRORS.inc(system="discord", operation="review_post")
+            story["draft_status"] = "review_post_failed"
+            story["review_error"] = row["last_error"]
+            continue
+        if row is None or row["status"] != "sent":
+            continue
+        if row["message_id"]:
+            story["discord_message_id"] = row["message_id"]
+            story["discord_message_ts"] = datetime.utcnow().isoformat()
+        if row["position"] is not None:
+            story["digest_position"] = row["position"]
+        else:
+            story.pop("digest_position", None)
+        story["draft_status"] = "posted_for_review"
+        delivered += 1
+    return delivered
+
+
+def send_approval_webhook(story: Dict[str, Any], webhook_url: Optional[str] = None, mention: Optional[str] = None) -> Optional[str]:
+    """
+    Post one story for review. Returns the message id, or None while the post
+    is still queued; raises `DiscordWebhookError` once the outbox gave up on it.
+    """
+    row = _deliver_for_review([story], webhook_url, mention)[0]
+    if row is None:
+        return None
+    if row["status"] == "failed":
+        raise DiscordWebhookError(f"Approval post failed: {row['last_error']}")
+    return row["message_id"] if row["status"] == "sent" else None
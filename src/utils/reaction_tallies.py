@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Optional, Set, Union
+
+MessageId = Union[int, str]
+UserId = Union[int, str]
+
+
+class ReactionTallies:
+    """
+    Per-message reaction tallies kept in memory by the reaction monitor.
+
+    Each emoji holds the set of user ids that reacted with it (the bot's own
+    seeded reactions excluded); counts are derived from those sets. A message
+    is seeded from a fetch (`reconcile`), then moved by gateway events
+    (`apply`), so a click costs no REST call. Applying (emoji, user_id, add or
+    remove) is idempotent: an event the seed snapshot already includes, or a
+    repeated add, leaves the count unchanged. The periodic reconciliation
+    calls `reconcile` again, which replaces the sets and corrects any drift
+    (missed events while disconnected, bulk removals).
+    """
+
+    def __init__(self, emojis: Iterable[str]):
+        self.emojis = tuple(emojis)
+        self._users: Dict[str, Dict[str, Set[str]]] = {}
+
+    def tracks(self, message_id: MessageId) -> bool:
+        return str(message_id) in self._users
+
+    def counts(self, message_id: MessageId) -> Dict[str, int]:
+        stored = self._users.get(str(message_id)) or {}
+        return {emoji: len(stored.get(emoji, ())) for emoji in self.emojis}
+
+    def apply(self, message_id: MessageId, emoji: str, user_id: UserId, added: bool) -> bool:
+        """
+        Apply one gateway event. Returns False when the message is not
+        tracked yet (the caller seeds it with a fetch first) or the emoji is
+        not part of the approval set.
+        """
+        users = self._users.get(str(message_id))
+        if users is None or emoji not in self.emojis:
+            return False
+        if added:
+            users[emoji].add(str(user_id))
+        else:
+            users[emoji].discard(str(user_id))
+        return True
+
+    def reconcile(
+        self, message_id: MessageId, users: Mapping[str, Iterable[UserId]]
+    ) -> Optional[Dict[str, int]]:
+        """
+        Replace a message's tallies with fetched reactors. Returns the
+        per-emoji count drift (fetched minus tallied) when an already tracked
+        message was off, else None.
+        """
+        key = str(message_id)
+        previous = self.counts(key) if key in self._users else None
+        self._users[key] = {
+            emoji: {str(user_id) for user_id in users.get(emoji, ())} for emoji in self.emojis
+        }
+        if previous is None:
+            return None
+        fresh = self.counts(key)
+        drift = {emoji: fresh[emoji] - previous[emoji] for emoji in self.emojis}
+        return {emoji: delta for emoji, delta in drift.items() if delta} or None
+
+    def forget(self, message_id: MessageId) -> None:
+        self._users.pop(str(message_id), None)
+
+    def retain(self, message_ids: Iterable[MessageId]) -> None:
+        """
+        Drop tallies for messages no longer under review.
+        """
+        keep = {str(message_id) for message_id in message_ids}
+        for key in [key for key in self._users if key not in keep]:
+            del self._users[key]
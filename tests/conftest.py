@@ -0,0 +1,13 @@
+import pytest
+
+from src.config import ENV_DB_PATH, ENV_STATE_PATH
+from src.telemetry.tracing import ENV_TRACE_PATH
+
+
+@pytest.fixture(autouse=True)
+def _runtime_paths(tmp_path, monkeypatch):
+    # Processors built with the default paths get a scratch ledger, state
+    # file and trace file instead of the ones in data/ and logs/.
+    monkeypatch.setenv(ENV_DB_PATH, str(tmp_path / "stanton_times_ledger.sqlite"))
+    monkeypatch.setenv(ENV_STATE_PATH, str(tmp_path / "state.json"))
+    monkeypatch.setenv(ENV_TRACE_PATH, str(tmp_path / "traces.jsonl"))
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from src.utils.approval_decision import APPROVAL_REACTIONS, decide_draft_status
+from src.utils.approval_decision import APPROVAL_REACTIONS, decide_draft_status, parse_digest_command
 
 
 def test_decide_draft_status_auto_reject_on_age():
@@ -70,3 +70,10 @@ def test_decide_draft_status_none_when_no_clear_signal():
     )
     assert status is None
 
+
+def test_parse_digest_command():
+    assert parse_digest_command("reject 3") == ("rejected", [2])
+    assert parse_digest_command(" Hold 5, 2 2 ") == ("hold", [1, 4])
+    assert parse_digest_command("edit 10") == ("edit_requested", [9])
+    for text in ("reject", "reject 11", "reject 0", "approve 1", "EDIT: new text", "please reject 3"):
+        assert parse_digest_command(text) is None
@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.content_processor import StantonTimesContentProcessor
+from src.scoring.batch import COMPONENTS, batch_weighted_scores, component_matrix, weight_vector
+from src.scoring.features import HIGH_INTEREST_KEYWORDS, TECHNICAL_KEYWORDS
+from src.scoring.relevance import weighted_score
+
+
+def test_batch_weighted_scores_matches_weighted_score():
+    matrix = np.array([[0.9, 0.4, 0.8, 0.25], [0.5, 1.0, 0.1, 0.0]])
+    weights = {"developer_credibility": 0.4, "community_engagement": 0.3, "information_novelty": 0.2,
+               "technical_depth": 0.1, "unused": 5.0}
+    scores = batch_weighted_scores(matrix, weights)
+    for row, score in zip(matrix, scores):
+        assert score == pytest.approx(weighted_score(dict(zip(COMPONENTS, row)), weights))
+    assert weight_vector(weights).shape == (len(COMPONENTS),)
+
+
+def test_component_matrix_applies_caps_boost_and_novelty():
+    matrix = component_matrix(
+        credibility=[0.95, 0.5],
+        interest_hits=[6, 1],
+        official=[True, False],
+        seen=[False, True],
+        technical_hits=[1, 9],
+    )
+    assert matrix.tolist() == [[0.95, 1.0, 0.8, 0.25], [0.5, 0.2, 0.1, 1.0]]
+    assert component_matrix(credibility=[], interest_hits=[], official=[], seen=[], technical_hits=[]).shape == (0, 4)
+
+
+def test_processor_batch_matches_scalar_path():
+    processor = StantonTimesContentProcessor()
+    processor.state = dict(processor.state)
+    processor.state["seen_tweet_ids"] = {"RobertsSpaceInd": ["seen-1"]}
+
+    rng = random.Random(3)
+    sources = ["RSI Comm-Link", "RobertsSpaceInd", "Olli43", "Unknown", "starcitizenbot"]
+    vocabulary = list(HIGH_INTEREST_KEYWORDS + TECHNICAL_KEYWORDS) + ["lorem", "ipsum", "citizen"]
+    contents = []
+    for idx in range(200):
+        contents.append({
+            "source": rng.choice(sources),
+            "topic": " ".join(rng.sample(vocabulary, rng.randint(0, 4))),
+            "description": " ".join(rng.sample(vocabulary, rng.randint(0, 8))),
+            "id": "seen-1" if idx % 17 == 0 else f"id-{idx}",
+            "priority": rng.choice(["P0", "P1", "P2", None]),
+            "tier": rng.choice(["official", "creator", None]),
+        })
+
+    batch = processor.traditional_scores_batch(contents)
+    scalar = [processor._traditional_score(content) for content in contents]
+    assert batch == pytest.approx(scalar, abs=1e-12)
+
+    processor.config = {"content_intelligence": {"mode": "local"}}
+    assert processor.calculate_content_scores(contents[:20]) == pytest.approx(
+        [processor.calculate_content_score(content) for content in contents[:20]], abs=1e-12
+    )
@@ -1,4 +1,11 @@
-from src.utils.discord_approval import APPROVAL_EMOJIS, build_approval_embed, send_approval_webhook
+from src.utils.approval_decision import DIGEST_REACTIONS
+from src.utils.discord_approval import (
+    APPROVAL_EMOJIS,
+    _embed_chars,
+    build_approval_embed,
+    post_stories_for_review,
+    send_approval_webhook,
+)
 
 
 def test_build_approval_embed_includes_story_id_and_link():
@@ -17,7 +24,8 @@ def test_build_approval_embed_includes_story_id_and_link():
     assert "Story ID" in field_names
 
 
-def test_send_approval_webhook_routes_through_notify(monkeypatch):
+def test_send_approval_webhook_routes_through_notify(tmp_path, monkeypatch):
+    monkeypatch.setenv("STANTON_TIMES_DB_PATH", str(tmp_path / "ledger.sqlite"))
     calls = {"send": 0, "react": 0}
 
     def fake_load_config():
@@ -54,3 +62,94 @@ def test_send_approval_webhook_routes_through_notify(monkeypatch):
     assert calls["send"] == 1
     assert calls["react"] == 1
 
+    # Already delivered: posting the same draft again does not re-send it.
+    assert send_approval_webhook(story) == "999"
+    assert calls["send"] == 1
+
+
+
+def test_pending_thread_shows_placeholder_and_thread_reaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("STANTON_TIMES_DB_PATH", str(tmp_path / "ledger.sqlite"))
+    story = {"topic": "SCL", "tweet_draft": "Hello", "thread_status": "pending"}
+    fields = {f["name"]: f["value"] for f in build_approval_embed(story)["fields"]}
+    assert fields["Thread Draft"].startswith("⏳")
+
+    ready = dict(story, thread_status="ready", thread_draft="1/3 Thread")
+    fields = {f["name"]: f["value"] for f in build_approval_embed(ready)["fields"]}
+    assert fields["Thread Draft"] == "1/3 Thread"
+
+    reacted = []
+    monkeypatch.setattr("src.utils.discord_approval.load_config", lambda: {"discord": {"webhook_url": "x"}})
+    monkeypatch.setattr("src.utils.discord_approval.send_webhook_payload", lambda url, payload: "1")
+    monkeypatch.setattr(
+        "src.utils.discord_approval.add_reactions",
+        lambda *, message_id, channel_id, bot_token, emojis: reacted.extend(emojis),
+    )
+    send_approval_webhook(story)
+    assert reacted[-1] == "🧵"
+
+
+def test_batch_digest_stories_are_packed_ten_to_a_post(tmp_path, monkeypatch):
+    monkeypatch.setenv("STANTON_TIMES_DB_PATH", str(tmp_path / "ledger.sqlite"))
+    monkeypatch.setattr("src.utils.discord_approval.load_config", lambda: {"discord": {"webhook_url": "x"}})
+    posts, reactions = [], []
+
+    def fake_send(url, payload):
+        posts.append(payload)
+        return str(100 + len(posts))
+
+    monkeypatch.setattr("src.utils.discord_approval.send_webhook_payload", fake_send)
+    monkeypatch.setattr(
+        "src.utils.discord_approval.add_reactions",
+        lambda *, message_id, channel_id, bot_token, emojis: reactions.append((message_id, list(emojis))),
+    )
+
+    def _story(idx, tier="batch_digest"):
+        return {"story_id": f"s{idx}", "topic": f"Story {idx}", "tweet_draft": f"Draft {idx}",
+                "draft_status": "needs_review", "approval_tier": tier}
+
+    stories = [_story(idx) for idx in range(23)] + [_story(99, tier="")]
+    assert post_stories_for_review(stories) == 24
+
+    # 10 + 10 + 3 digests, then the non-digest story on its own.
+    assert [len(post["embeds"]) for post in posts] == [10, 10, 3, 1]
+    assert all(sum(_embed_chars(embed) for embed in post["embeds"]) <= 6000 for post in posts)
+    assert reactions[0] == ("101", list(DIGEST_REACTIONS))
+    assert reactions[2] == ("103", list(DIGEST_REACTIONS[:3]))
+    assert reactions[3][1] == list(APPROVAL_EMOJIS.values())
+    assert [(s["discord_message_id"], s.get("digest_position")) for s in stories[9:11]] == [("101", 9), ("102", 0)]
+    assert stories[-1]["discord_message_id"] == "104" and "digest_position" not in stories[-1]
+    assert all(story["draft_status"] == "posted_for_review" for story in stories)
+
+    # Queued stories keep their digest; only new ones are packed into a new post.
+    fresh = [_story(idx) for idx in range(23, 25)]
+    post_stories_for_review([_story(idx) for idx in range(23)] + fresh)
+    assert len(posts) == 5 and len(posts[-1]["embeds"]) == 2
+    assert [story["digest_position"] for story in fresh] == [0, 1]
+
+    # A lone digest-tier story gets the full single-post controls.
+    lone = _story(50)
+    post_stories_for_review([lone])
+    assert len(posts[-1]["embeds"]) == 1 and "digest_position" not in lone
+
+
+def test_review_posts_the_outbox_gave_up_on_mark_the_story(tmp_path, monkeypatch):
+    from src.notify.discord_webhook import DiscordWebhookError
+    from src.telemetry.metrics import ERRORS
+
+    monkeypatch.setenv("STANTON_TIMES_DB_PATH", str(tmp_path / "ledger.sqlite"))
+    monkeypatch.setattr("src.utils.discord_approval.load_config", lambda: {"discord": {"webhook_url": "x"}})
+    sends = []
+
+    def fake_send(url, payload):
+        sends.append(payload)
+        raise DiscordWebhookError("Failed to send webhook: 400 Invalid Form Body", 400)
+
+    monkeypatch.setattr("src.utils.discord_approval.send_webhook_payload", fake_send)
+    before = ERRORS.values.get(("discord", "review_post"), 0)
+    story = {"story_id": "s1", "topic": "Test", "tweet_draft": "Hello", "draft_status": "needs_review"}
+    assert post_stories_for_review([story]) == 0
+    assert story["draft_status"] == "review_post_failed"
+    assert "400" in story["review_error"]
+    assert ERRORS.values[("discord", "review_post")] == before + 1
+    assert len(sends) == 1
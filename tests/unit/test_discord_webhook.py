@@ -1,15 +1,27 @@
 import json
+import time
 
 import pytest
+import requests
 
-from src.notify.discord_webhook import DiscordWebhookError, send_webhook_payload, with_wait_param
+from src.notify.discord_webhook import (
+    DiscordWebhookError,
+    RateLimiter,
+    ReactionSeeder,
+    add_reactions,
+    put_reaction,
+    send_webhook_payload,
+    with_wait_param,
+)
+from src.telemetry.metrics import ERRORS
 
 
 class _Resp:
-    def __init__(self, status_code, payload=None, text=""):
+    def __init__(self, status_code, payload=None, text="", headers=None):
         self.status_code = status_code
         self._payload = payload
         self.text = text
+        self.headers = headers or {}
 
     def json(self):
         if self._payload is None:
@@ -25,9 +37,10 @@ def test_with_wait_param_sets_wait_true():
 def test_send_webhook_payload_returns_message_id(monkeypatch):
     called = {}
 
-    def fake_post(url, json=None):
+    def fake_post(url, json=None, timeout=None):
         called["url"] = url
         called["json"] = json
+        called["timeout"] = timeout
         return _Resp(200, payload={"id": "123"})
 
     monkeypatch.setattr("src.notify.discord_webhook.requests.post", fake_post)
@@ -36,18 +49,79 @@ def test_send_webhook_payload_returns_message_id(monkeypatch):
     assert msg_id == "123"
     assert "wait=true" in called["url"]
     assert called["json"]["content"] == "hi"
+    assert called["timeout"] > 0
 
 
 def test_send_webhook_payload_204_returns_none(monkeypatch):
-    monkeypatch.setattr("src.notify.discord_webhook.requests.post", lambda url, json=None: _Resp(204))
+    monkeypatch.setattr("src.notify.discord_webhook.requests.post", lambda url, json=None, timeout=None: _Resp(204))
     assert send_webhook_payload("https://discord.com/api/webhooks/x/y", {"content": "hi"}) is None
 
 
 def test_send_webhook_payload_error(monkeypatch):
     monkeypatch.setattr(
         "src.notify.discord_webhook.requests.post",
-        lambda url, json=None: _Resp(500, text="boom"),
+        lambda url, json=None, timeout=None: _Resp(500, text="boom"),
     )
     with pytest.raises(DiscordWebhookError):
         send_webhook_payload("https://discord.com/api/webhooks/x/y", {"content": "hi"})
 
+
+
+class _Session:
+    def __init__(self, latency=0.0, responses=()):
+        self.latency = latency
+        self.responses = list(responses)
+        self.puts = []
+
+    def put(self, url, headers=None, timeout=None):
+        assert timeout
+        time.sleep(self.latency)
+        self.puts.append(url.rsplit("/reactions/", 1)[1])
+        response = self.responses.pop(0) if self.responses else _Resp(204)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_add_reactions_returns_before_the_puts_and_keeps_emoji_order(monkeypatch):
+    session = _Session(latency=0.05)
+    seeder = ReactionSeeder(put=lambda **job: put_reaction(session=session, limiter=RateLimiter(), **job))
+    monkeypatch.setattr("src.notify.discord_webhook.REACTION_SEEDER", seeder)
+
+    started = time.perf_counter()
+    add_reactions(message_id="9", channel_id="1", bot_token="t", emojis=["✅", "❌", "🤔", "✏️"])
+    assert time.perf_counter() - started < 0.05
+    assert seeder.flush(timeout=5)
+    assert [requests.utils.unquote(put) for put in session.puts] == ["✅/@me", "❌/@me", "🤔/@me", "✏️/@me"]
+
+
+def test_put_reaction_waits_out_the_channel_bucket():
+    clock = {"now": 0.0, "slept": []}
+
+    def _sleep(seconds):
+        clock["slept"].append(seconds)
+        clock["now"] += seconds
+
+    limiter = RateLimiter(clock=lambda: clock["now"], sleep=_sleep)
+    exhausted = {"X-RateLimit-Bucket": "r", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.25"}
+    session = _Session(responses=[
+        _Resp(204, headers=exhausted),
+        _Resp(429, payload={"retry_after": 0.5}),
+        _Resp(204),
+    ])
+    kwargs = dict(message_id="9", channel_id="1", bot_token="t", session=session, limiter=limiter)
+    assert put_reaction(emoji="✅", **kwargs)
+    assert put_reaction(emoji="❌", **kwargs)
+    assert clock["slept"] == [0.25, 0.5]
+    assert len(session.puts) == 3
+
+
+def test_failed_reactions_are_counted_and_do_not_stop_the_seeder(monkeypatch):
+    session = _Session(responses=[requests.Timeout("read timed out"), _Resp(403)])
+    seeder = ReactionSeeder(put=lambda **job: put_reaction(session=session, limiter=RateLimiter(), **job))
+    before = ERRORS.values.get(("discord", "reaction"), 0)
+
+    seeder.submit(message_id="9", channel_id="1", bot_token="t", emojis=["✅", "❌", "🤔"])
+    assert seeder.flush(timeout=5)
+    assert len(session.puts) == 3
+    assert ERRORS.values.get(("discord", "reaction"), 0) - before == 2
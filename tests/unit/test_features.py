@@ -0,0 +1,53 @@
+from src.scoring.features import (
+    FeatureExtractor,
+    extract_factoids,
+    extract_ship_name,
+    first_sentence,
+    infer_content_type,
+)
+
+
+def test_extract_builds_draft_and_scoring_fields():
+    content = {
+        "topic": "Behind the Ships: Drake Golem",
+        "description": "The Golem: 32 SCU cargo; 2 crew; S3 weapons\n------------------------------------------\nfooter",
+    }
+    features = FeatureExtractor().extract(content)
+    assert features.title == "Behind the Ships: Drake Golem"
+    assert "footer" not in features.description
+    assert "footer" in features.haystack
+    assert features.content_type == "ship_feature"
+    assert features.ship_name == "Drake Golem"
+    assert features.factoids == ("32 SCU cargo", "2 crew", "S3 weapons")
+    assert features.hashtags == ("#StarCitizen", "#SpaceShip")
+    assert "behind the ships" in features.keyword_hits["community_interest"]
+    assert features.hit_count("technical_depth") == 0
+
+
+def test_extract_is_memoized_per_text():
+    extractor = FeatureExtractor()
+    first = extractor.extract({"topic": "Patch notes", "description": "Alpha 4.6"})
+    again = extractor.extract({"topic": "Patch notes", "description": "Alpha 4.6", "source": "other"})
+    assert first is again
+    assert extractor.extract({"topic": "Patch notes", "description": "Alpha 4.7"}) is not first
+
+
+def test_extract_cache_is_bounded():
+    extractor = FeatureExtractor(max_entries=2)
+    for idx in range(5):
+        extractor.extract({"topic": f"t{idx}"})
+    assert len(extractor._cache) == 2
+
+
+def test_infer_content_type_order():
+    assert infer_content_type("star citizen live | patch notes") == "patch"
+    assert infer_content_type("inside star citizen | pyro") == "inside_sc"
+    assert infer_content_type("new drake ship") == "ship_reveal"
+    assert infer_content_type("invictus launch week") == "event"
+    assert infer_content_type("hello") == "general"
+
+
+def test_text_helpers():
+    assert first_sentence("Short. Server meshing arrives.") == "Server meshing arrives."
+    assert extract_ship_name("Anvil Paladin Vehicle Highlights") == "Anvil Paladin"
+    assert extract_factoids("4 turrets, 2 S5 guns, and more") == ["4 turrets", "2 S5 guns"]
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from src.telemetry.freshness import ALL_GROUP, freshness_report, hop_latencies, parse_timestamp, percentile
+
+
+def _row(source="rss", priority="P1", **stamps):
+    row = {"source": source, "priority": priority, "published_at": None}
+    for column in ("fetched_at", "drafted_at", "posted_for_review_at", "approved_at", "tweeted_at"):
+        row[column] = stamps.get(column)
+    row.update(stamps)
+    return row
+
+
+def test_parse_timestamp_handles_source_formats():
+    expected = datetime(2026, 10, 5, 10, 0, 0)
+    assert parse_timestamp("2026-10-05T10:00:00") == expected
+    assert parse_timestamp("2026-10-05T12:00:00+02:00") == expected
+    assert parse_timestamp("Mon, 05 Oct 2026 10:00:00 GMT") == expected
+    assert parse_timestamp("Mon Oct 05 10:00:00 +0000 2026") == expected
+    assert parse_timestamp("not a date") is None
+    assert parse_timestamp(None) is None
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_hop_latencies_skip_missing_and_negative_hops():
+    row = _row(
+        published_at="2026-10-05T10:05:00",  # back-dated after fetch: dropped
+        fetched_at="2026-10-05T10:00:00",
+        drafted_at="2026-10-05T10:00:30",
+        approved_at="2026-10-05T10:00:30",
+        tweeted_at="2026-10-05T11:00:30",
+    )
+    assert hop_latencies(row) == {
+        "fetch_to_draft": 30.0,
+        "approval_to_tweet": 3600.0,
+        "source_to_tweet": 3330.0,
+    }
+
+
+def test_freshness_report_groups_by_source_and_priority():
+    rows = [
+        _row(published_at="2026-10-05T10:00:00", fetched_at=f"2026-10-05T10:{minute:02d}:00")
+        for minute in range(1, 11)
+    ] + [_row(source="x", priority="P0", published_at="2026-10-05T10:00:00", fetched_at="2026-10-05T10:00:10")]
+
+    report = freshness_report(rows)
+    rss = report[("rss", "P1")]["source_to_fetch"]
+    assert rss["count"] == 10 and rss["p50"] == 300.0 and rss["p99"] == 600.0 and rss["max"] == 600.0
+    assert report[("x", "P0")]["source_to_fetch"]["p95"] == 10.0
+    assert report[ALL_GROUP]["source_to_fetch"]["count"] == 11
@@ -0,0 +1,46 @@
+import random
+
+from src.scoring.keywords import KeywordAutomaton, merge_dictionaries, normalize_dictionary
+
+
+def test_match_reports_hits_and_weighted_scores_per_dictionary():
+    automaton = KeywordAutomaton({
+        "interest": {"patch": 0.6, "patch notes": 0.7, "ship": 1.0},
+        "technical": ["server meshing", "latency"],
+    })
+    matches = automaton.match("alpha 4.6 patch notes: server meshing and ships")
+    assert matches.hits["interest"] == ("patch", "patch notes", "ship")
+    assert matches.score("interest") == 0.6 + 0.7 + 1.0
+    assert matches.hits["technical"] == ("server meshing",)
+    assert matches.hit_count("technical") == 1
+    assert not matches.any("missing")
+
+
+def test_repeated_keyword_counts_once():
+    automaton = KeywordAutomaton({"a": ["ship"]})
+    assert automaton.match("ship ship ship").hit_count("a") == 1
+
+
+def test_keyword_in_several_dictionaries():
+    automaton = KeywordAutomaton({"a": ["event"], "b": {"event": 2}})
+    matches = automaton.match("citizencon event")
+    assert matches.hits == {"a": ("event",), "b": ("event",)}
+    assert matches.score("b") == 2.0
+
+
+def test_matches_substring_semantics_on_random_text():
+    rng = random.Random(7)
+    alphabet = "abc "
+    keywords = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a" for _ in range(60)})
+    automaton = KeywordAutomaton({"k": keywords})
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = tuple(k for k in keywords if k in text)
+        assert automaton.match(text).hits["k"] == expected
+
+
+def test_normalize_and_merge_dictionaries():
+    assert normalize_dictionary(["Ship", " "]) == {"ship": 1.0}
+    assert normalize_dictionary({"ptu": "0.5", "bad": "x"}) == {"ptu": 0.5}
+    merged = merge_dictionaries({"relevance": {"patch": 0.6}}, {"relevance": {"patch": 0.9, "evocati": 0.4}, "new": ["x"]})
+    assert merged == {"relevance": {"patch": 0.9, "evocati": 0.4}, "new": {"x": 1.0}}
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.content_processor import StantonTimesContentProcessor
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_local_mode_never_imports_sklearn(tmp_path):
+    env = dict(os.environ)
+    env["STANTON_TIMES_STATE_PATH"] = str(tmp_path / "state.json")
+    env["STANTON_TIMES_DB_PATH"] = str(tmp_path / "ledger.sqlite")
+    env["PYTHONPATH"] = str(PROJECT_ROOT)
+    snippet = (
+        "import json, sys\n"
+        "from content_processor import StantonTimesContentProcessor\n"
+        "p = StantonTimesContentProcessor()\n"
+        "p.config['content_intelligence'] = {'mode': 'local'}\n"
+        "p.calculate_content_score({'source': 'RSI Comm-Link', 'topic': 'Patch notes'})\n"
+        "print(json.dumps(['sklearn' in sys.modules, 'numpy' in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", snippet], capture_output=True, text=True, cwd=str(PROJECT_ROOT), env=env, check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == [False, False]
+
+
+def test_ml_scorer_is_disabled_in_local_mode_and_loaded_on_demand():
+    processor = StantonTimesContentProcessor()
+    processor.config = {"content_intelligence": {"mode": "local"}}
+    with pytest.raises(RuntimeError):
+        processor.ml_scorer
+
+    class _Scorer:
+        def score_content(self, text):
+            return 1.0
+
+    processor.config = {"content_intelligence": {"mode": "hybrid"}}
+    processor.ml_scorer = _Scorer()
+    content = {"source": "Unknown", "description": "x", "id": "lazy-1"}
+    assert processor.calculate_content_score(content) == pytest.approx(0.6 + 0.4 * processor._traditional_score(content))
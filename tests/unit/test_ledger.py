@@ -0,0 +1,84 @@
+from ledger import StantonTimesLedger
+
+
+def _ledger(tmp_path):
+    return StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+
+
+def test_training_examples_roundtrip(tmp_path):
+    ledger = _ledger(tmp_path)
+    ledger.add_training_examples(["a", "b", "c"], [0.1, 0.5, 0.9])
+    assert ledger.training_examples() == [("a", 0.1), ("b", 0.5), ("c", 0.9)]
+    assert ledger.training_examples(limit=2) == [("b", 0.5), ("c", 0.9)]
+
+
+def test_training_examples_keep_only_the_newest(tmp_path):
+    ledger = _ledger(tmp_path)
+    for idx in range(5):
+        ledger.add_training_examples([f"t{idx}"], [idx / 10], keep=3)
+    assert ledger.training_examples() == [("t2", 0.2), ("t3", 0.3), ("t4", 0.4)]
+
+
+def _ingest(ledger, title, score=None):
+    return ledger.ingest_item(
+        source="rss", title=title, description=f"{title} details", url="",
+        published_at=None, priority="medium", tier="tier1", score=score,
+    )
+
+
+def test_outcome_examples_returns_reviewed_items_with_scores(tmp_path):
+    ledger = _ledger(tmp_path)
+    published = _ingest(ledger, "Alpha 4.6 live", score=0.9)
+    rejected = _ingest(ledger, "Merch sale", score=0.4)
+    _ingest(ledger, "Still pending", score=0.7)
+    ledger.mark_published(published.item_id, published.cluster_id, "123")
+    ledger.mark_status(rejected.item_id, "rejected")
+
+    assert ledger.outcome_examples() == [
+        ("alpha 4 6 live alpha 4 6 live details", "published", 0.9),
+        ("merch sale merch sale details", "rejected", 0.4),
+    ]
+    assert ledger.outcome_examples(limit=1) == [("merch sale merch sale details", "rejected", 0.4)]
+
+
+def test_score_column_is_added_to_existing_ledger(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "ledger.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, text_hash TEXT, "
+        "cluster_id TEXT, status TEXT, created_at TEXT)"
+    )
+    conn.commit()
+    conn.close()
+
+    ledger = StantonTimesLedger(db_path=str(db_path))
+    columns = {row["name"] for row in ledger.conn.execute("PRAGMA table_info(items)")}
+    assert {"score", "trace_id", "fetched_at", "tweeted_at"} <= columns
+
+
+def test_hop_timestamps_follow_the_item_through_review(tmp_path):
+    ledger = _ledger(tmp_path)
+    reviewed = ledger.ingest_item(
+        source="rss", title="Alpha 4.6 live", description="", url="",
+        published_at="Mon, 05 Oct 2026 10:00:00 GMT", priority="P1", tier=None,
+        fetched_at="2026-10-05T10:20:00",
+    )
+    auto = _ingest(ledger, "Server meshing test")
+    ledger.mark_draft(reviewed.item_id, reviewed.cluster_id, "draft a")
+    ledger.mark_posted_for_review(reviewed.item_id)
+    ledger.mark_status(reviewed.item_id, "approved")
+    ledger.mark_published(reviewed.item_id, reviewed.cluster_id, "123")
+    ledger.mark_draft(auto.item_id, auto.cluster_id, "draft b", auto_approved=True)
+
+    rows = {row["priority"]: row for row in ledger.hop_timestamps(days=3650)}
+    assert rows["P1"]["fetched_at"] == "2026-10-05T10:20:00"
+    assert all(rows["P1"][column] for column in ("drafted_at", "posted_for_review_at", "approved_at", "tweeted_at"))
+    assert rows["medium"]["approved_at"] == rows["medium"]["drafted_at"]
+    assert rows["medium"]["posted_for_review_at"] is None
+
+    # A repost keeps the first review timestamp.
+    first = rows["P1"]["posted_for_review_at"]
+    ledger.mark_posted_for_review(reviewed.item_id)
+    assert ledger.hop_timestamps(days=3650)[0]["posted_for_review_at"] == first
@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+from src.telemetry.loop_lag import LoopLagMonitor, loop_lag_from_config
+from src.telemetry.metrics import LOOP_STALLS, REGISTRY
+
+
+def test_blocking_call_on_the_loop_is_reported_as_a_stall():
+    warnings = []
+    logger = type("Logger", (), {"warning": lambda self, message: warnings.append(message)})()
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1, logger=logger)
+    REGISTRY.snapshot(reset=True)
+
+    async def _run():
+        probe = asyncio.ensure_future(monitor.run())
+        await asyncio.sleep(0.05)
+        time.sleep(0.25)  # a synchronous call holding the loop
+        await asyncio.sleep(0.05)
+        probe.cancel()
+
+    asyncio.run(_run())
+    summary = monitor.summary(reset=True)
+    assert summary["stalls"] == 1
+    assert 0.2 <= summary["max_lag_seconds"] < 1
+    assert summary["stalled_seconds"] == summary["max_lag_seconds"]
+    assert LOOP_STALLS.values == {(): 1}
+    assert len(warnings) == 1 and "blocked" in warnings[0]
+    assert monitor.summary()["stalls"] == 0
+
+
+def test_loop_lag_from_config_reads_telemetry_settings():
+    monitor = loop_lag_from_config({"telemetry": {"loop_lag_interval": 0.5, "loop_lag_threshold": 0.2}})
+    assert (monitor.interval, monitor.threshold) == (0.5, 0.2)
+    assert loop_lag_from_config(None).threshold == 0.1
@@ -0,0 +1,77 @@
+import urllib.request
+import threading
+
+import pytest
+
+from src.telemetry.metrics import MetricsStore, Registry, queue_depth_collector, render, serve_http
+
+
+def _registry():
+    registry = Registry()
+    fetched = registry.counter("stanton_items_fetched", "Items fetched.", ("source",))
+    latency = registry.histogram("stanton_webhook_latency_seconds", "Webhook.", ("outcome",), buckets=(0.1, 1.0))
+    return registry, fetched, latency
+
+
+def test_flush_accumulates_counters_and_histograms_across_runs(tmp_path):
+    store = MetricsStore(tmp_path / "registry", tmp_path / "stanton.prom")
+    for run in range(2):
+        registry, fetched, latency = _registry()
+        fetched.inc(3, source="rss")
+        fetched.inc(source="x")
+        latency.observe(0.05, outcome="ok")
+        latency.observe(2.0, outcome="ok")
+        store.flush("source_monitor", registry)
+        # Deltas are cleared once folded in.
+        assert registry.snapshot()["stanton_items_fetched"]["values"] == []
+
+    text = (tmp_path / "stanton.prom").read_text()
+    assert 'stanton_items_fetched_total{component="source_monitor",source="rss"} 6' in text
+    assert 'stanton_items_fetched_total{component="source_monitor",source="x"} 2' in text
+    assert 'stanton_webhook_latency_seconds_bucket{component="source_monitor",outcome="ok",le="0.1"} 2' in text
+    assert 'stanton_webhook_latency_seconds_bucket{component="source_monitor",outcome="ok",le="+Inf"} 4' in text
+    assert 'stanton_webhook_latency_seconds_sum{component="source_monitor",outcome="ok"} 4.1' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_components_and_queue_depth_render_side_by_side(tmp_path):
+    store = MetricsStore(tmp_path / "registry", tmp_path / "stanton.prom")
+    for component in ("source_monitor", "bird_monitor"):
+        registry, fetched, _ = _registry()
+        fetched.inc(source=component)
+        store.flush(component, registry)
+
+    stories = [{"draft_status": "posted_for_review"}, {"draft_status": "posted_for_review"}, {"draft_status": "approved"}]
+    text = store.exposition(queue_depth_collector(stories))
+    assert text.count("# TYPE stanton_items_fetched counter") == 1
+    assert 'component="bird_monitor"' in text and 'component="source_monitor"' in text
+    assert 'stanton_pending_stories{component="pipeline",draft_status="posted_for_review"} 2' in text
+
+
+def test_disabled_store_drops_deltas_without_writing(tmp_path):
+    store = MetricsStore(tmp_path / "registry", tmp_path / "stanton.prom", enabled=False)
+    registry, fetched, _ = _registry()
+    fetched.inc(source="rss")
+    store.flush("source_monitor", registry)
+    assert not (tmp_path / "stanton.prom").exists()
+    assert registry.snapshot()["stanton_items_fetched"]["values"] == []
+
+
+def test_registry_rejects_kind_mismatch():
+    registry, _, _ = _registry()
+    with pytest.raises(ValueError):
+        registry.gauge("stanton_items_fetched", "Items fetched.")
+
+
+def test_http_endpoint_serves_metrics():
+    server = serve_http(lambda: render({}), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert response.read() == b"# EOF\n"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,115 @@
+import joblib
+import pytest
+
+from ml_scorer import ARTIFACT_VERSION, AdvancedContentScorer, ModelArtifactError, load_artifact
+
+
+def test_restart_loads_fitted_pipeline_without_retraining(tmp_path, monkeypatch):
+    model_path = str(tmp_path / "scorer.joblib")
+    first = AdvancedContentScorer(model_path=model_path)
+    expected = first.score_content("Server meshing in Alpha 4.6")
+
+    def _no_training(self):
+        raise AssertionError("should load the saved artifact")
+
+    monkeypatch.setattr(AdvancedContentScorer, "_train_initial_model", _no_training)
+    second = AdvancedContentScorer(model_path=model_path)
+    assert second.score_content("Server meshing in Alpha 4.6") == pytest.approx(expected)
+    assert hasattr(second.model, "coef_")
+
+
+def test_artifact_is_versioned(tmp_path):
+    model_path = str(tmp_path / "scorer.joblib")
+    AdvancedContentScorer(model_path=model_path)
+    artifact = load_artifact(model_path)
+    assert artifact["version"] == ARTIFACT_VERSION
+    assert artifact["trained_at"]
+
+    stale_path = str(tmp_path / "stale.joblib")
+    joblib.dump({**artifact, "version": ARTIFACT_VERSION - 1}, stale_path)
+    with pytest.raises(ModelArtifactError):
+        load_artifact(stale_path)
+
+
+def test_unusable_artifact_is_replaced(tmp_path):
+    model_path = tmp_path / "scorer.joblib"
+    model_path.write_bytes(b"not a model")
+    scorer = AdvancedContentScorer(model_path=str(model_path))
+    assert 0.0 <= scorer.score_content("New ship revealed") <= 1.0
+    assert load_artifact(str(model_path))["version"] == ARTIFACT_VERSION
+
+
+class _Store:
+    def __init__(self):
+        self.examples = []
+
+    def add_training_examples(self, texts, scores):
+        self.examples.extend(zip(texts, scores))
+
+    def training_examples(self):
+        return list(self.examples)
+
+
+def test_cold_start_replays_recorded_updates(tmp_path):
+    store = _Store()
+    store.add_training_examples(["Pyro jump points"] * 20, [1.0] * 20)
+    seed_only = AdvancedContentScorer(model_path=str(tmp_path / "seed.joblib"))
+    replayed = AdvancedContentScorer(model_path=str(tmp_path / "replayed.joblib"), example_store=store)
+    assert replayed.score_content("Pyro jump points") > seed_only.score_content("Pyro jump points")
+
+
+def test_update_model_is_online_and_checkpoints_every_n(tmp_path):
+    model_path = tmp_path / "scorer.joblib"
+    store = _Store()
+    scorer = AdvancedContentScorer(model_path=str(model_path), example_store=store, checkpoint_every=3)
+    saved_at = model_path.stat().st_mtime_ns
+    before = scorer.score_content("Pyro jump points")
+
+    scorer.update_model(["Pyro jump points"], [1.0])
+    scorer.update_model(["Pyro jump points"], [1.0])
+    assert model_path.stat().st_mtime_ns == saved_at
+    assert scorer.pending_updates == 2
+    assert scorer.score_content("Pyro jump points") > before
+
+    scorer.update_model(["Pyro jump points"], [1.0])
+    assert scorer.pending_updates == 0
+    assert store.examples == [("Pyro jump points", 1.0)] * 3
+
+    reloaded = AdvancedContentScorer(model_path=str(model_path))
+    assert reloaded.score_content("Pyro jump points") == pytest.approx(scorer.score_content("Pyro jump points"))
+    reloaded.update_model(["memory-mapped coefficients stay writable"], [0.5])
+
+
+def test_checkpoint_force_flushes_pending_updates(tmp_path):
+    scorer = AdvancedContentScorer(model_path=str(tmp_path / "scorer.joblib"), checkpoint_every=100)
+    assert scorer.checkpoint(force=True) is False
+    scorer.update_model(["one"], [0.2])
+    assert scorer.checkpoint() is False
+    assert scorer.checkpoint(force=True) is True
+    assert scorer.pending_updates == 0
+
+
+def test_score_many_matches_one_at_a_time(tmp_path):
+    scorer = AdvancedContentScorer(model_path=str(tmp_path / "scorer.joblib"), memo_size=0)
+    texts = ["Server meshing in Alpha 4.6", "Minor bug fix released", "", "Server meshing in Alpha 4.6"]
+    expected = [float(min(max(scorer.pipeline.predict([text])[0], 0.0), 1.0)) for text in texts]
+    assert scorer.score_many(texts) == pytest.approx(expected)
+    assert scorer.score_many([]) == []
+
+
+def test_score_many_memoizes_until_model_changes(tmp_path, monkeypatch):
+    scorer = AdvancedContentScorer(model_path=str(tmp_path / "scorer.joblib"), memo_size=2, checkpoint_every=100)
+    first = scorer.score_many(["a ship", "a patch"])
+
+    calls = []
+    original = scorer.vectorizer.transform
+    monkeypatch.setattr(scorer.vectorizer, "transform", lambda texts: calls.append(list(texts)) or original(texts))
+    assert scorer.score_many(["a patch", "a ship"]) == first[::-1]
+    assert calls == []
+
+    scorer.score_content("an event")
+    assert len(scorer._memo) == 2
+    assert calls == [["an event"]]
+
+    scorer.update_model(["a ship"], [1.0])
+    assert not scorer._memo
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+
+from ledger import StantonTimesLedger
+from src.notify.publish_queue import PublishBudget, PublishError, PublishQueue, publish_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 3, 1, 12, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+class FakeBird:
+    def __init__(self, clock, failures=None, in_doubt=0):
+        self.clock = clock
+        self.failures = dict(failures or {})
+        self.in_doubt = in_doubt
+        self.timeline = []
+        self.posted_at = []
+
+    def post(self, job):
+        if self.failures.get(job["tweet_text"]):
+            self.failures[job["tweet_text"]] -= 1
+            raise PublishError("bird tweet error: 503")
+        self.posted_at.append(self.clock())
+        tweet_id = str(1000 + len(self.timeline))
+        self.timeline.append({"id": tweet_id, "text": job["tweet_text"]})
+        if self.in_doubt:
+            self.in_doubt -= 1
+            raise PublishError("bird tweet timed out", in_doubt=True)
+        return tweet_id
+
+    def recent(self):
+        return list(self.timeline)
+
+
+def _queue(tmp_path, clock, bird, **kwargs):
+    ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    kwargs.setdefault("budget", PublishBudget(tweets_per_window=10, window_seconds=3600, min_interval_seconds=30))
+    return PublishQueue(ledger, post=bird.post, recent_tweets=bird.recent, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _story(idx, priority="P1"):
+    return {"story_id": f"s{idx}", "priority": priority}
+
+
+def test_jobs_post_by_priority_then_approval_time(tmp_path):
+    clock = FakeClock()
+    bird = FakeBird(clock)
+    queue = _queue(tmp_path, clock, bird)
+    queue.enqueue(_story(1, "P2"), "p2 early", approved_at="2026-03-01T09:00:00")
+    queue.enqueue(_story(2, "P1"), "p1 late", approved_at="2026-03-01T11:00:00")
+    queue.enqueue(_story(3, "P0"), "p0", approved_at="2026-03-01T11:30:00")
+    queue.enqueue(_story(4, "P1"), "p1 early", approved_at="2026-03-01T10:00:00")
+    # Re-queueing the same tweet is a no-op.
+    assert queue.enqueue(_story(3, "P0"), "p0")["id"] == queue.enqueue(_story(3, "P0"), "p0")["id"]
+
+    run = queue.drain()
+    assert [tweet["text"] for tweet in bird.timeline] == ["p0", "p1 early", "p1 late", "p2 early"]
+    assert len(run.published) == 4 and run.next_due_in is None
+    assert queue.drain().published == []
+    assert len(bird.timeline) == 4
+
+
+def test_backlog_drains_at_the_budgeted_rate(tmp_path):
+    clock = FakeClock()
+    bird = FakeBird(clock)
+    queue = _queue(tmp_path, clock, bird)
+    for idx in range(25):
+        queue.enqueue(_story(idx), f"tweet {idx}")
+
+    # A one-shot run spaces tweets and stops once the window budget is spent.
+    run = queue.drain()
+    assert len(run.published) == 10
+    assert run.next_due_in == 3600 - 9 * 30
+
+    # A waiting publisher keeps going at the maximum rate the budget allows.
+    while run.next_due_in is not None:
+        clock.sleep(run.next_due_in)
+        run = queue.drain()
+    assert len(bird.posted_at) == 25
+    gaps = [(b - a).total_seconds() for a, b in zip(bird.posted_at, bird.posted_at[1:])]
+    assert min(gaps) >= 30
+    for idx, posted in enumerate(bird.posted_at):
+        in_window = [other for other in bird.posted_at[:idx + 1] if (posted - other).total_seconds() < 3600]
+        assert len(in_window) <= 10
+    assert (bird.posted_at[-1] - bird.posted_at[0]).total_seconds() == 2 * 3600 + 4 * 30
+
+
+def test_failures_back_off_exponentially_then_give_up(tmp_path):
+    clock = FakeClock()
+    bird = FakeBird(clock, failures={"flaky": 2, "doomed": 10})
+    queue = _queue(tmp_path, clock, bird, retry_base_seconds=60, max_attempts=3)
+    queue.enqueue(_story(1, "P0"), "flaky")
+    queue.enqueue(_story(2), "steady")
+
+    # A failing job backs off without holding up the rest of the queue.
+    run = queue.drain()
+    assert [job["story_id"] for job in run.published] == ["s2"]
+    assert run.next_due_in == 60
+    clock.sleep(60)
+    run = queue.drain()
+    assert run.published == [] and run.next_due_in == 120
+    clock.sleep(120)
+    run = queue.drain()
+    assert [job["story_id"] for job in run.published] == ["s1"]
+    assert queue.ledger.publish_job(publish_key(_story(1), "flaky"))["attempts"] == 3
+
+    queue.enqueue(_story(3), "doomed")
+    failed = []
+    for _ in range(3):
+        failed += queue.drain().failed
+        clock.sleep(3600)
+    assert [job["story_id"] for job in failed] == ["s3"]
+    assert queue.ledger.publish_job(publish_key(_story(3), "doomed"))["status"] == "failed"
+    assert queue.drain().next_due_in is None
+
+
+def test_interrupted_posts_are_settled_from_the_timeline(tmp_path):
+    clock = FakeClock()
+    bird = FakeBird(clock, in_doubt=1)
+    queue = _queue(tmp_path, clock, bird)
+    queue.enqueue(_story(1), "Alpha 4.6 & more https://example.com/patch")
+
+    # Timed out, but it went out: the next drain finds it instead of re-posting.
+    run = queue.drain()
+    assert run.published == [] and len(bird.timeline) == 1
+    bird.timeline[0]["text"] = "Alpha 4.6 &amp; more https://t.co/abc"
+    clock.sleep(run.next_due_in)
+    run = queue.drain()
+    assert [job["tweet_id"] for job in run.published] == ["1000"]
+    assert len(bird.timeline) == 1
+
+    # A run that died after claiming: held while the timeline is unreadable,
+    # re-posted once it is readable and the tweet is not there.
+    job = queue.enqueue(_story(2), "crashed mid-post")
+    queue.ledger.claim_publish_job(job["id"], clock().isoformat())
+    queue.recent_tweets = lambda: None
+    assert queue.drain().published == []
+    assert queue.ledger.publish_job(job["idempotency_key"])["status"] == "posting"
+    queue.recent_tweets = bird.recent
+    clock.sleep(3600)
+    queue.drain()
+    clock.sleep(3600)
+    run = queue.drain()
+    assert [job["story_id"] for job in run.published] == ["s2"]
+    assert [tweet["text"] for tweet in bird.timeline].count("crashed mid-post") == 1
+
+
+def test_stale_jobs_are_cancelled_instead_of_posted(tmp_path):
+    clock = FakeClock()
+    bird = FakeBird(clock, failures={"Tweet a": 1})
+    queue = _queue(tmp_path, clock, bird)
+    queue.enqueue(_story(1), "Tweet a")
+    assert queue.drain().published == []
+
+    # The draft was edited while its first text waited for a retry.
+    queue.enqueue(_story(1), "Edited tweet a")
+    assert queue.ledger.publish_job(publish_key(_story(1), "Tweet a"))["status"] == "cancelled"
+    clock.sleep(3600)
+    queue.drain()
+    assert [tweet["text"] for tweet in bird.timeline] == ["Edited tweet a"]
+
+    # A due job its story no longer backs is cancelled, not posted.
+    queue.enqueue(_story(2), "Tweet b")
+    queue.is_current = lambda job: job["story_id"] != "s2"
+    run = queue.drain()
+    assert [job["story_id"] for job in run.cancelled] == ["s2"]
+    assert len(bird.timeline) == 1 and queue.drain().next_due_in is None
+
+    # Edited back to a cancelled text, the story is queued again.
+    queue.is_current = None
+    assert queue.enqueue(_story(1), "Tweet a")["status"] == "pending"
@@ -0,0 +1,480 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import discord
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from reaction_monitor import TALLY_EMOJIS, StantonTimesReactionMonitor
+from src.state.store import load_state, save_state, update_state
+from src.telemetry.loop_lag import LoopLagMonitor
+from src.telemetry.tracing import Tracer
+from src.utils.approval_decision import decide_draft_status
+from src.utils.discord_approval import build_approval_embed
+from src.utils.reaction_tallies import ReactionTallies
+
+
+class FakeChannel:
+    def __init__(self, messages, latency=0.01):
+        self.id = 42
+        self.messages = {message.id: message for message in messages}
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fetches = 0
+        self.sent = []
+        self.history_calls = 0
+        self.history_read = 0
+
+    async def fetch_message(self, message_id):
+        self.fetches += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return self.messages[int(message_id)]
+        finally:
+            self.in_flight -= 1
+
+    async def send(self, text):
+        self.sent.append(text)
+
+    async def history(self, limit=100, after=None, oldest_first=None):
+        self.history_calls += 1
+        ordered = sorted(self.messages.values(), key=lambda message: message.id)
+        if after is not None:
+            ordered = [message for message in ordered if message.id > after.id]
+        else:
+            ordered.reverse()
+        for message in ordered[:limit]:
+            self.history_read += 1
+            yield message
+
+
+def _reaction(emoji, user_ids):
+    # The bot (user 1) seeded every approval reaction.
+    reactors = [1, *user_ids]
+
+    async def _users():
+        for user_id in reactors:
+            yield SimpleNamespace(id=user_id)
+
+    return SimpleNamespace(emoji=emoji, count=len(reactors), me=True, users=_users)
+
+
+def _message(message_id, channel=None, embed=None, **counts):
+    return SimpleNamespace(
+        id=message_id,
+        created_at=datetime.now(timezone.utc),
+        channel=channel,
+        embeds=[embed] if embed else [],
+        reactions=[_reaction(emoji, range(100, 100 + count)) for emoji, count in counts.items()],
+    )
+
+
+def _monitor(tmp_path, stories, channel):
+    monitor = StantonTimesReactionMonitor.__new__(StantonTimesReactionMonitor)
+    monitor.config = {"discord": {}, "telemetry": {"metrics": False}}
+    monitor.state_path = str(tmp_path / "state.json")
+    if stories is not None:
+        save_state(monitor.state_path, {"pending_stories": stories})
+    monitor.state = load_state(monitor.state_path)
+    monitor.logger = SimpleNamespace(info=lambda *a: None, warning=lambda *a: None, error=lambda *a: None)
+    monitor.verification_channel_id = channel.id
+    monitor.client = SimpleNamespace(get_channel=lambda channel_id: channel, user=SimpleNamespace(id=1))
+    monitor.fetch_concurrency = 5
+    monitor.history_sweep_limit = 1000
+    monitor._review_index = None
+    monitor.tallies = ReactionTallies(TALLY_EMOJIS)
+    monitor._untracked_messages = set()
+    monitor.reaction_debounce_seconds = 0
+    monitor._pending_evaluations = {}
+    monitor._evaluation_locks = {}
+    monitor._seeding = {}
+    monitor._seed_events = {}
+    monitor.pending_stories_max_age = timedelta(hours=24)
+    monitor.ledger = None
+    monitor.tracer = Tracer("reaction_monitor", enabled=False)
+    monitor.io_executor = ThreadPoolExecutor(max_workers=1)
+    monitor.loop_lag = LoopLagMonitor()
+    monitor._content_processor = None
+    monitor._content_processor_lock = threading.Lock()
+    return monitor
+
+
+def _story(idx):
+    return {"story_id": f"s{idx}", "topic": f"Story {idx}", "draft_status": "posted_for_review",
+            "discord_message_id": str(1000 + idx)}
+
+
+def test_reconciliation_fetches_concurrently_and_writes_once(tmp_path, monkeypatch):
+    channel = FakeChannel([])
+    for idx in range(40):
+        counts = {"✅": 2} if idx % 2 == 0 else {}
+        channel.messages[1000 + idx] = _message(1000 + idx, channel, **counts)
+    monitor = _monitor(tmp_path, [_story(idx) for idx in range(40)], channel)
+
+    writes = []
+    original = update_state
+
+    def _counting_update(path, updater):
+        writes.append(path)
+        if len(writes) == 1:
+            # A monitor appends a draft while the cycle is running.
+            original(path, lambda state: state["pending_stories"].append({"story_id": "new"}))
+        return original(path, updater)
+
+    monkeypatch.setattr("reaction_monitor.update_state", _counting_update)
+    asyncio.run(monitor.check_pending_stories())
+
+    assert channel.fetches == 40
+    assert 1 < channel.max_in_flight <= monitor.fetch_concurrency
+    assert len(writes) == 1
+    stories = {story["story_id"]: story for story in load_state(monitor.state_path)["pending_stories"]}
+    assert stories["s0"]["draft_status"] == "approved"
+    assert stories["s1"]["draft_status"] == "posted_for_review"
+    assert "new" in stories
+
+
+def test_reconciliation_does_not_undo_decisions_made_while_it_ran(tmp_path):
+    channel = FakeChannel([])
+    for idx in range(3):
+        channel.messages[1000 + idx] = _message(1000 + idx, channel, **({"✅": 1} if idx < 2 else {}))
+    monitor = _monitor(tmp_path, [_story(idx) for idx in range(3)], channel)
+    fetch_message = channel.fetch_message
+
+    async def _fetch_during_replies(message_id):
+        if int(message_id) == 1000:
+            # `hold` and `reject` replies land while the cycle is fetching.
+            def _decide(state):
+                state["pending_stories"][0]["draft_status"] = "hold"
+                state["pending_stories"][2]["draft_status"] = "rejected"
+                return state
+            update_state(monitor.state_path, _decide)
+        return await fetch_message(message_id)
+
+    channel.fetch_message = _fetch_during_replies
+    asyncio.run(monitor.check_pending_stories())
+    statuses = [story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]]
+    assert statuses == ["hold", "approved", "rejected"]
+
+
+def test_edited_draft_repost_keeps_concurrent_changes(tmp_path, monkeypatch):
+    channel = FakeChannel([])
+    story = {"story_id": "s1", "topic": "Story", "draft_status": "edit_requested", "tweet_draft": "Old"}
+    monitor = _monitor(tmp_path, [story], channel)
+
+    def _send(target):
+        # The content processor appends a draft during the webhook round trip.
+        update_state(monitor.state_path, lambda state: state["pending_stories"].append({"story_id": "new"}))
+        return "555"
+
+    monkeypatch.setattr("src.utils.discord_approval.send_approval_webhook", _send)
+    reply = SimpleNamespace(author=SimpleNamespace(bot=False), channel=channel, content="EDIT: New text", reference=None)
+    asyncio.run(monitor.on_message(reply))
+    stories = {story["story_id"]: story for story in load_state(monitor.state_path)["pending_stories"]}
+    assert (stories["s1"]["draft_status"], stories["s1"]["discord_message_id"]) == ("posted_for_review", "555")
+    assert stories["s1"]["tweet_draft"] == "New text" and "new" in stories
+
+
+def _embed(story):
+    embed = build_approval_embed(story)
+    fields = [SimpleNamespace(name=field["name"], value=field["value"]) for field in embed["fields"]]
+    return SimpleNamespace(title=embed["title"], fields=fields)
+
+
+def test_history_sweep_backfills_orphans_and_persists_cursor(tmp_path):
+    channel = FakeChannel([])
+    orphan = {"story_id": "s1", "topic": "Orphan", "draft_status": "posted_for_review"}
+    stale = {"story_id": "s2", "topic": "Stale", "draft_status": "posted_for_review", "discord_message_id": "5"}
+    legacy = {"topic": "No story id", "draft_status": "posted_for_review"}
+    for message_id, story in ((101, orphan), (102, stale), (103, dict(legacy, story_id=None))):
+        channel.messages[message_id] = _message(message_id, channel, embed=_embed(story), **{"✅": 2})
+    for message_id in range(104, 150):
+        channel.messages[message_id] = _message(message_id, channel)
+    monitor = _monitor(tmp_path, [orphan, stale, legacy], channel)
+
+    asyncio.run(monitor.check_pending_stories())
+
+    assert channel.history_calls == 1 and channel.history_read == 49
+    state = load_state(monitor.state_path)
+    stories = {story["topic"]: story for story in state["pending_stories"]}
+    assert stories["Orphan"]["discord_message_id"] == "101"
+    assert stories["Stale"]["discord_message_id"] == "102"
+    assert stories["No story id"]["discord_message_id"] == "103"
+    assert all(story["draft_status"] == "approved" for story in stories.values())
+    assert state["review_message_index"]["cursor"] == "149"
+
+    # A restarted monitor resumes from the cursor and only reads new messages.
+    repost = {"story_id": "s3", "topic": "Late", "draft_status": "posted_for_review"}
+    update_state(monitor.state_path, lambda s: s["pending_stories"].append(repost))
+    channel.messages[150] = _message(150, channel, embed=_embed(repost))
+    restarted = _monitor(tmp_path, None, channel)
+    channel.history_read = 0
+    asyncio.run(restarted.check_pending_stories())
+    assert channel.history_read == 1
+    late = next(s for s in load_state(restarted.state_path)["pending_stories"] if s["topic"] == "Late")
+    assert late["discord_message_id"] == "150"
+
+
+def _payload(message_id, emoji, user_id=7):
+    return SimpleNamespace(message_id=message_id, channel_id=42, emoji=emoji, user_id=user_id)
+
+
+def test_reaction_events_are_decided_from_tallies(tmp_path, monkeypatch):
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc))
+    channel = FakeChannel([])
+    channel.messages[message_id] = _message(message_id, channel)
+    story = {"story_id": "s1", "topic": "Story", "draft_status": "posted_for_review",
+             "discord_message_id": str(message_id)}
+    monitor = _monitor(tmp_path, [story], channel)
+
+    loads = []
+    original_load = monitor._load_state
+    monkeypatch.setattr(monitor, "_load_state", lambda: loads.append(1) or original_load())
+
+    # First event seeds the tally with one fetch (which already includes it).
+    channel.messages[message_id].reactions = [_reaction("❌", [7])]
+    asyncio.run(monitor._handle_reaction_event(_payload(message_id, "❌"), added=True))
+    assert channel.fetches == 1 and monitor.tallies.counts(message_id)["❌"] == 1
+    assert load_state(monitor.state_path)["pending_stories"][0]["draft_status"] == "rejected"
+
+    # Back under review: later clicks cost no fetch and no state read until the status changes.
+    update_state(monitor.state_path, lambda s: s["pending_stories"][0].update(draft_status="posted_for_review"))
+    monitor.state = load_state(monitor.state_path)
+    loads.clear()
+    for emoji, added in (("🎉", True), ("❌", False), ("✅", False)):
+        asyncio.run(monitor._handle_reaction_event(_payload(message_id, emoji), added=added))
+    assert channel.fetches == 1
+    assert loads == []
+    asyncio.run(monitor._handle_reaction_event(_payload(message_id, "✅"), added=True))
+    assert channel.fetches == 1 and len(loads) == 1
+    assert load_state(monitor.state_path)["pending_stories"][0]["draft_status"] == "approved"
+
+    # Reactions on unrelated messages reload state once, then are ignored.
+    for _ in range(3):
+        asyncio.run(monitor._handle_reaction_event(_payload(message_id + 1, "✅"), added=True))
+    assert len(loads) == 2 and channel.fetches == 1
+
+
+def test_digest_numbers_approve_only_their_story(tmp_path):
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc))
+    channel = FakeChannel([])
+    channel.messages[message_id] = _message(message_id, channel)
+    channel.messages[message_id].reactions = [_reaction("2️⃣", [7])]
+    stories = [
+        {"story_id": f"d{idx}", "topic": f"Digest {idx}", "draft_status": "posted_for_review",
+         "discord_message_id": str(message_id), "digest_position": idx}
+        for idx in range(3)
+    ]
+    monitor = _monitor(tmp_path, stories, channel)
+
+    asyncio.run(monitor._handle_reaction_event(_payload(message_id, "2️⃣"), added=True))
+    statuses = [story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]]
+    assert statuses == ["posted_for_review", "approved", "posted_for_review"]
+    # ✅ on a digest post is not anyone's number.
+    asyncio.run(monitor._handle_reaction_event(_payload(message_id, "✅"), added=True))
+    assert channel.fetches == 1
+
+    # Reconciliation fetches the digest once for all its stories.
+    channel.messages[message_id].reactions.append(_reaction("3️⃣", [8]))
+    asyncio.run(monitor.check_pending_stories())
+    assert channel.fetches == 2
+    statuses = [story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]]
+    assert statuses == ["posted_for_review", "approved", "approved"]
+
+
+def test_digest_replies_reject_hold_and_edit_single_drafts(tmp_path):
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc))
+    channel = FakeChannel([])
+    channel.messages[message_id] = _message(message_id, channel)
+    stories = [
+        {"story_id": f"d{idx}", "topic": f"Digest {idx}", "draft_status": "posted_for_review",
+         "discord_message_id": str(message_id), "digest_position": idx}
+        for idx in range(4)
+    ]
+    monitor = _monitor(tmp_path, stories, channel)
+
+    def _reply(content, reference=message_id):
+        return SimpleNamespace(
+            author=SimpleNamespace(bot=False), channel=channel, content=content,
+            reference=SimpleNamespace(message_id=reference) if reference else None,
+        )
+
+    asyncio.run(monitor.on_message(_reply("reject 1, 3")))
+    asyncio.run(monitor.on_message(_reply("hold 2")))
+    # Not a reply to the digest: ignored.
+    asyncio.run(monitor.on_message(_reply("reject 4", reference=None)))
+    statuses = [story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]]
+    assert statuses == ["rejected", "hold", "rejected", "posted_for_review"]
+
+    # A decided draft is no longer the digest's to change; edit prompts for new text.
+    asyncio.run(monitor.on_message(_reply("edit 1 4")))
+    statuses = [story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]]
+    assert statuses == ["rejected", "hold", "rejected", "edit_requested"]
+    assert "Edit requested" in channel.sent[-1] and "d3" in channel.sent[-1]
+
+    # The number reaction still approves the draft under edit, as ✅ does on a single post.
+    asyncio.run(monitor._handle_reaction_event(_payload(message_id, "4️⃣"), added=True))
+    assert load_state(monitor.state_path)["pending_stories"][3]["draft_status"] == "approved"
+
+
+def _replay_storm(tmp_path, seed):
+    """
+    Replay 1,000 add/remove clicks by 20 users spread over five review
+    messages. As on Discord, each click is applied on the server before its
+    gateway event is dispatched, so a seed fetch can already include clicks
+    whose events are still on their way.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    message_ids = [discord.utils.time_snowflake(now) + idx for idx in range(5)]
+    truth = {message_id: {emoji: set() for emoji in ("✅", "❌", "🤔", "✏️")} for message_id in message_ids}
+    channel = FakeChannel([_message(message_id) for message_id in message_ids])
+    stories = [{"story_id": f"s{idx}", "topic": f"Story {idx}", "draft_status": "posted_for_review",
+                "discord_message_id": str(message_id)} for idx, message_id in enumerate(message_ids)]
+    monitor = _monitor(tmp_path, stories, channel)
+    monitor.reaction_debounce_seconds = 0.2
+
+    fetch_message = channel.fetch_message
+
+    async def _fetch_current(message_id):
+        message = await fetch_message(message_id)
+        # Snapshot when the fetch returns, like a REST response.
+        message.reactions = [_reaction(emoji, sorted(users)) for emoji, users in truth[int(message_id)].items()]
+        return message
+
+    channel.fetch_message = _fetch_current
+    writes = []
+    original_merge = monitor._merge_stories
+    monitor._merge_stories = lambda updated, loaded: writes.append([s["story_id"] for s in updated]) or original_merge(updated, loaded)
+
+    async def _storm():
+        for _ in range(1000):
+            message_id = rng.choice(message_ids)
+            emoji = rng.choice(list(truth[message_id]))
+            user_id = rng.randrange(100, 120)
+            users = truth[message_id][emoji]
+            added = user_id not in users
+            # The click lands on the server, then its event is dispatched.
+            (users.add if added else users.discard)(user_id)
+            asyncio.ensure_future(
+                monitor._handle_reaction_event(_payload(message_id, emoji, user_id), added=added)
+            )
+            await asyncio.sleep(0)
+        # Handlers, seed fetches and debounced evaluations still in flight
+        while outstanding := asyncio.all_tasks() - {asyncio.current_task()}:
+            await asyncio.gather(*outstanding)
+
+    asyncio.run(_storm())
+    expected = {
+        f"s{idx}": decide_draft_status(
+            reaction_counts={emoji: len(users) for emoji, users in truth[message_id].items()},
+            message_age=timedelta(0), max_age=timedelta(hours=24),
+        ) or "posted_for_review"
+        for idx, message_id in enumerate(message_ids)
+    }
+    final = {story["story_id"]: story["draft_status"] for story in load_state(monitor.state_path)["pending_stories"]}
+    for message_id in message_ids:
+        tally = monitor.tallies.counts(message_id)
+        assert {emoji: tally[emoji] for emoji in truth[message_id]} == {
+            emoji: len(users) for emoji, users in truth[message_id].items()
+        }
+    return channel, writes, expected, final
+
+
+def test_events_the_seed_already_saw_are_not_counted_twice(tmp_path):
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc))
+    channel = FakeChannel([])
+    # Both clicks are on the server before the first event is handled.
+    channel.messages[message_id] = _message(message_id, channel)
+    channel.messages[message_id].reactions = [_reaction("✅", [7]), _reaction("🤔", [8])]
+    story = {"story_id": "s1", "topic": "Story", "draft_status": "posted_for_review",
+             "discord_message_id": str(message_id)}
+    monitor = _monitor(tmp_path, [story], channel)
+
+    async def _events():
+        await monitor._handle_reaction_event(_payload(message_id, "🤔", 8), added=True)
+        # ✅'s event arrives after the seed fetch already counted it.
+        await monitor._handle_reaction_event(_payload(message_id, "✅", 7), added=True)
+
+    asyncio.run(_events())
+    assert channel.fetches == 1
+    assert monitor.tallies.counts(message_id)["✅"] == 1
+    assert load_state(monitor.state_path)["pending_stories"][0]["draft_status"] == "posted_for_review"
+
+
+def test_reaction_storm_is_debounced_per_message(tmp_path):
+    channel, writes, expected, final = _replay_storm(tmp_path / "a", seed=44)
+
+    # One seed fetch per message, one evaluation and at most one write per story.
+    assert channel.fetches == 5
+    assert sorted(story_id for batch in writes for story_id in batch) == sorted(
+        story_id for story_id, status in expected.items() if status != "posted_for_review"
+    )
+    assert final == expected
+
+    # Same storm, same outcome.
+    assert _replay_storm(tmp_path / "b", seed=44)[3] == final
+
+
+def test_blocking_state_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    message_id = discord.utils.time_snowflake(datetime.now(timezone.utc))
+    channel = FakeChannel([])
+    channel.messages[message_id] = _message(message_id, channel, **{"✅": 1})
+    story = {"story_id": "s1", "topic": "Story", "draft_status": "posted_for_review",
+             "discord_message_id": str(message_id), "ledger_item_id": 9}
+    monitor = _monitor(tmp_path, [story], channel)
+    monitor.loop_lag = LoopLagMonitor(interval=0.01, threshold=0.1)
+
+    # Slow disk and sqlite: each call holds its thread for 0.3s.
+    original_load = monitor._load_state
+    marked = []
+    monkeypatch.setattr(monitor, "_load_state", lambda: time.sleep(0.3) or original_load())
+    monitor.ledger = SimpleNamespace(mark_status=lambda item_id, status: time.sleep(0.3) or marked.append(status))
+
+    async def _run():
+        probe = asyncio.ensure_future(monitor.loop_lag.run())
+        await monitor._handle_reaction_event(_payload(message_id, "✅"), added=True)
+        probe.cancel()
+
+    asyncio.run(_run())
+    assert marked == ["approved"]
+    assert load_state(monitor.state_path)["pending_stories"][0]["draft_status"] == "approved"
+    summary = monitor.loop_lag.summary()
+    assert summary["samples"] > 50 and summary["stalls"] == 0
+
+
+def test_close_thread_requests_share_one_processor_and_apply_on_the_loop(tmp_path, monkeypatch):
+    channel = FakeChannel([])
+    monitor = _monitor(tmp_path, [], channel)
+    monitor.config_path = None
+    built, worked_on = [], []
+
+    class FakeProcessor:
+        def __init__(self, state_path, config_path):
+            time.sleep(0.1)  # ledger connection and ML load
+            built.append(self)
+
+        def generate_thread_for_story(self, story):
+            worked_on.append(story)
+            story["thread_status"] = "ready"
+            story["thread_draft"] = f"1/2 {story['topic']}"
+            return story["thread_draft"]
+
+    monkeypatch.setattr("src.content_processor.StantonTimesContentProcessor", FakeProcessor)
+    stories = [{"story_id": f"s{idx}", "topic": f"Story {idx}", "thread_status": "pending"} for idx in range(2)]
+
+    async def _both():
+        await asyncio.gather(*(monitor._generate_thread(channel, story) for story in stories))
+
+    asyncio.run(_both())
+    assert len(built) == 1
+    assert not any(worked is story for worked in worked_on for story in stories)
+    assert [(story["thread_status"], story["thread_draft"]) for story in stories] == [
+        ("ready", "1/2 Story 0"), ("ready", "1/2 Story 1"),
+    ]
+    assert len(channel.sent) == 2
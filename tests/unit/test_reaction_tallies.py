@@ -0,0 +1,44 @@
+from src.utils.reaction_tallies import ReactionTallies
+
+EMOJIS = ("✅", "❌")
+
+
+def test_events_move_tracked_counts_only():
+    tallies = ReactionTallies(EMOJIS)
+    assert tallies.apply("1", "✅", 7, added=True) is False  # not seeded yet
+    assert tallies.reconcile("1", {"✅": [5]}) is None
+    assert tallies.apply("1", "✅", 7, added=True) is True
+    assert tallies.apply("1", "🎉", 7, added=True) is False
+    assert tallies.apply("1", "❌", 7, added=False) is True  # never reacted
+    assert tallies.counts(1) == {"✅": 2, "❌": 0}
+
+
+def test_duplicate_add_counts_once():
+    tallies = ReactionTallies(EMOJIS)
+    tallies.reconcile("1", {"✅": [7]})
+    # The seed already saw user 7's click; its gateway event lands afterwards.
+    tallies.apply("1", "✅", 7, added=True)
+    tallies.apply("1", "✅", "7", added=True)
+    assert tallies.counts("1") == {"✅": 1, "❌": 0}
+
+
+def test_remove_after_seed_drops_that_user_only():
+    tallies = ReactionTallies(EMOJIS)
+    tallies.reconcile("1", {"✅": [7, 8], "❌": [9]})
+    tallies.apply("1", "✅", 7, added=False)
+    tallies.apply("1", "✅", 7, added=False)
+    tallies.apply("1", "❌", 8, added=False)
+    assert tallies.counts("1") == {"✅": 1, "❌": 1}
+
+
+def test_reconcile_reports_and_corrects_drift():
+    tallies = ReactionTallies(EMOJIS)
+    tallies.reconcile("1", {"✅": [5, 6]})
+    tallies.apply("1", "✅", 7, added=True)
+    assert tallies.reconcile("1", {"✅": [5, 6, 7]}) is None
+    assert tallies.reconcile("1", {"✅": [5], "❌": [6]}) == {"✅": -2, "❌": 1}
+    assert tallies.counts("1") == {"✅": 1, "❌": 1}
+
+    tallies.reconcile("2", {})
+    tallies.retain(["2"])
+    assert not tallies.tracks("1") and tallies.tracks("2")
@@ -0,0 +1,42 @@
+from ledger import StantonTimesLedger
+from ml_scorer import AdvancedContentScorer, load_artifact
+from src.scoring.retrain import OUTCOME_TARGETS, build_training_set, retrain
+
+
+def _ledger_with_outcomes(tmp_path):
+    ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    for i in range(6):
+        good = ledger.ingest_item(
+            source="rss", title=f"Server meshing patch {i}", description="Alpha patch notes",
+            url="", published_at=None, priority="high", tier="tier1", score=0.6,
+        )
+        ledger.mark_published(good.item_id, good.cluster_id, str(i))
+        bad = ledger.ingest_item(
+            source="rss", title=f"Merch giveaway {i}", description="Limited stickers",
+            url="", published_at=None, priority="low", tier="tier3", score=0.6,
+        )
+        ledger.mark_status(bad.item_id, "rejected")
+    return ledger
+
+
+def test_build_training_set_labels_outcomes(tmp_path):
+    training = build_training_set(_ledger_with_outcomes(tmp_path))
+    assert training.outcome_count == 12
+    assert training.targets[-2:] == [OUTCOME_TARGETS["published"], OUTCOME_TARGETS["rejected"]]
+    assert len(training.live_scores) == 12
+
+
+def test_retrain_swaps_artifact_and_scorers_reload(tmp_path):
+    ledger = _ledger_with_outcomes(tmp_path)
+    model_path = str(tmp_path / "scorer.joblib")
+    scorer = AdvancedContentScorer(model_path=model_path)
+    before = scorer.score_content("Merch giveaway stickers")
+
+    report = retrain(ledger, model_path, alphas=(1e-4, 1e-3), workers=2)
+    assert report.outcome_examples == 12
+    assert report.alpha in (1e-4, 1e-3)
+    assert load_artifact(model_path)["pipeline"] is not None
+
+    after = scorer.score_content("Merch giveaway stickers")
+    assert after < before
+    assert scorer.score_content("Server meshing patch") > after
@@ -0,0 +1,82 @@
+import pytest
+
+from ledger import ScoreKey, StantonTimesLedger
+from src.content_processor import StantonTimesContentProcessor
+
+
+def _key(**overrides):
+    fields = dict(text_hash="h", source="rss", priority="", tier="", seen=False,
+                  scoring_version="w1", model_version="m1")
+    fields.update(overrides)
+    return ScoreKey(**fields)
+
+
+def test_ledger_score_cache_roundtrip_and_purge(tmp_path):
+    ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    ledger.store_scores([(_key(), 0.7), (_key(seen=True), 0.2), (_key(model_version="m0"), 0.1)])
+    assert ledger.cached_scores([_key(), _key(seen=True), _key(tier="x")]) == {_key(): 0.7, _key(seen=True): 0.2}
+
+    assert ledger.purge_score_cache("w1", "m1") == 1
+    assert ledger.cached_scores([_key(model_version="m0")]) == {}
+    assert ledger.purge_score_cache() == 0
+
+
+def _processor(tmp_path, monkeypatch, mode="local"):
+    processor = StantonTimesContentProcessor()
+    processor.ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    processor.state = dict(processor.state)
+    processor.config = {"content_intelligence": {"mode": mode}}
+
+    calls = []
+    original = processor._traditional_score
+    monkeypatch.setattr(processor, "_traditional_score", lambda c: calls.append(c["topic"]) or original(c))
+    return processor, calls
+
+
+CONTENT = {"source": "RSI Comm-Link", "topic": "Alpha 4.6 patch notes", "description": "Server meshing", "id": "a"}
+
+
+def test_rescored_items_hit_the_cache_until_weights_change(tmp_path, monkeypatch):
+    processor, calls = _processor(tmp_path, monkeypatch)
+    first = processor.calculate_content_score(dict(CONTENT))
+    assert processor.calculate_content_score(dict(CONTENT)) == first
+    assert processor.calculate_content_scores([dict(CONTENT)]) == [first]
+    assert calls == ["Alpha 4.6 patch notes"]
+
+    processor.state["seen_tweet_ids"] = {"RSI Comm-Link": ["a"]}
+    assert processor.calculate_content_score(dict(CONTENT)) < first
+    assert len(calls) == 2
+
+    processor.state["content_intelligence"] = {"scoring_weights": {"developer_credibility": 1.0}}
+    processor.calculate_content_score(dict(CONTENT))
+    assert len(calls) == 3
+
+
+def test_ml_component_is_scored_by_the_live_model(tmp_path, monkeypatch):
+    class _Scorer:
+        # An online step between drafts changes the model without a new artifact.
+        ml_score = 0.5
+
+        def score_content(self, text):
+            return self.ml_score
+
+        def score_many(self, texts):
+            return [self.ml_score for _ in texts]
+
+    processor, calls = _processor(tmp_path, monkeypatch, mode="hybrid")
+    processor.ml_scorer = scorer = _Scorer()
+    first = processor.calculate_content_score(dict(CONTENT))
+    scorer.ml_score = 0.9
+    updated = processor.calculate_content_score(dict(CONTENT))
+    assert updated - first == pytest.approx(0.4 * 0.6)
+    assert processor.calculate_content_scores([dict(CONTENT)]) == [pytest.approx(updated)]
+    # The traditional part was computed once and served from the cache since.
+    assert len(calls) == 1
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    processor, calls = _processor(tmp_path, monkeypatch)
+    processor.config["content_intelligence"]["score_cache"] = False
+    processor.calculate_content_score(dict(CONTENT))
+    processor.calculate_content_score(dict(CONTENT))
+    assert len(calls) == 2
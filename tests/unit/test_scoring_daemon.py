@@ -0,0 +1,90 @@
+import socket
+import threading
+
+import pytest
+
+from src.scoring.daemon import (
+    HEADER,
+    ProtocolError,
+    RemoteScorer,
+    ScoringError,
+    ScoringServer,
+    connect_scorer,
+    encode_frame,
+    read_frame,
+)
+
+
+class _FakeScorer:
+    def __init__(self, offset=0.0):
+        self.offset = offset
+        self.updates = []
+        self.checkpoints = 0
+
+    def score_many(self, texts):
+        return [min(len(text) / 100.0 + self.offset, 1.0) for text in texts]
+
+    def score_content(self, text):
+        return self.score_many([text])[0]
+
+    def update_model(self, texts, scores):
+        if len(texts) != len(scores):
+            raise ValueError("length mismatch")
+        self.updates.extend(zip(texts, scores))
+
+    def checkpoint(self, force=False):
+        self.checkpoints += 1
+        return force
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    scorer = _FakeScorer()
+    server = ScoringServer(tmp_path / "scoring.sock", scorer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def test_frames_roundtrip_over_a_socket():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(encode_frame({"op": "score", "texts": ["a", "ü"]}))
+        assert read_frame(right) == {"op": "score", "texts": ["a", "ü"]}
+        left.sendall(HEADER.pack(5) + b"[1]")
+        left.shutdown(socket.SHUT_WR)
+        with pytest.raises(ProtocolError):
+            read_frame(right)
+
+
+def test_remote_scorer_uses_daemon(daemon):
+    fallback_calls = []
+    scorer = connect_scorer(daemon.socket_path, lambda: fallback_calls.append(1) or _FakeScorer(offset=0.5))
+    assert isinstance(scorer, RemoteScorer)
+
+    assert scorer.score_many(["ab", "abcd"]) == [0.02, 0.04]
+    assert scorer.score_content("abc") == 0.03
+    scorer.update_model(["abc"], [0.9])
+    assert daemon.scorer.updates == [("abc", 0.9)]
+    assert scorer.checkpoint(force=True) is True
+    assert fallback_calls == []
+    assert scorer.is_remote
+
+    with pytest.raises(ScoringError):
+        scorer.update_model(["a", "b"], [0.1])
+
+
+def test_falls_back_in_process_when_daemon_is_absent_or_stops(tmp_path, daemon):
+    local = connect_scorer(tmp_path / "missing.sock", lambda: _FakeScorer(offset=0.5))
+    assert isinstance(local, _FakeScorer)
+
+    scorer = RemoteScorer(daemon.socket_path, fallback=lambda: _FakeScorer(offset=0.5))
+    assert scorer.score_content("ab") == 0.02
+    daemon.shutdown()
+    daemon.server_close()
+    scorer.close()
+    assert scorer.score_content("ab") == 0.52
+    assert not scorer.is_remote
@@ -9,4 +9,21 @@ def test_fetch_sources():
     monitor = SourceMonitor()
     sources = monitor.fetch_sources()
     assert isinstance(sources, list)
-    assert len(sources) > 0
\ No newline at end of file
+    assert len(sources) > 0
+
+def test_filter_content_scores_and_respects_include_exclude():
+    monitor = SourceMonitor()
+    contents = [
+        {"title": "Alpha 4.6 Patch Notes", "description": "PTU hotfix"},
+        {"title": "Fan art", "description": "nothing relevant"},
+        {"title": "Patch notes leak", "description": "rumor"},
+    ]
+    filtered = monitor.filter_content([dict(c) for c in contents], {"exclude_keywords": ["rumor"]})
+    assert [c["title"] for c in filtered] == ["Alpha 4.6 Patch Notes"]
+    assert filtered[0]["score"] == 0.6 + 0.7 + 0.7 + 0.6
+
+    filtered = monitor.filter_content(
+        [dict(c) for c in contents],
+        {"include_keywords": ["fan"], "bypass_keyword_filter": True},
+    )
+    assert [c["title"] for c in filtered] == ["Fan art"]
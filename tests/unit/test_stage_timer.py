@@ -0,0 +1,55 @@
+import pytest
+
+from src.telemetry.stages import BUCKETS, StageTimer, bucket_quantile, load_runs, summarize
+
+
+def test_disabled_timer_is_a_shared_noop(tmp_path):
+    timer = StageTimer(enabled=False)
+    assert timer.span("a") is timer.span("b")
+    with timer.span("a", "s1"):
+        pass
+    timer.count("status.draft_ready")
+    assert timer.stages == {} and timer.counters == {}
+    assert timer.dump(tmp_path / "timings.jsonl") is False
+
+
+def test_spans_aggregate_and_dump_one_line_per_run(tmp_path):
+    timer = StageTimer()
+    for story_id in ("s1", "s2", "s3"):
+        with timer.span("score", story_id):
+            pass
+    with pytest.raises(ValueError):
+        with timer.span("ledger_ingest", "s4"):
+            raise ValueError("boom")
+    timer.count("status.draft_ready", 2)
+
+    stats = timer.stages["score"]
+    assert stats.count == 3 and sum(stats.buckets) == 3
+    assert {story for _, story in stats.slowest} == {"s1", "s2", "s3"}
+    assert timer.stages["ledger_ingest"].errors == 1
+
+    path = tmp_path / "timings.jsonl"
+    assert timer.dump(path) is True
+    assert timer.stages == {}
+    with timer.span("score", "s5"):
+        pass
+    timer.dump(path)
+
+    runs = load_runs(path)
+    assert len(runs) == 2
+    assert runs[0]["counters"] == {"status.draft_ready": 2}
+    assert load_runs(path, limit=1) == runs[1:]
+
+    summary = summarize(runs)
+    assert summary["score"]["count"] == 4
+    assert summary["ledger_ingest"]["errors"] == 1
+    assert summary["score"]["p95_seconds"] <= BUCKETS[-1]
+
+
+def test_bucket_quantile():
+    buckets = [0] * (len(BUCKETS) + 1)
+    assert bucket_quantile(buckets, 0.5) == 0.0
+    buckets[0] = 9
+    buckets[-1] = 1
+    assert bucket_quantile(buckets, 0.5) == BUCKETS[0]
+    assert bucket_quantile(buckets, 0.99) == float("inf")
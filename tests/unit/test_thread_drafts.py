@@ -0,0 +1,107 @@
+from ledger import StantonTimesLedger
+from src.content_processor import StantonTimesContentProcessor
+from src.state.store import load_state, update_state
+from src.telemetry.tracing import SpanExporter, Tracer
+
+LIVE_SHOW = {
+    "source": "Star Citizen (YouTube)",
+    "topic": "Star Citizen Live | Server Meshing Q&A",
+    "description": "Devs discuss server meshing performance.",
+    "link": "https://youtube.com/watch?v=abc",
+    "priority": "P0",
+    "id": "scl-1",
+}
+
+
+def _processor(tmp_path, monkeypatch):
+    processor = StantonTimesContentProcessor(state_file_path=str(tmp_path / "state.json"))
+    processor.ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    processor.config = {"content_intelligence": {"mode": "local", "score_cache": False}}
+    processor.tracer = Tracer("content_processor", SpanExporter(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(
+        processor.system_monitor, "generate_health_report", lambda: {"system_resources": {"cpu_usage": 0}}
+    )
+    return processor
+
+
+def test_thread_draft_is_deferred_until_approval(tmp_path, monkeypatch):
+    processor = _processor(tmp_path, monkeypatch)
+    calls = []
+    monkeypatch.setattr(processor, "_generate_thread_draft", lambda content: calls.append(content["link"]) or "1/2 a")
+
+    result = processor.process_content(dict(LIVE_SHOW), score=1.0)
+    assert result["status"] == "draft_ready"
+    assert result["thread_status"] == "pending"
+    assert calls == []
+
+    story = load_state(processor.state_file_path)["pending_stories"][0]
+    assert story["thread_status"] == "pending"
+    assert "thread_draft" not in story
+
+    # Not approved yet: the background job leaves it alone.
+    assert processor.generate_pending_threads() == 0
+
+    def _approve(state):
+        state["pending_stories"][0]["draft_status"] = "approved"
+
+    update_state(processor.state_file_path, _approve)
+    assert processor.generate_pending_threads() == 1
+    story = load_state(processor.state_file_path)["pending_stories"][0]
+    assert story["thread_status"] == "ready"
+    assert story["thread_draft"] == "1/2 a"
+    assert calls == [LIVE_SHOW["link"]]
+    assert processor.generate_pending_threads() == 0
+
+
+def test_non_thread_items_get_no_thread_status(tmp_path, monkeypatch):
+    processor = _processor(tmp_path, monkeypatch)
+    content = dict(LIVE_SHOW, topic="Alpha 4.6 Patch Notes", id="patch-1")
+    assert processor.process_content(content, score=1.0)["thread_status"] == ""
+
+
+def test_generate_thread_for_story_records_outcome(tmp_path, monkeypatch):
+    processor = _processor(tmp_path, monkeypatch)
+    story = {"topic": LIVE_SHOW["topic"], "link": LIVE_SHOW["link"], "thread_status": "pending"}
+
+    monkeypatch.setattr(processor, "_generate_thread_draft", lambda content: "")
+    assert processor.generate_thread_for_story(story) == ""
+    assert story["thread_status"] == "unavailable"
+
+    def _boom(content):
+        raise RuntimeError("transcript fetch failed")
+
+    monkeypatch.setattr(processor, "_generate_thread_draft", _boom)
+    processor.generate_thread_for_story(story)
+    assert story["thread_status"] == "failed"
+
+
+def test_process_content_records_stage_spans(tmp_path, monkeypatch):
+    processor = _processor(tmp_path, monkeypatch)
+    processor.process_content(dict(LIVE_SHOW))
+
+    stages = processor.stage_timer.stages
+    for stage in ("total", "score", "health_check", "ledger_ingest", "render_tweet", "state_write"):
+        assert stages[stage].count == 1
+    assert stages["total"].slowest[0][1] == processor._make_story_id(LIVE_SHOW)
+    assert processor.stage_timer.counters == {"status.draft_ready": 1}
+
+
+def test_trace_id_is_stored_on_story_and_ledger(tmp_path, monkeypatch):
+    from src.telemetry.tracing import load_spans
+
+    processor = _processor(tmp_path, monkeypatch)
+    processor.process_content(dict(LIVE_SHOW, trace_id="t-123"), score=1.0)
+
+    story = load_state(processor.state_file_path)["pending_stories"][0]
+    assert story["trace_id"] == "t-123"
+    row = processor.ledger.conn.execute("SELECT trace_id FROM items WHERE id = ?", (story["ledger_item_id"],))
+    assert row.fetchone()["trace_id"] == "t-123"
+
+    story["thread_status"] = "pending"
+    monkeypatch.setattr(processor, "_generate_thread_draft", lambda content: "1/1 a")
+    processor.generate_thread_for_story(story)
+
+    spans = load_spans(processor.tracer.exporter, trace_id="t-123")
+    assert [span["name"] for span in spans] == ["process_content", "thread_draft"]
+    assert spans[0]["attrs"]["outcome"] == "draft_ready"
+    assert spans[1]["attrs"] == {"thread_status": "ready"}
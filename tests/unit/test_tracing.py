@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from src.telemetry.tracing import (
+    ENV_TRACE_PATH,
+    SpanExporter,
+    Tracer,
+    format_timeline,
+    load_spans,
+    new_trace_id,
+    tracer_from_config,
+)
+
+
+def test_spans_record_status_and_attributes(tmp_path):
+    exporter = SpanExporter(tmp_path / "traces.jsonl")
+    tracer = Tracer("source_monitor", exporter)
+    trace_id = new_trace_id()
+
+    with tracer.span("fetch", trace_id, "s1", source="rss") as attrs:
+        attrs["kept"] = 3
+    with pytest.raises(RuntimeError):
+        with tracer.span("publish", trace_id, "s1"):
+            raise RuntimeError("bird failed")
+    tracer.event("review_decision", trace_id, "s1", decision="approved")
+    # No trace id (e.g. stories from before tracing): nothing is written.
+    tracer.event("review_decision", None, "s2")
+
+    spans = load_spans(exporter, trace_id=trace_id)
+    assert [span["name"] for span in spans] == ["fetch", "publish", "review_decision"]
+    assert spans[0]["attrs"] == {"source": "rss", "kept": 3}
+    assert spans[1]["status"] == "error"
+    assert spans[2]["duration_ms"] == 0
+    assert all(span["component"] == "source_monitor" for span in spans)
+
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    exporter = SpanExporter(tmp_path / "traces.jsonl")
+    tracer = Tracer("app", exporter, enabled=False)
+    with tracer.span("fetch", new_trace_id()):
+        pass
+    assert exporter.files() == []
+
+
+def test_exporter_rotates_and_timeline_spans_files(tmp_path):
+    exporter = SpanExporter(tmp_path / "traces.jsonl", max_bytes=600, backups=2)
+    tracer = Tracer("content_processor", exporter)
+    trace_id = new_trace_id()
+    for idx in range(6):
+        tracer.record(f"stage{idx}", trace_id, 1000.0 + idx, 1000.5 + idx, story_id="s1")
+
+    files = exporter.files()
+    assert [path.name for path in files] == ["traces.jsonl.2", "traces.jsonl.1", "traces.jsonl"]
+    assert all(path.stat().st_size <= 600 for path in files)
+    for path in files:
+        for line in path.read_text().splitlines():
+            json.loads(line)
+
+    spans = load_spans(exporter, story_id="s1")
+    names = [span["name"] for span in spans]
+    assert names == sorted(names)
+    lines = format_timeline(spans)
+    assert lines[0].startswith("+     0.000s")
+    assert lines[-1].startswith("end-to-end:")
+
+
+def test_trace_path_comes_from_config_then_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_TRACE_PATH, str(tmp_path / "env.jsonl"))
+    assert tracer_from_config("app", {}).exporter.path == tmp_path / "env.jsonl"
+    configured = {"telemetry": {"trace_path": str(tmp_path / "configured.jsonl")}}
+    assert tracer_from_config("app", configured).exporter.path == tmp_path / "configured.jsonl"
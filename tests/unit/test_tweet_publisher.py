@@ -0,0 +1,182 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from ledger import StantonTimesLedger
+from src.notify.publish_queue import PublishError
+from src.notify.publish_trigger import QUEUED, SIGNALLED, SPAWNED, notify_publisher
+from src.state.store import load_state, save_state, update_state
+from src.telemetry.tracing import Tracer
+from tweet_publisher import TweetPublisher
+
+
+def _publisher(tmp_path, stories):
+    state_path = str(tmp_path / "state.json")
+    save_state(state_path, {"pending_stories": stories})
+    publisher = TweetPublisher.__new__(TweetPublisher)
+    publisher.config = {"publishing": {"min_interval_seconds": 0}}
+    publisher.content_processor = SimpleNamespace(
+        state_file_path=state_path, state=load_state(state_path), flush_metrics=lambda component: None
+    )
+    publisher.ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"), check_same_thread=False)
+    publisher.tracer = Tracer("tweet_publisher", enabled=False)
+    publisher.logger = SimpleNamespace(info=lambda *a: None, warning=lambda *a: None, error=lambda *a: None)
+    publisher.lock_path = Path(f"{publisher.ledger.db_path}.publish.lock")
+    publisher._send_publish_embed = lambda story, tweet_id: None
+    return publisher
+
+
+def _story(story_id, status):
+    return {"story_id": story_id, "topic": story_id, "tweet_draft": f"Tweet {story_id}", "draft_status": status}
+
+
+def test_auto_approved_and_approved_stories_are_published(tmp_path):
+    publisher = _publisher(tmp_path, [
+        _story("auto", "auto_approved"), _story("reviewed", "approved"), _story("waiting", "posted_for_review"),
+    ])
+    tweets = []
+
+    def _post(text):
+        tweets.append(text)
+        if len(tweets) == 1:
+            # Another process appends a draft while the pass runs.
+            update_state(publisher.content_processor.state_file_path,
+                         lambda state: state["pending_stories"].append(_story("new", "needs_review")))
+        return str(100 + len(tweets))
+
+    publisher._post_with_bird = _post
+    assert publisher.publish_pending_tweets() == 2
+    stories = {story["story_id"]: story for story in load_state(publisher.content_processor.state_file_path)["pending_stories"]}
+    assert [stories[key]["draft_status"] for key in ("auto", "reviewed", "waiting", "new")] == [
+        "published", "published", "posted_for_review", "needs_review",
+    ]
+    assert stories["auto"]["tweet_id"] == "101"
+    assert publisher.publish_pending_tweets() == 0
+
+
+def test_watcher_publishes_auto_approved_story_on_wakeup(tmp_path, monkeypatch):
+    socket_path = tmp_path / "publish.sock"
+    monkeypatch.setenv("STANTON_TIMES_PUBLISH_SOCKET", str(socket_path))
+    publisher = _publisher(tmp_path, [])
+    published = threading.Event()
+    publisher._post_with_bird = lambda text: published.set() or "200"
+
+    stop = threading.Event()
+    watcher = threading.Thread(target=publisher.watch, kwargs={"poll_seconds": 60, "stop": stop})
+    try:
+        watcher.start()
+        deadline = time.monotonic() + 5
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        update_state(publisher.content_processor.state_file_path,
+                     lambda state: state["pending_stories"].append(_story("p0", "auto_approved")))
+        start = time.monotonic()
+        assert notify_publisher("p0") == SIGNALLED
+        # Far inside the 60s poll: the wakeup, not the poll, published it.
+        assert published.wait(5)
+        assert time.monotonic() - start < 2
+    finally:
+        stop.set()
+        notify_publisher(None)
+        watcher.join(5)
+    assert not socket_path.exists()
+
+
+def test_notify_without_a_watcher_queues_or_spawns(tmp_path, monkeypatch):
+    socket_path = tmp_path / "publish.sock"
+    assert notify_publisher("s1", socket_path=socket_path) == QUEUED
+
+    started = []
+    monkeypatch.setattr("src.notify.publish_trigger.subprocess.Popen", lambda cmd, **kwargs: started.append(cmd))
+    # A socket left behind by a dead watcher is treated as no watcher.
+    socket_path.touch()
+    assert notify_publisher("s1", socket_path=socket_path, spawn=True) == SPAWNED
+    assert started and started[0][-3:] == ["-m", "src.app", "publish"]
+
+
+def test_auto_approved_draft_wakes_the_publisher(tmp_path, monkeypatch):
+    from src.content_processor import StantonTimesContentProcessor
+
+    processor = StantonTimesContentProcessor(state_file_path=str(tmp_path / "state.json"))
+    processor.ledger = StantonTimesLedger(db_path=str(tmp_path / "ledger.sqlite"))
+    processor.config = {"content_intelligence": {"mode": "local", "score_cache": False}}
+    processor.approval_tiers.enabled = True
+    processor.tracer = Tracer("content_processor", enabled=False)
+    monkeypatch.setattr(
+        processor.system_monitor, "generate_health_report", lambda: {"system_resources": {"cpu_usage": 0}}
+    )
+    woken = []
+    monkeypatch.setattr("content_processor.notify_publisher", lambda story_id, spawn: woken.append(story_id) or QUEUED)
+
+    official = {"source": "RSI Comm-Link", "topic": "Alpha 4.6 Patch Notes", "description": "Patch notes.",
+                "priority": "P0", "id": "patch-1"}
+    assert processor.process_content(dict(official), score=1.0)["status"] == "draft_ready"
+    story = load_state(processor.state_file_path)["pending_stories"][0]
+    assert story["draft_status"] == "auto_approved"
+    assert woken == [story["story_id"]]
+
+    processor.config["publishing"] = {"fast_path": False}
+    hotfix = dict(official, topic="Pyro outposts rebalanced", description="Hotfix for outposts.", id="patch-2")
+    assert processor.process_content(hotfix, score=1.0)["status"] == "draft_ready"
+    assert len(woken) == 1
+
+
+def test_a_run_that_dies_before_saving_state_does_not_post_twice(tmp_path):
+    publisher = _publisher(tmp_path, [_story("p0", "auto_approved")])
+    tweets = []
+    publisher._post_with_bird = lambda text: tweets.append(text) or "300"
+
+    def _crash(stories):
+        raise KeyboardInterrupt
+
+    publisher._merge_stories = _crash
+    try:
+        publisher.publish_pending_tweets()
+    except KeyboardInterrupt:
+        pass
+    assert load_state(publisher.content_processor.state_file_path)["pending_stories"][0]["draft_status"] == "auto_approved"
+
+    # The ledger already has the tweet: the story is caught up, not re-posted.
+    del publisher._merge_stories
+    assert publisher.publish_pending_tweets() == 0
+    story = load_state(publisher.content_processor.state_file_path)["pending_stories"][0]
+    assert (story["draft_status"], story["tweet_id"]) == ("published", "300")
+    assert tweets == ["Tweet p0"]
+
+
+def test_rejected_or_edited_drafts_are_not_tweeted_from_the_queue(tmp_path):
+    publisher = _publisher(tmp_path, [_story("a", "approved"), _story("b", "approved")])
+    publisher.config["publishing"]["retry_base_seconds"] = 0
+    state_path = publisher.content_processor.state_file_path
+    attempts, tweets = [], []
+
+    def _review(story_id, **changes):
+        def _apply(state):
+            for story in state["pending_stories"]:
+                if story["story_id"] == story_id:
+                    story.update(changes)
+            return state
+        update_state(state_path, _apply)
+
+    def _post(text):
+        attempts.append(text)
+        if len(attempts) == 1:
+            # Reviewers act while the first posts fail and wait for a retry.
+            _review("a", tweet_draft="Edited tweet a")
+            raise PublishError("bird tweet error: 503")
+        if len(attempts) == 2:
+            _review("b", draft_status="rejected")
+            raise PublishError("bird tweet error: 503")
+        tweets.append(text)
+        return str(400 + len(tweets))
+
+    publisher._post_with_bird = _post
+    assert publisher.publish_pending_tweets() == 0
+    assert publisher.publish_pending_tweets() == 1
+    assert attempts == ["Tweet a", "Tweet b", "Edited tweet a"]
+    assert tweets == ["Edited tweet a"]
+    stories = {story["story_id"]: story for story in load_state(state_path)["pending_stories"]}
+    assert (stories["a"]["draft_status"], stories["b"]["draft_status"]) == ("published", "rejected")
+    assert publisher.publish_pending_tweets() == 0 and tweets == ["Edited tweet a"]
@@ -0,0 +1,156 @@
+import requests
+
+from ledger import StantonTimesLedger
+from src.notify.discord_webhook import RateLimiter, send_webhook_payload
+from src.notify.webhook_outbox import WebhookOutbox
+
+WEBHOOK = "https://discord.com/api/webhooks/1/token"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeDiscord:
+    """
+    A webhook bucket of 5 requests per 2 seconds, like Discord's. Requests
+    past the limit get a 429 with retry_after, as the real API does.
+    """
+
+    def __init__(self, clock, limit=5, window=2.0, fail_at=()):
+        self.clock = clock
+        self.limit = limit
+        self.window = window
+        self.fail_at = set(fail_at)
+        self.window_start = 0.0
+        self.used = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.messages = []
+
+    def post(self, url, json=None, timeout=None):
+        self.requests += 1
+        now = self.clock()
+        if now >= self.window_start + self.window:
+            self.window_start, self.used = now, 0
+        reset_after = self.window_start + self.window - now
+        if self.used >= self.limit:
+            self.rate_limited += 1
+            return FakeResponse(429, {"retry_after": reset_after, "global": False})
+        if self.requests in self.fail_at:
+            return FakeResponse(502, {"message": "bad gateway"})
+        self.used += 1
+        self.messages.append(json["content"])
+        return FakeResponse(200, {"id": str(len(self.messages))}, {
+            "X-RateLimit-Bucket": "webhook-1",
+            "X-RateLimit-Remaining": str(self.limit - self.used),
+            "X-RateLimit-Reset-After": str(reset_after),
+        })
+
+
+def _outbox(tmp_path, discord, clock, **kwargs):
+    ledger = StantonTimesLedger(str(tmp_path / "ledger.sqlite"))
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    return WebhookOutbox(
+        ledger,
+        send=lambda url, payload: send_webhook_payload(url, payload, limiter=limiter, post=discord.post),
+        **kwargs,
+    )
+
+
+def test_burst_of_100_is_delivered_in_order_at_the_bucket_rate(tmp_path):
+    clock = FakeClock()
+    discord = FakeDiscord(clock)
+    delivered = []
+    outbox = _outbox(tmp_path, discord, clock, on_delivered=lambda row, message_id: delivered.append(row["story_id"]))
+
+    for idx in range(100):
+        outbox.enqueue(f"review:s{idx}", WEBHOOK, {"content": f"draft {idx}"}, story_id=f"s{idx}")
+    # A second run queueing the same drafts adds nothing.
+    for idx in range(100):
+        outbox.enqueue(f"review:s{idx}", WEBHOOK, {"content": f"draft {idx}"}, story_id=f"s{idx}")
+
+    result = outbox.drain()
+    assert (result.sent, result.failed, result.pending) == (100, 0, 0)
+    assert discord.messages == [f"draft {idx}" for idx in range(100)]
+    assert delivered == [f"s{idx}" for idx in range(100)]
+    # Paced from the headers: no 429s, and 20 windows of 5 take 38 seconds.
+    assert discord.rate_limited == 0
+    assert clock.now == 38.0
+    assert outbox.delivery("review:s99")["message_id"] == "100"
+
+    assert outbox.drain().sent == 0
+    assert len(discord.messages) == 100
+
+
+def test_rate_limited_and_failed_sends_keep_delivery_order(tmp_path):
+    clock = FakeClock()
+    # Request 3 hits a 502: the drain stops there and the next one resumes.
+    discord = FakeDiscord(clock, fail_at={3})
+    outbox = _outbox(tmp_path, discord, clock)
+    for idx in range(6):
+        outbox.enqueue(f"k{idx}", WEBHOOK, {"content": str(idx)})
+
+    first = outbox.drain()
+    assert (first.sent, first.pending) == (2, 4)
+    assert "502" in first.errors["k2"]
+    assert outbox.delivery("k2")["status"] == "pending"
+
+    # Another process used the bucket meanwhile: the 429 is waited out.
+    discord.used = discord.limit
+    second = outbox.drain()
+    assert (second.sent, second.pending) == (4, 0)
+    assert discord.rate_limited == 1
+    assert discord.messages == [str(idx) for idx in range(6)]
+
+
+def test_non_retryable_errors_are_given_up_on(tmp_path):
+    clock = FakeClock()
+    outbox = _outbox(tmp_path, FakeDiscord(clock), clock)
+    outbox.send = lambda url, payload: send_webhook_payload(
+        url, payload, post=lambda url, json=None, timeout=None: FakeResponse(400, {"message": "bad embed"})
+    )
+    outbox.enqueue("bad", WEBHOOK, {"content": "x"})
+    result = outbox.drain()
+    assert (result.sent, result.failed, result.pending) == (0, 1, 0)
+    assert outbox.delivery("bad")["status"] == "failed"
+
+
+def test_unexpected_send_errors_release_the_row_for_retry(tmp_path):
+    clock = FakeClock()
+    discord = FakeDiscord(clock)
+    outbox = _outbox(tmp_path, discord, clock)
+    send = outbox.send
+
+    def _down(url, payload):
+        raise requests.ConnectionError("connection reset")
+
+    outbox.send = _down
+    outbox.enqueue("k0", WEBHOOK, {"content": "0"})
+    outbox.enqueue("k1", WEBHOOK, {"content": "1"})
+    result = outbox.drain()
+    assert (result.sent, result.failed, result.pending) == (0, 0, 2)
+    assert "connection reset" in result.errors["k0"]
+    assert outbox.delivery("k0")["status"] == "pending"
+
+    outbox.send = send
+    assert outbox.drain().sent == 2
+    assert discord.messages == ["0", "1"]
@@ -1,9 +1,15 @@
+import fcntl
 import json
 import logging
 import re
 import subprocess
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
 
+from bird_monitor import parse_tweets
 from src.content_processor import StantonTimesContentProcessor
 from ledger import StantonTimesLedger
 from src.config import (
@@ -14,7 +20,28 @@ from src.config import (
     get_send_embed_script,
     load_config,
 )
-from src.state.store import save_state
+from src.notify.publish_queue import PublishError, PublishRun, publish_key, publish_queue_from_config
+from src.notify.publish_trigger import PublishWakeups
+from src.state.store import load_state, update_state
+from src.telemetry.metrics import ERRORS, PUBLISH_DELAY
+from src.telemetry.tracing import tracer_from_config
+
+# auto_approved stories skip Discord review and publish directly.
+PUBLISHABLE_STATUSES = ('approved', 'auto_approved')
+DEFAULT_WATCH_POLL_SECONDS = 600
+DEFAULT_ACCOUNT = "TheStantonTimes"
+
+
+def _story_key(story):
+    return story.get('story_id') or story.get('topic') or story.get('title')
+
+
+def _tweet_text(story):
+    tweet_text = story.get('tweet_draft') or story.get('simulated_draft')
+    # Ensure tweet is within 280 character limit
+    if tweet_text and len(tweet_text) > 280:
+        tweet_text = tweet_text[:277] + '...'
+    return tweet_text
 
 
 class TweetPublisher:
@@ -25,6 +52,7 @@ class TweetPublisher:
         state_file_path = state_file_path or str(ensure_state_file())
         self.content_processor = StantonTimesContentProcessor(state_file_path, config_path)
         self.ledger = StantonTimesLedger()
+        self.tracer = tracer_from_config("tweet_publisher", self.config)
         logging.basicConfig(
             level=logging.INFO,
             format=(self.config.get("logging", {}) or {}).get(
@@ -36,6 +64,7 @@ class TweetPublisher:
         self.logger = logging.getLogger(__name__)
         self.bird_auth_script = get_bird_auth_script()
         self.send_embed_script = get_send_embed_script()
+        self.lock_path = Path(f"{self.ledger.db_path}.publish.lock")
 
     def _extract_tweet_id(self, output: str) -> Optional[str]:
         output = output.strip()
@@ -77,7 +106,11 @@ class TweetPublisher:
 
         return None
 
-    def _post_with_bird(self, tweet_text: str) -> Optional[str]:
+    def _post_with_bird(self, tweet_text: str) -> str:
+        """
+        Post a tweet and return its id. Raises `PublishError`; `in_doubt`
+        when the tweet may have gone out anyway.
+        """
         cmd = [self.bird_auth_script, "--json", "tweet", tweet_text]
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -86,18 +119,51 @@ class TweetPublisher:
                 "bird-auth script not found (%s). Set STANTON_TIMES_BIRD_AUTH_SCRIPT or install bird-auth.sh on PATH.",
                 self.bird_auth_script,
             )
-            return None
+            ERRORS.inc(system="bird", operation="tweet")
+            raise PublishError(f"bird-auth script not found: {self.bird_auth_script}")
+        except subprocess.TimeoutExpired as e:
+            self.logger.error(f"bird tweet timed out: {e}")
+            ERRORS.inc(system="bird", operation="tweet")
+            raise PublishError("bird tweet timed out", in_doubt=True)
         except Exception as e:
             self.logger.error(f"bird tweet failed: {e}")
-            return None
+            ERRORS.inc(system="bird", operation="tweet")
+            raise PublishError(f"bird tweet failed: {e}")
 
         if result.returncode != 0:
             self.logger.error(f"bird tweet error: {result.stderr.strip()}")
-            return None
+            ERRORS.inc(system="bird", operation="tweet")
+            raise PublishError(f"bird tweet error: {result.stderr.strip()}")
 
         tweet_id = self._extract_tweet_id(result.stdout)
         if not tweet_id:
             self.logger.warning("Tweet posted but ID not detected. Output: %s", result.stdout.strip())
+            raise PublishError("tweet posted but id not detected", in_doubt=True)
+        return tweet_id
+
+    def _recent_own_tweets(self) -> Optional[List[dict]]:
+        """
+        The account's latest tweets, or None when they cannot be read.
+        """
+        account = (self.config.get("publishing") or {}).get("account", DEFAULT_ACCOUNT)
+        cmd = [self.bird_auth_script, "--json", "user-tweets", account, "-n", "20"]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        except Exception as e:
+            self.logger.error(f"bird user-tweets failed: {e}")
+            ERRORS.inc(system="bird", operation="user-tweets")
+            return None
+        if result.returncode != 0:
+            self.logger.error(f"bird user-tweets error: {result.stderr.strip()}")
+            ERRORS.inc(system="bird", operation="user-tweets")
+            return None
+        return parse_tweets(result.stdout)
+
+    def _post_job(self, job) -> str:
+        with self.tracer.span('publish', job['trace_id'], job['story_id']) as trace_attrs:
+            tweet_id = self._post_with_bird(job['tweet_text'])
+            trace_attrs['tweet_id'] = tweet_id
+        self.logger.info(f"Published tweet: {job['tweet_text']}")
         return tweet_id
 
     def _send_publish_embed(self, story: dict, tweet_id: str):
@@ -117,55 +183,180 @@ class TweetPublisher:
         except Exception as e:
             self.logger.error(f"Failed to send publish embed: {e}")
 
-    def publish_pending_tweets(self):
-        pending_stories = self.content_processor.state.get('pending_stories', [])
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # One publish pass at a time across the watcher, cron runs and
+        # one-shot runs, so a story is never tweeted twice.
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
 
-        for story in pending_stories:
-            if story.get('draft_status') == 'approved':
-                try:
-                    if story.get('is_test'):
-                        self.logger.info("Skipping test story publish: %s", story.get('topic') or story.get('title'))
-                        story['draft_status'] = 'test_skipped'
-                        continue
+    def _approved_at(self, story: dict) -> Optional[str]:
+        item_id = story.get('ledger_item_id')
+        if not item_id:
+            return None
+        try:
+            return self.ledger.approved_at(int(item_id))
+        except Exception:
+            return None
 
-                    tweet_text = story.get('tweet_draft') or story.get('simulated_draft')
+    def _observe_publish_delay(self, story: dict) -> None:
+        approved_at = self._approved_at(story)
+        if not approved_at:
+            return
+        delay = (datetime.utcnow() - datetime.fromisoformat(approved_at)).total_seconds()
+        approval = "auto" if story.get('draft_status') == 'auto_approved' else "review"
+        PUBLISH_DELAY.observe(max(delay, 0.0), priority=story.get('priority') or "unknown", approval=approval)
 
-                    if not tweet_text:
-                        self.logger.warning(
-                            f"Approved story missing tweet draft: {story.get('topic') or story.get('title')}"
-                        )
-                        continue
+    def _mark_story_published(self, story: dict, tweet_id: Optional[str]) -> None:
+        self._observe_publish_delay(story)
+        story['draft_status'] = 'published'
+        story['tweet_id'] = tweet_id
 
-                    # Ensure tweet is within 280 character limit
-                    if len(tweet_text) > 280:
-                        tweet_text = tweet_text[:277] + '...'
+        # Mark ledger
+        if story.get('ledger_item_id') and story.get('cluster_id'):
+            try:
+                self.ledger.mark_published(story['ledger_item_id'], story['cluster_id'], tweet_id)
+            except Exception as e:
+                self.logger.error(f"Failed to update ledger publish status: {e}")
 
-                    tweet_id = self._post_with_bird(tweet_text)
-                    if not tweet_id:
-                        self.logger.error("Failed to publish tweet via bird.")
-                        continue
+        # Send confirmation embed
+        if tweet_id:
+            self._send_publish_embed(story, tweet_id)
 
-                    self.logger.info(f"Published tweet: {tweet_text}")
+    def _merge_stories(self, stories) -> None:
+        """
+        Write `stories` back over their counterparts in the current state
+        file, keeping changes other processes made while this pass ran.
+        """
+        updated = {_story_key(story): story for story in stories}
 
-                    # Update story status
-                    story['draft_status'] = 'published'
-                    story['tweet_id'] = tweet_id
+        def _apply(state):
+            state['pending_stories'] = [
+                updated.get(_story_key(story), story) for story in state.get('pending_stories', [])
+            ]
+            return state
 
-                    # Mark ledger
-                    if story.get('ledger_item_id') and story.get('cluster_id'):
-                        try:
-                            self.ledger.mark_published(story['ledger_item_id'], story['cluster_id'], tweet_id)
-                        except Exception as e:
-                            self.logger.error(f"Failed to update ledger publish status: {e}")
+        self.content_processor.state = update_state(self.content_processor.state_file_path, _apply)
 
-                    # Send confirmation embed
-                    self._send_publish_embed(story, tweet_id)
+    def publish_pending_tweets(self) -> int:
+        """
+        Queue every approved and auto-approved story and drain the publish
+        queue. Returns the number of jobs the drain published (posted, or
+        found on the timeline after an interrupted post).
+        """
+        return len(self._publish_pass().published)
 
-                except Exception as e:
-                    self.logger.error(f"Failed to publish tweet: {e}")
+    def _publish_pass(self) -> PublishRun:
+        with self._locked():
+            # Read the state under the lock: a long-running watcher's copy is stale.
+            self.content_processor.state = load_state(self.content_processor.state_file_path)
+            pending_stories = self.content_processor.state.get('pending_stories', [])
+            queued = {}
+            changed = {}
+
+            def _published(job):
+                story = queued.get(job['idempotency_key'])
+                if story is not None:
+                    self._mark_story_published(story, job['tweet_id'])
+                    changed[_story_key(story)] = story
+
+            def _is_current(job):
+                # Re-read before each post: a reviewer may have rejected or
+                # edited the draft since it was queued.
+                for story in load_state(self.content_processor.state_file_path).get('pending_stories', []):
+                    tweet_text = _tweet_text(story)
+                    if (story.get('draft_status') in PUBLISHABLE_STATUSES and tweet_text
+                            and publish_key(story, tweet_text) == job['idempotency_key']):
+                        return True
+                return False
+
+            queue = publish_queue_from_config(
+                self.config,
+                self.ledger,
+                post=self._post_job,
+                recent_tweets=self._recent_own_tweets,
+                on_published=_published,
+                is_current=_is_current,
+            )
+
+            for story in pending_stories:
+                if story.get('draft_status') not in PUBLISHABLE_STATUSES:
+                    continue
+                if story.get('is_test'):
+                    self.logger.info("Skipping test story publish: %s", story.get('topic') or story.get('title'))
+                    story['draft_status'] = 'test_skipped'
+                    changed[_story_key(story)] = story
+                    continue
 
-        # Save updated state
-        self.content_processor.state = save_state(self.content_processor.state_file_path, self.content_processor.state)
+                tweet_text = _tweet_text(story)
+
+                if not tweet_text:
+                    self.logger.warning(
+                        f"Approved story missing tweet draft: {story.get('topic') or story.get('title')}"
+                    )
+                    continue
+
+                job = queue.enqueue(story, tweet_text, approved_at=self._approved_at(story))
+                queued[job['idempotency_key']] = story
+                if job['status'] == 'published':
+                    # Posted by a run that stopped before saving the state.
+                    _published(job)
+                elif job['status'] == 'failed':
+                    self._mark_story_failed(story, job)
+                    changed[_story_key(story)] = story
+
+            run = queue.drain()
+            for job in run.failed:
+                story = queued.get(job['idempotency_key'])
+                if story is not None:
+                    self._mark_story_failed(story, job)
+                    changed[_story_key(story)] = story
+            for job in run.cancelled:
+                self.logger.info(f"Cancelled queued tweet {job['idempotency_key']}: {job['last_error']}")
+            for key, error in run.errors.items():
+                self.logger.error(f"Publish attempt failed for {key}: {error}")
+
+            # Save updated state
+            if changed:
+                self._merge_stories(list(changed.values()))
+        self.content_processor.flush_metrics("tweet_publisher")
+        return run
+
+    def _mark_story_failed(self, story: dict, job) -> None:
+        self.logger.error(f"Giving up on publishing {story.get('story_id')}: {job['last_error']}")
+        story['draft_status'] = 'publish_failed'
+        story['publish_error'] = job['last_error']
+
+    def watch(self, poll_seconds: Optional[float] = None, stop: Optional[threading.Event] = None) -> None:
+        """
+        Stay up and publish as soon as the content processor signals an
+        auto-approved story (see `src/notify/publish_trigger.py`), when the
+        publish budget or a retry lets the next queued tweet go, and every
+        `publishing.watch_poll_seconds` for stories approved in Discord.
+        """
+        if poll_seconds is None:
+            poll_seconds = float(
+                (self.config.get("publishing") or {}).get("watch_poll_seconds", DEFAULT_WATCH_POLL_SECONDS)
+            )
+        with PublishWakeups() as wakeups:
+            self.logger.info("Publisher watching %s", wakeups.socket_path)
+            while stop is None or not stop.is_set():
+                wait = poll_seconds
+                try:
+                    run = self._publish_pass()
+                    if run.next_due_in is not None:
+                        # Back when the budget or a retry allows the next tweet.
+                        wait = min(wait, max(run.next_due_in, 1.0))
+                except Exception as e:
+                    self.logger.error(f"Publish pass failed: {e}")
+                story_ids = wakeups.wait(wait)
+                if story_ids:
+                    self.logger.info("Woken to publish %s", ", ".join(str(story_id) for story_id in story_ids))
 
 
 def main():
@@ -1,3 +1,6 @@
+from src.scoring.features import suggest_hashtags
+
+
 class TweetStyleGuide:
     def __init__(self):
         self.power_words = {
@@ -55,20 +58,7 @@ class TweetStyleGuide:
         """
         Suggest relevant hashtags based on content
         """
-        hashtag_map = {
-            'patch': ['#StarCitizen', '#PatchNotes'],
-            'server': ['#StarCitizen', '#ServerTech'],
-            'event': ['#StarCitizen', '#CommunityEvent'],
-            'ship': ['#StarCitizen', '#SpaceShip']
-        }
-        
-        # Detect content type and return appropriate hashtags
-        content_lower = content.lower()
-        for key, tags in hashtag_map.items():
-            if key in content_lower:
-                return tags
-        
-        return ['#StarCitizen']
+        return suggest_hashtags(content.lower())
 
 def main():
     # Example usage